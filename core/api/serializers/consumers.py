@@ -1,4 +1,3 @@
-from decimal import Decimal
 from datetime import timedelta
 
 from django.db import transaction
@@ -11,7 +10,7 @@ from apps.salon.choices import BookingStatus, SalonStatus
 
 
 from common.choices import CategoryType
-from common.serializers import MediaSlimSerializer
+from common.serializers import BookingPriceFieldsMixin, MediaSlimSerializer
 from common.utils import get_or_create_category
 
 
@@ -83,7 +82,7 @@ class BookingProductsSlimSerializer(serializers.ModelSerializer):
         ]
 
 
-class CustomerBookingSerializer(serializers.ModelSerializer):
+class CustomerBookingSerializer(BookingPriceFieldsMixin, serializers.ModelSerializer):
     salon = serializers.SlugRelatedField(
         queryset=Salon.objects.filter(status=SalonStatus.ACTIVE), slug_field="uid"
     )
@@ -101,48 +100,8 @@ class CustomerBookingSerializer(serializers.ModelSerializer):
         required=False,
         allow_null=True,
     )
-    total_products = serializers.SerializerMethodField()
-    total_products_price = serializers.SerializerMethodField()
-    total_services = serializers.SerializerMethodField()
-    total_services_price = serializers.SerializerMethodField()
-    services_discount_price = serializers.SerializerMethodField()
-    total_price = serializers.SerializerMethodField()
-    final_price = serializers.SerializerMethodField()
     images = MediaSlimSerializer(source="salonmedia_set", many=True, read_only=True)
 
-    def get_total_products(self, obj):
-        return obj.products.count()
-
-    def get_total_products_price(self, obj):
-        return sum(p.price for p in obj.products.all())
-
-    def get_total_services(self, obj):
-        return obj.services.count()
-
-    def get_total_services_price(self, obj):
-        return sum(s.price for s in obj.services.all())
-
-    def get_services_discount_price(self, obj):
-        return sum(s.final_price() for s in obj.services.all())
-
-    def get_total_price(self, obj):
-        total_services_price = sum(s.price for s in obj.services.all())
-        total_products_price = sum(p.price for p in obj.products.all())
-        return total_services_price + total_products_price
-
-    def get_final_price(self, obj):
-        final_services_price = sum(
-            (Decimal(s.final_price()) for s in obj.services.all()), Decimal("0.00")
-        )
-
-        total_products_price = sum(
-            (p.price for p in obj.products.all()), Decimal("0.00")
-        )
-
-        tips_amount = obj.tips_amount or Decimal("0.00")
-
-        return final_services_price + total_products_price + tips_amount
-
     def to_representation(self, instance):
         rep = super().to_representation(instance)
 
@@ -6,9 +6,17 @@ from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 
 from common.choices import CategoryType
+from common.exceptions import BookingSlotTaken
 from common.serializers import OpeningHoursSlimSerializer
 from common.utils import get_or_create_category
 
+from apps.salon.availability import (
+    BookingOverlapError,
+    SalonDayAvailability,
+    assign_resources,
+    booking_overlap_guard,
+    bookable_chairs,
+)
 from apps.salon.models import Customer, Salon, Booking, Service, Product, SalonMedia
 from apps.salon.choices import BookingStatus, CustomerType, SalonStatus
 
@@ -149,7 +157,32 @@ class PublicSalonBookingSerializer(serializers.ModelSerializer):
             )
             validated_data["booking_duration"] = total_duration
 
-            booking = Booking.objects.create(**validated_data, account=account)
+            # Assign a chair and a qualified employee that are free for the
+            # whole duration of the booking, not only at its start time.
+            availability = SalonDayAvailability(salon, validated_data["booking_date"])
+            chair, employee = assign_resources(
+                availability,
+                validated_data["booking_time"],
+                total_duration,
+                [service.uid for service in services],
+            )
+            # Salons without chairs take bookings without one, as before
+            if not chair and bookable_chairs(salon).exists():
+                raise serializers.ValidationError(
+                    {
+                        "booking_time": [
+                            "No available chairs for the selected date and time."
+                        ]
+                    }
+                )
+            validated_data["chair"] = chair
+            validated_data["employee"] = employee
+
+            try:
+                with booking_overlap_guard():
+                    booking = Booking.objects.create(**validated_data, account=account)
+            except BookingOverlapError:
+                raise BookingSlotTaken()
             booking.services.set(services)
             if products:
                 booking.products.set(products)
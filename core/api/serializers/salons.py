@@ -1,5 +1,4 @@
 from datetime import timedelta
-from decimal import Decimal
 
 from django.contrib.gis.geos import Point
 from django.db import transaction
@@ -8,6 +7,13 @@ from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 from rest_framework.generics import get_object_or_404
 
+from apps.salon.availability import (
+    ACTIVE_BOOKING_STATUSES,
+    MAX_SLOT_GRID_DAYS,
+    BookingOverlapError,
+    booking_overlap_guard,
+    find_booking_conflicts,
+)
 from apps.salon.choices import (
     BookingStatus,
     CustomerType,
@@ -29,11 +35,19 @@ from apps.salon.models import (
     Employee,
     Customer,
     Booking,
+    SalonImportJob,
+)
+from apps.salon.imports import (
+    IMPORT_FILE_EXTENSIONS,
+    IMPORT_MAX_FILE_SIZE,
+    is_import_stalled,
 )
 from apps.thirdparty.models import WhatsappChatbotMessageLog
 
 from common.choices import CategoryType
+from common.exceptions import BookingSlotTaken
 from common.serializers import (
+    BookingPriceFieldsMixin,
     CustomerSlimSerializer,
     EmployeeSlimSerializer,
     ProductSlimSerializer,
@@ -673,7 +687,49 @@ class BookingProductsSlimSerializer(serializers.ModelSerializer):
         ]
 
 
-class SalonBookingSerializer(serializers.ModelSerializer):
+def ensure_booking_slot_is_free(booking):
+    """
+    Raise a ValidationError when the booking's chair or employee is already
+    taken for any part of [booking_time, booking_time + booking_duration).
+    """
+    if booking.status not in ACTIVE_BOOKING_STATUSES:
+        return
+
+    conflicts = find_booking_conflicts(
+        booking.salon,
+        booking.booking_date,
+        booking.booking_time,
+        booking.booking_duration,
+        chair=booking.chair,
+        employee=booking.employee,
+        exclude_booking=booking,
+    )
+    if conflicts:
+        raise serializers.ValidationError(
+            {
+                "booking_time": [
+                    _("The selected %(resource)s is already booked for this time.")
+                    % {"resource": resource}
+                    for resource in conflicts
+                ]
+            }
+        )
+
+
+def save_booking(booking):
+    """
+    Check the slot, then save. The database exclusion constraints catch a
+    concurrent request that took the slot in between.
+    """
+    ensure_booking_slot_is_free(booking)
+    try:
+        with booking_overlap_guard():
+            booking.save()
+    except BookingOverlapError:
+        raise BookingSlotTaken()
+
+
+class SalonBookingSerializer(BookingPriceFieldsMixin, serializers.ModelSerializer):
     customer = SalonCustomerSlimSerializer()
     services = serializers.SlugRelatedField(
         queryset=Service.objects.all(),
@@ -689,50 +745,10 @@ class SalonBookingSerializer(serializers.ModelSerializer):
         required=False,
         allow_null=True,
     )
-    total_products = serializers.SerializerMethodField()
-    total_products_price = serializers.SerializerMethodField()
-    total_services = serializers.SerializerMethodField()
-    total_services_price = serializers.SerializerMethodField()
-    services_discount_price = serializers.SerializerMethodField()
-    total_price = serializers.SerializerMethodField()
-    final_price = serializers.SerializerMethodField()
     images = serializers.ListField(
         child=serializers.ImageField(), required=False, write_only=True
     )
 
-    def get_total_products(self, obj):
-        return obj.products.count()
-
-    def get_total_products_price(self, obj):
-        return sum(p.price for p in obj.products.all())
-
-    def get_total_services(self, obj):
-        return obj.services.count()
-
-    def get_total_services_price(self, obj):
-        return sum(s.price for s in obj.services.all())
-
-    def get_services_discount_price(self, obj):
-        return sum(s.final_price() for s in obj.services.all())
-
-    def get_total_price(self, obj):
-        total_services_price = sum(s.price for s in obj.services.all())
-        total_products_price = sum(p.price for p in obj.products.all())
-        return total_services_price + total_products_price
-
-    def get_final_price(self, obj):
-        final_services_price = sum(
-            (Decimal(s.final_price()) for s in obj.services.all()), Decimal("0.00")
-        )
-
-        total_products_price = sum(
-            (p.price for p in obj.products.all()), Decimal("0.00")
-        )
-
-        tips_amount = obj.tips_amount or Decimal("0.00")
-
-        return final_services_price + total_products_price + tips_amount
-
     def to_representation(self, instance):
         rep = super().to_representation(instance)
         images_qs = SalonMedia.objects.filter(booking=instance)
@@ -832,7 +848,8 @@ class SalonBookingSerializer(serializers.ModelSerializer):
             )
             validated_data["booking_duration"] = total_duration
 
-            booking = Booking.objects.create(**validated_data)
+            booking = Booking(**validated_data)
+            save_booking(booking)
             booking.services.set(services)
             if products:
                 booking.products.set(products)
@@ -873,7 +890,7 @@ class SalonBookingSerializer(serializers.ModelSerializer):
             if status == BookingStatus.CANCELLED:
                 instance.cancelled_by = self.context["request"].user
 
-            instance.save()
+            save_booking(instance)
 
             # Images
             if images:
@@ -983,7 +1000,8 @@ class SalonChairBookingSerializer(serializers.ModelSerializer):
             if employee:
                 validated_data["employee"] = employee
 
-            booking = Booking.objects.create(**validated_data)
+            booking = Booking(**validated_data)
+            save_booking(booking)
             booking.services.set(services)
             if products:
                 booking.products.set(products)
@@ -1024,11 +1042,53 @@ class SalonChairBookingSerializer(serializers.ModelSerializer):
             if employee is not None:
                 instance.employee = employee
 
-            instance.save()
+            save_booking(instance)
 
             return instance
 
 
+class SalonFreeSlotQuerySerializer(serializers.Serializer):
+    """Query parameters of the free-slot grid. Needs `salon` in the context."""
+
+    start_date = serializers.DateField()
+    end_date = serializers.DateField(required=False)
+    services = serializers.ListField(
+        child=serializers.UUIDField(), required=False, default=list
+    )
+
+    def validate_services(self, value):
+        if not value:
+            return []
+
+        services = list(
+            Service.objects.filter(salon=self.context["salon"], uid__in=value)
+        )
+        if len(services) != len(set(value)):
+            raise serializers.ValidationError(
+                _("One or more services do not belong to this salon.")
+            )
+        return services
+
+    def validate(self, attrs):
+        start_date = attrs["start_date"]
+        end_date = attrs.setdefault("end_date", start_date)
+
+        if end_date < start_date:
+            raise serializers.ValidationError(
+                {"end_date": [_("End date cannot be before start date.")]}
+            )
+        if (end_date - start_date).days >= MAX_SLOT_GRID_DAYS:
+            raise serializers.ValidationError(
+                {
+                    "end_date": [
+                        _("A maximum of %(days)s days can be requested at once.")
+                        % {"days": MAX_SLOT_GRID_DAYS}
+                    ]
+                }
+            )
+        return attrs
+
+
 class SalonChairSlimSerializer(serializers.ModelSerializer):
     class Meta:
         model = Chair
@@ -1069,7 +1129,9 @@ class SalonBookingCalendarSerializer(serializers.ModelSerializer):
         ]
 
 
-class SalonBookingCalendarDetailSerializer(serializers.ModelSerializer):
+class SalonBookingCalendarDetailSerializer(
+    BookingPriceFieldsMixin, serializers.ModelSerializer
+):
     customer = CustomerSlimSerializer(read_only=True)
     employee = serializers.SlugRelatedField(
         slug_field="uid",
@@ -1087,13 +1149,6 @@ class SalonBookingCalendarDetailSerializer(serializers.ModelSerializer):
         queryset=Product.objects.all(),
         many=True,
     )
-    total_products = serializers.SerializerMethodField()
-    total_products_price = serializers.SerializerMethodField()
-    total_services = serializers.SerializerMethodField()
-    total_services_price = serializers.SerializerMethodField()
-    services_discount_price = serializers.SerializerMethodField()
-    total_price = serializers.SerializerMethodField()
-    final_price = serializers.SerializerMethodField()
     images = serializers.ListField(
         child=serializers.ImageField(), required=False, write_only=True
     )
@@ -1126,31 +1181,6 @@ class SalonBookingCalendarDetailSerializer(serializers.ModelSerializer):
             "final_price",
         ]
 
-    def get_total_products(self, obj):
-        return obj.products.count()
-
-    def get_total_products_price(self, obj):
-        return sum(p.price for p in obj.products.all())
-
-    def get_total_services(self, obj):
-        return obj.services.count()
-
-    def get_total_services_price(self, obj):
-        return sum(s.price for s in obj.services.all())
-
-    def get_services_discount_price(self, obj):
-        return sum(s.final_price() for s in obj.services.all())
-
-    def get_total_price(self, obj):
-        total_services_price = sum(s.price for s in obj.services.all())
-        total_products_price = sum(p.price for p in obj.products.all())
-        return total_services_price + total_products_price
-
-    def get_final_price(self, obj):
-        final_services_price = sum(s.final_price() for s in obj.services.all())
-        total_products_price = sum(p.price for p in obj.products.all())
-        return final_services_price + total_products_price + obj.tips_amount
-
     def to_representation(self, instance):
         rep = super().to_representation(instance)
         images_qs = SalonMedia.objects.filter(booking=instance)
@@ -1204,7 +1234,7 @@ class SalonBookingCalendarDetailSerializer(serializers.ModelSerializer):
         if employee is not None:
             instance.employee = employee
 
-        instance.save()
+        save_booking(instance)
 
         if images:
             SalonMedia.objects.filter(booking=instance).delete()
@@ -1319,3 +1349,67 @@ class SalonWhatsappChatbotMessageLogSerializer(serializers.ModelSerializer):
     class Meta:
         model = WhatsappChatbotMessageLog
         fields = ["message", "media_url", "sent_at", "role", "customer"]
+
+
+class SalonImportJobSerializer(serializers.ModelSerializer):
+    progress = serializers.SerializerMethodField()
+    stalled = serializers.SerializerMethodField()
+
+    class Meta:
+        model = SalonImportJob
+        fields = [
+            "uid",
+            "kind",
+            "file",
+            "status",
+            "stalled",
+            "progress",
+            "total_rows",
+            "processed_rows",
+            "created_count",
+            "error_count",
+            "started_at",
+            "completed_at",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = [
+            "status",
+            "total_rows",
+            "processed_rows",
+            "created_count",
+            "error_count",
+            "started_at",
+            "completed_at",
+        ]
+
+    def get_progress(self, obj):
+        """Percentage of the rows processed so far."""
+        if not obj.total_rows:
+            return 0
+        return round(obj.processed_rows * 100 / obj.total_rows)
+
+    def get_stalled(self, obj):
+        """Still processing long after it started: the worker was lost."""
+        return is_import_stalled(obj)
+
+    def validate_file(self, value):
+        extension = value.name.rsplit(".", 1)[-1].lower()
+        if extension not in IMPORT_FILE_EXTENSIONS:
+            raise serializers.ValidationError(
+                _("Upload a CSV or XLSX file with a header row.")
+            )
+        if value.size > IMPORT_MAX_FILE_SIZE:
+            raise serializers.ValidationError(
+                _("The file can be at most %(size)s MB.")
+                % {"size": IMPORT_MAX_FILE_SIZE // (1024 * 1024)}
+            )
+        return value
+
+
+class SalonImportJobDetailSerializer(SalonImportJobSerializer):
+    """With the per-row error report."""
+
+    class Meta(SalonImportJobSerializer.Meta):
+        fields = SalonImportJobSerializer.Meta.fields + ["errors"]
+        read_only_fields = SalonImportJobSerializer.Meta.read_only_fields + ["errors"]
@@ -1,8 +1,18 @@
 from django.urls import path
 
-from ..views.customers import CustomerDetailView, CustomerListView, CustomerProfileView
+from ..views.customers import (
+    CustomerDetailView,
+    CustomerExportView,
+    CustomerListView,
+    CustomerProfileView,
+)
 
 urlpatterns = [
+    path(
+        "/export",
+        CustomerExportView.as_view(),
+        name="customer.export",
+    ),
     path(
         "/<uuid:customer_uid>/profile",
         CustomerProfileView.as_view(),
@@ -1,8 +1,17 @@
 from django.urls import path
 
-from ..views.leads import AccountLeadDetailView, AccountLeadListView
+from ..views.leads import (
+    AccountLeadDetailView,
+    AccountLeadExportView,
+    AccountLeadListView,
+)
 
 urlpatterns = [
+    path(
+        "/export",
+        AccountLeadExportView.as_view(),
+        name="account-lead-export",
+    ),
     path(
         "/<uuid:lead_uid>",
         AccountLeadDetailView.as_view(),
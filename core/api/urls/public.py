@@ -4,6 +4,7 @@ from ..views.public import (
     PublicSalonListView,
     PublicSalonDetailView,
     PublicSalonBookingView,
+    PublicSalonFreeSlotListView,
 )
 
 urlpatterns = [
@@ -13,6 +14,11 @@ urlpatterns = [
         PublicSalonDetailView.as_view(),
         name="public.salon-detail",
     ),
+    path(
+        "/salons/<uuid:salon_uid>/free-slots",
+        PublicSalonFreeSlotListView.as_view(),
+        name="public.salon-free-slot-list",
+    ),
     path(
         "/booking",
         PublicSalonBookingView.as_view(),
@@ -15,9 +15,11 @@ from ..views.salons import (
     SalonChairBookingListView,
     SalonChairBookingDetailView,
     SalonBookingListView,
+    SalonBookingExportView,
     SalonBookingDetailView,
     SalonBookingCalendarListView,
     SalonBookingCalendarDetailView,
+    SalonFreeSlotListView,
     SalonLookBookListView,
     SalonLookBookDetailView,
     SalonBookingReceiptDownloadAPIView,
@@ -35,9 +37,21 @@ from ..views.salons import (
     SalonWhatsappChatbotConfigView,
     SalonWhatsappView,
     SalonWhatsappChatbotMessageLogListAPIView,
+    SalonImportJobListView,
+    SalonImportJobDetailView,
 )
 
 urlpatterns = [
+    path(
+        "/<uuid:salon_uid>/imports/<uuid:import_uid>",
+        SalonImportJobDetailView.as_view(),
+        name="salon.import-detail",
+    ),
+    path(
+        "/<uuid:salon_uid>/imports",
+        SalonImportJobListView.as_view(),
+        name="salon.import-list",
+    ),
     path(
         "/<uuid:salon_uid>/messages",
         SalonWhatsappChatbotMessageLogListAPIView.as_view(),
@@ -128,6 +142,11 @@ urlpatterns = [
         SalonBookingDetailView.as_view(),
         name="salon.booking-detail",
     ),
+    path(
+        "/<uuid:salon_uid>/bookings/export",
+        SalonBookingExportView.as_view(),
+        name="salon.booking-export",
+    ),
     path(
         "/<uuid:salon_uid>/bookings",
         SalonBookingListView.as_view(),
@@ -163,6 +182,11 @@ urlpatterns = [
         SalonBookingCalendarListView.as_view(),
         name="salon.booking-calendar",
     ),
+    path(
+        "/<uuid:salon_uid>/free-slots",
+        SalonFreeSlotListView.as_view(),
+        name="salon.free-slot-list",
+    ),
     path(
         "/<uuid:salon_uid>/employees/<uuid:employee_uid>",
         SalonEmployeeDetailView.as_view(),
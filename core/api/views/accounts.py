@@ -5,6 +5,7 @@ from decimal import Decimal
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.db import transaction
+from django.db.models import Count, F, Q, Sum
 from django.utils import timezone
 
 from rest_framework.exceptions import ValidationError
@@ -33,8 +34,10 @@ from apps.billing.utils import (
     charge_customer,
 )
 from apps.authentication.emails import send_account_invitation_email
-from apps.salon.models import Booking
+from apps.salon.analytics_cache import cache_account_response
+from apps.salon.models import Booking, SalonDailyRevenue
 from apps.salon.models import BookingStatus
+from apps.salon.choices import RevenueDimension
 from apps.support.models import AccountSupportTicket
 
 
@@ -430,10 +433,14 @@ class AccountDashboardApiView(APIView):
         return today - timedelta(days=7), today
 
     def apply_date_filter(self, queryset, field, start_date, end_date):
+        return queryset.filter(self.date_filter(field, start_date, end_date))
+
+    def date_filter(self, field, start_date, end_date):
         if start_date and end_date:
-            return queryset.filter(**{f"{field}__range": (start_date, end_date)})
-        return queryset
+            return Q(**{f"{field}__range": (start_date, end_date)})
+        return Q()
 
+    @cache_account_response
     def get(self, request):
         account = request.account
 
@@ -443,17 +450,27 @@ class AccountDashboardApiView(APIView):
         requests_filter = request.query_params.get("requests_filter", "last_7_days")
         clients_filter = request.query_params.get("clients_filter", "last_7_days")
 
+        bookings_period = self.date_filter(
+            "booking_date", *self.get_date_range(bookings_filter)
+        )
+        clients_period = self.date_filter(
+            "booking_date", *self.get_date_range(clients_filter)
+        )
+
         # ==========================
-        # CARD 1 - BOOKINGS
+        # CARD 1 + CARD 4 - BOOKINGS AND CLIENTS, one conditional aggregate
         # ==========================
-        bookings = Booking.objects.filter(account=account)
-        start, end = self.get_date_range(bookings_filter)
-        bookings = self.apply_date_filter(bookings, "booking_date", start, end)
-
-        total_bookings = bookings.count()
+        booking_counts = Booking.objects.filter(account=account).aggregate(
+            total_bookings=Count("id", filter=bookings_period),
+            completed_count=Count(
+                "id", filter=bookings_period & Q(status=BookingStatus.COMPLETED)
+            ),
+            total_clients=Count("customer", filter=clients_period, distinct=True),
+        )
 
-        completed_bookings = bookings.filter(status=BookingStatus.COMPLETED)
-        completed_count = completed_bookings.count()
+        total_bookings = booking_counts["total_bookings"]
+        completed_count = booking_counts["completed_count"]
+        total_clients = booking_counts["total_clients"]
 
         completion_rate = (
             round((completed_count / total_bookings) * 100, 2)
@@ -464,24 +481,17 @@ class AccountDashboardApiView(APIView):
         # ==========================
         # CARD 2 - INCOME
         # ==========================
-        income_bookings = Booking.objects.filter(
-            account=account, status=BookingStatus.COMPLETED
+        # Services after discount, products and tips of completed bookings,
+        # summed from the salons' daily revenue rollups
+        income_rows = SalonDailyRevenue.objects.filter(
+            salon__account=account, dimension=RevenueDimension.TOTAL
         )
         start, end = self.get_date_range(income_filter)
-        income_bookings = self.apply_date_filter(
-            income_bookings, "booking_date", start, end
-        )
-
-        total_income = Decimal("0.00")
+        income_rows = self.apply_date_filter(income_rows, "date", start, end)
 
-        for booking in income_bookings.prefetch_related("services", "products"):
-            for service in booking.services.all():
-                total_income += service.final_price()
-
-            for product in booking.products.all():
-                total_income += product.price
-
-            total_income += booking.tips_amount or Decimal("0.00")
+        total_income = income_rows.aggregate(
+            total=Sum(F("gross_amount") - F("discount_amount") + F("tips_amount"))
+        )["total"] or Decimal("0.00")
 
         total_income = total_income.quantize(Decimal("0.01"))
 
@@ -496,17 +506,6 @@ class AccountDashboardApiView(APIView):
 
         client_requests_count = client_requests.count()
 
-        # ==========================
-        # CARD 4 - TOTAL CLIENTS
-        # ==========================
-        clients_bookings = Booking.objects.filter(account=account)
-        start, end = self.get_date_range(clients_filter)
-        clients_bookings = self.apply_date_filter(
-            clients_bookings, "booking_date", start, end
-        )
-
-        total_clients = clients_bookings.values("customer").distinct().count()
-
         return Response(
             {
                 "card_1": {
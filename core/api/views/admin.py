@@ -29,11 +29,13 @@ from rest_framework.generics import (
 )
 
 from common.filters import AdminManagementRoleFilter
+from common.pagination import BOOKING_CURSOR_ORDERING, BookingCursorPagination
 from common.permissions import IsManagementAdmin, IsManagementAdminOrStaff
 
 from apps.authentication.choices import AccountMembershipRole
 from apps.authentication.emails import send_verification_email
 from apps.authentication.models import Account, AccountMembership
+from apps.salon.analytics_cache import cache_salon_response
 from apps.salon.models import (
     Salon,
     Service,
@@ -243,6 +245,7 @@ class AdminSalonDetailView(RetrieveAPIView):
 class AdminSalonDashboardApiView(APIView):
     permission_classes = [IsManagementAdminOrStaff]
 
+    @cache_salon_response
     def get(self, request, account_uid, salon_uid):
         try:
             # Verify salon exists
@@ -444,6 +447,7 @@ class AdminEmployeeListView(ListAPIView):
 class AdminBookingListView(ListAPIView):
     serializer_class = AdminBookingSerializer
     permission_classes = [IsManagementAdminOrStaff]
+    pagination_class = BookingCursorPagination
     filter_backends = [
         DjangoFilterBackend,
         filters.SearchFilter,
@@ -465,8 +469,8 @@ class AdminBookingListView(ListAPIView):
         "services__name",
         "products__name",
     ]
-    ordering_fields = ["created_at", "booking_duration"]
-    ordering = ["-created_at"]
+    ordering_fields = ["booking_date"]
+    ordering = BOOKING_CURSOR_ORDERING
 
     def get_queryset(self):
         account_uid = self.kwargs.get("account_uid")
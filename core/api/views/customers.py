@@ -6,6 +6,8 @@ from rest_framework.generics import ListAPIView, RetrieveAPIView, get_object_or_
 from apps.salon.choices import CustomerType
 from apps.salon.models import Customer
 
+from common.exports import ExportView
+from common.pagination import CUSTOMER_CURSOR_ORDERING, CustomerCursorPagination
 from common.permissions import IsOwnerOrAdminOrStaff
 
 from ..serializers.customers import CustomerSerializer, CustomerProfileSerializer
@@ -14,6 +16,7 @@ from ..serializers.customers import CustomerSerializer, CustomerProfileSerialize
 class CustomerListView(ListAPIView):
     serializer_class = CustomerSerializer
     permission_classes = [IsOwnerOrAdminOrStaff]
+    pagination_class = CustomerCursorPagination
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     search_fields = ["first_name", "last_name", "email", "phone", "salon__name"]
     filterset_fields = {
@@ -21,14 +24,30 @@ class CustomerListView(ListAPIView):
         "updated_at": ["gte", "lte"],
         "salon__uid": ["exact"],
     }
-    ordering_fields = ["first_name", "last_name", "created_at", "updated_at"]
-    ordering = ["-created_at"]
+    ordering_fields = ["created_at"]
+    ordering = CUSTOMER_CURSOR_ORDERING
 
     def get_queryset(self):
         account = self.request.account
         return Customer.objects.filter(account=account, type=CustomerType.CUSTOMER)
 
 
+class CustomerExportView(ExportView, CustomerListView):
+    """Customers matching the list filters, as CSV or NDJSON."""
+
+    export_filename = "customers"
+    export_fields = {
+        "uid": "uid",
+        "first_name": "first_name",
+        "last_name": "last_name",
+        "email": "email",
+        "phone": "phone",
+        "source": "source__name",
+        "salon": "salon__name",
+        "created_at": "created_at",
+    }
+
+
 class CustomerDetailView(RetrieveAPIView):
     serializer_class = CustomerSerializer
     permission_classes = [IsOwnerOrAdminOrStaff]
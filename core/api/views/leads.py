@@ -5,7 +5,9 @@ from django.shortcuts import get_object_or_404
 from rest_framework.generics import ListCreateAPIView, RetrieveUpdateAPIView
 from rest_framework import filters
 
+from common.exports import ExportView
 from common.filters import SalonLeadFilter
+from common.pagination import CUSTOMER_CURSOR_ORDERING, CustomerCursorPagination
 from common.permissions import (
     IsOwnerOrAdmin,
     IsOwnerOrAdminOrStaff,
@@ -20,6 +22,7 @@ from ..serializers.leads import AccountLeadSerializer
 class AccountLeadListView(ListCreateAPIView):
     serializer_class = AccountLeadSerializer
     permission_classes = [IsOwnerOrAdminOrStaff]
+    pagination_class = CustomerCursorPagination
     filter_backends = [
         DjangoFilterBackend,
         filters.SearchFilter,
@@ -34,15 +37,13 @@ class AccountLeadListView(ListCreateAPIView):
         "source__name",
     ]
     ordering_fields = ["created_at"]
-    ordering = ["-created_at"]
+    ordering = CUSTOMER_CURSOR_ORDERING
 
     def get_queryset(self):
-        user = self.request.user
         account = self.request.account
 
         return Customer.objects.filter(
             account=account,
-            account__members__user=user,
             type=CustomerType.LEAD,
         )
 
@@ -52,6 +53,22 @@ class AccountLeadListView(ListCreateAPIView):
         serializer.save(account=account)
 
 
+class AccountLeadExportView(ExportView, AccountLeadListView):
+    """Leads matching the list filters, as CSV or NDJSON."""
+
+    export_filename = "leads"
+    export_fields = {
+        "uid": "uid",
+        "first_name": "first_name",
+        "last_name": "last_name",
+        "email": "email",
+        "phone": "phone",
+        "source": "source__name",
+        "salon": "salon__name",
+        "created_at": "created_at",
+    }
+
+
 class AccountLeadDetailView(RetrieveUpdateAPIView):
     serializer_class = AccountLeadSerializer
     lookup_url_kwarg = "lead_uid"
@@ -5,7 +5,12 @@ from rest_framework.generics import (
     CreateAPIView,
     RetrieveAPIView,
     RetrieveUpdateAPIView,
+    get_object_or_404,
 )
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.salon.availability import free_slot_grid
 
 from apps.salon.models import Booking, Salon
 from apps.salon.choices import SalonStatus
@@ -14,6 +19,7 @@ from common.filters import SalonAvailabilityFilter
 from common.locations import get_customer_ip_address, get_country_from_ip
 
 from ..serializers.public import PublicSalonSerializer, PublicSalonBookingSerializer
+from ..serializers.salons import SalonFreeSlotQuerySerializer
 
 
 class PublicSalonListView(ListAPIView):
@@ -44,3 +50,23 @@ class PublicSalonBookingView(CreateAPIView):
     queryset = Booking.objects.all()
     serializer_class = PublicSalonBookingSerializer
     permission_classes = []
+
+
+class PublicSalonFreeSlotListView(APIView):
+    permission_classes = []
+
+    def get(self, request, salon_uid):
+        salon = get_object_or_404(Salon, uid=salon_uid, status=SalonStatus.ACTIVE)
+
+        serializer = SalonFreeSlotQuerySerializer(
+            data=request.query_params, context={"salon": salon}
+        )
+        serializer.is_valid(raise_exception=True)
+
+        return Response(
+            {
+                "start_date": serializer.validated_data["start_date"],
+                "end_date": serializer.validated_data["end_date"],
+                "days": free_slot_grid(salon, **serializer.validated_data),
+            }
+        )
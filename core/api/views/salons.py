@@ -1,24 +1,32 @@
 import logging
 from calendar import monthrange
-from datetime import datetime
+from datetime import date, datetime
 from datetime import timedelta
 from decimal import Decimal
 from decouple import config
 
 # Register whatsapp sender on Twilio
-from twilio.rest import Client as TwilioClient
 from twilio.rest.messaging.v2 import ChannelsSenderList
 
 from django.conf import settings
 from django.db import transaction
-from django.db.models import Prefetch, Count, Sum, F, DecimalField, Q
-from django.db.models.functions import ExtractWeekDay, ExtractHour
+from django.db.models import (
+    Prefetch,
+    Count,
+    Sum,
+    Min,
+    Q,
+    DateField,
+    OuterRef,
+    Subquery,
+)
+from django.db.models.functions import ExtractWeekDay, TruncWeek
 from django.http import FileResponse
-from django.utils import timezone
 
 from rest_framework.generics import (
     ListAPIView,
     ListCreateAPIView,
+    RetrieveAPIView,
     RetrieveUpdateAPIView,
     RetrieveUpdateDestroyAPIView,
     get_object_or_404,
@@ -31,24 +39,42 @@ from django_filters.rest_framework import DjangoFilterBackend
 
 
 from apps.authentication.models import AccountMembership
-from apps.salon.choices import BookingStatus
+from apps.salon.analytics_cache import cache_salon_response
+from apps.salon.availability import free_slot_grid
+from apps.salon.choices import BookingStatus, RevenueDimension
 from apps.salon.models import (
     Booking,
     Chair,
     Salon,
     Service,
+    ServiceCategory,
     Product,
+    ProductCategory,
     Employee,
+    SalonImportJob,
 )
+from apps.salon.pricing import split_line_items
+from apps.salon.rollups import revenue_rows, top_revenue_objects
+from apps.salon.tasks import process_import_job
 
 from apps.thirdparty.models import (
     WhatsappChatbotConfig,
     WhatsappChatbotMessageLog,
 )
+from apps.thirdparty.twilio_clients import (
+    get_chatbot_twilio_client,
+    get_twilio_client,
+)
 from apps.thirdparty.utils import get_or_create_subaccount
 
-from common.crypto import encrypt_data, decrypt_data
+from common.crypto import encrypt_data
+from common.exports import ExportView
 from common.filters import BookingDateFilter
+from common.pagination import (
+    BOOKING_CURSOR_ORDERING,
+    BookingCursorPagination,
+    MessageLogCursorPagination,
+)
 from common.permissions import (
     IsOwner,
     IsOwnerOrAdmin,
@@ -67,12 +93,18 @@ from ..serializers.salons import (
     SalonChairBookingSerializer,
     SalonBookingCalendarSerializer,
     SalonBookingCalendarDetailSerializer,
+    SalonFreeSlotQuerySerializer,
     SalonLookBookSerializer,
     SalonWhatsappChatbotMessageLogSerializer,
+    SalonImportJobSerializer,
+    SalonImportJobDetailSerializer,
 )
 
 logger = logging.getLogger(__name__)
 
+# Weekly cohorts reported by CustomerAnalysisApiView for 'all_time'
+COHORT_RETENTION_WEEKS = 12
+
 
 class SalonListView(ListCreateAPIView):
     serializer_class = SalonSerializer
@@ -95,10 +127,9 @@ class SalonListView(ListCreateAPIView):
         serializer.save(account=account_membership.account)
 
     def get_queryset(self):
-        user = self.request.user
         account = self.request.account
 
-        return Salon.objects.filter(account=account, account__members__user=user)
+        return Salon.objects.filter(account=account)
 
 
 class SalonDetailView(RetrieveUpdateDestroyAPIView):
@@ -115,25 +146,20 @@ class SalonDetailView(RetrieveUpdateDestroyAPIView):
         return super().get_permissions()
 
     def get_object(self):
-        user = self.request.user
         account = self.request.account
         uid = self.kwargs.get("salon_uid")
 
-        return get_object_or_404(
-            Salon, uid=uid, account=account, account__members__user=user
-        )
+        return get_object_or_404(Salon, uid=uid, account=account)
 
 
 class SalonDashboardApiView(APIView):
     permission_classes = [IsOwnerOrAdminOrStaff]
 
+    @cache_salon_response
     def get(self, request, salon_uid):
-        user = request.user
         account = request.account
 
-        counts = Salon.objects.filter(
-            uid=salon_uid, account=account, account__members__user=user
-        ).aggregate(
+        counts = Salon.objects.filter(uid=salon_uid, account=account).aggregate(
             total_chairs=Count("salon_chairs", distinct=True),
             total_employees=Count("salon_employees", distinct=True),
             total_services=Count("salon_services", distinct=True),
@@ -163,14 +189,12 @@ class SalonServiceListView(ListCreateAPIView):
         return super().get_permissions()
 
     def get_queryset(self):
-        user = self.request.user
         account = self.request.account
         salon_uid = self.kwargs.get("salon_uid")
 
         return Service.objects.select_related("category", "sub_category").filter(
             account=account,
             salon__uid=salon_uid,
-            account__members__user=user,
         )
 
     def perform_create(self, serializer):
@@ -194,7 +218,6 @@ class SalonServiceDetailView(RetrieveUpdateDestroyAPIView):
         return super().get_permissions()
 
     def get_object(self):
-        user = self.request.user
         account = self.request.account
         salon_uid = self.kwargs.get("salon_uid")
         service_uid = self.kwargs.get("service_uid")
@@ -204,7 +227,6 @@ class SalonServiceDetailView(RetrieveUpdateDestroyAPIView):
             uid=service_uid,
             salon__uid=salon_uid,
             account=account,
-            account__members__user=user,
         )
 
 
@@ -228,14 +250,12 @@ class SalonProductListView(ListCreateAPIView):
         return super().get_permissions()
 
     def get_queryset(self):
-        user = self.request.user
         account = self.request.account
         salon_uid = self.kwargs.get("salon_uid")
 
         return Product.objects.select_related("category", "sub_category").filter(
             account=account,
             salon__uid=salon_uid,
-            account__members__user=user,
         )
 
     def perform_create(self, serializer):
@@ -259,7 +279,6 @@ class SalonProductDetailView(RetrieveUpdateDestroyAPIView):
         return super().get_permissions()
 
     def get_object(self):
-        user = self.request.user
         account = self.request.account
         salon_uid = self.kwargs.get("salon_uid")
         product_uid = self.kwargs.get("product_uid")
@@ -269,7 +288,6 @@ class SalonProductDetailView(RetrieveUpdateDestroyAPIView):
             uid=product_uid,
             salon__uid=salon_uid,
             account=account,
-            account__members__user=user,
         )
 
 
@@ -293,14 +311,12 @@ class SalonEmployeeListView(ListCreateAPIView):
         return super().get_permissions()
 
     def get_queryset(self):
-        user = self.request.user
         account = self.request.account
         salon_uid = self.kwargs.get("salon_uid")
 
         return Employee.objects.filter(
             account=account,
             salon__uid=salon_uid,
-            account__members__user=user,
         )
 
     def perform_create(self, serializer):
@@ -324,7 +340,6 @@ class SalonEmployeeDetailView(RetrieveUpdateDestroyAPIView):
         return super().get_permissions()
 
     def get_object(self):
-        user = self.request.user
         account = self.request.account
         salon_uid = self.kwargs.get("salon_uid")
         employee_uid = self.kwargs.get("employee_uid")
@@ -334,7 +349,6 @@ class SalonEmployeeDetailView(RetrieveUpdateDestroyAPIView):
             uid=employee_uid,
             salon__uid=salon_uid,
             account=account,
-            account__members__user=user,
         )
 
 
@@ -358,14 +372,12 @@ class SalonChairListView(ListCreateAPIView):
         return super().get_permissions()
 
     def get_queryset(self):
-        user = self.request.user
         account = self.request.account
         salon_uid = self.kwargs.get("salon_uid")
 
         return Chair.objects.filter(
             account=account,
             salon__uid=salon_uid,
-            account__members__user=user,
         )
 
     def perform_create(self, serializer):
@@ -389,7 +401,6 @@ class SalonChairDetailView(RetrieveUpdateDestroyAPIView):
         return super().get_permissions()
 
     def get_object(self):
-        user = self.request.user
         account = self.request.account
         salon_uid = self.kwargs.get("salon_uid")
         chair_uid = self.kwargs.get("chair_uid")
@@ -399,14 +410,13 @@ class SalonChairDetailView(RetrieveUpdateDestroyAPIView):
             uid=chair_uid,
             salon__uid=salon_uid,
             account=account,
-            account__members__user=user,
         )
 
 
 class SalonBookingListView(ListCreateAPIView):
     serializer_class = SalonBookingSerializer
     permission_classes = [IsOwnerOrAdminOrStaff]
-    pagination_class = None
+    pagination_class = BookingCursorPagination
 
     filter_backends = [
         DjangoFilterBackend,
@@ -424,18 +434,16 @@ class SalonBookingListView(ListCreateAPIView):
         "booking_id",
     ]
 
-    ordering_fields = ["created_at", "booking_date", "booking_time"]
-    ordering = ["-created_at"]
+    ordering_fields = ["booking_date"]
+    ordering = BOOKING_CURSOR_ORDERING
 
     def get_queryset(self):
-        user = self.request.user
         account = self.request.account
         salon_uid = self.kwargs.get("salon_uid")
 
         return Booking.objects.filter(
             account=account,
             salon__uid=salon_uid,
-            account__members__user=user,
         )
 
     def perform_create(self, serializer):
@@ -445,6 +453,50 @@ class SalonBookingListView(ListCreateAPIView):
         serializer.save(salon=salon, account=account)
 
 
+class SalonBookingExportView(ExportView, SalonBookingListView):
+    """
+    GET /api/salons/<salon_uid>/bookings/export?date_type=one_year
+    Bookings matching the list filters, as CSV or NDJSON. Prices come from
+    each booking's price snapshot.
+    """
+
+    export_filename = "bookings"
+    export_fields = {
+        "booking_id": "booking_id",
+        "booking_date": "booking_date",
+        "booking_time": "booking_time",
+        "status": "status",
+        "customer_first_name": "customer__first_name",
+        "customer_last_name": "customer__last_name",
+        "customer_phone": "customer__phone",
+        "customer_email": "customer__email",
+        "employee": "employee__name",
+        "chair": "chair__name",
+        "payment_type": "payment_type",
+        "total_services_price": "total_services_price",
+        "services_discount_price": "services_discount_price",
+        "total_products_price": "total_products_price",
+        "tips_amount": "tips_amount",
+        "line_items": "line_items",
+    }
+
+    def get_export_columns(self):
+        columns = [column for column in self.export_fields if column != "line_items"]
+        return columns + ["final_price", "services", "products"]
+
+    def get_export_row(self, values):
+        row = super().get_export_row(values)
+        services, products = split_line_items(row.pop("line_items") or [])
+        row["final_price"] = (
+            row["services_discount_price"]
+            + row["total_products_price"]
+            + (row["tips_amount"] or Decimal("0.00"))
+        )
+        row["services"] = "; ".join(line["name"] for line in services)
+        row["products"] = "; ".join(line["name"] for line in products)
+        return row
+
+
 class SalonBookingDetailView(RetrieveUpdateAPIView):
     serializer_class = SalonBookingSerializer
     permission_classes = [IsOwnerOrAdminOrStaff]
@@ -452,7 +504,6 @@ class SalonBookingDetailView(RetrieveUpdateAPIView):
     lookup_url_kwarg = "booking_uid"
 
     def get_object(self):
-        user = self.request.user
         account = self.request.account
         salon_uid = self.kwargs.get("salon_uid")
         booking_uid = self.kwargs.get("booking_uid")
@@ -462,7 +513,6 @@ class SalonBookingDetailView(RetrieveUpdateAPIView):
             uid=booking_uid,
             salon__uid=salon_uid,
             account=account,
-            account__members__user=user,
         )
 
     def perform_update(self, serializer):
@@ -497,7 +547,6 @@ class SalonChairBookingListView(ListCreateAPIView):
     ordering = ["-created_at"]
 
     def get_queryset(self):
-        user = self.request.user
         account = self.request.account
         salon_uid = self.kwargs.get("salon_uid")
         chair_uid = self.kwargs.get("chair_uid")
@@ -506,7 +555,6 @@ class SalonChairBookingListView(ListCreateAPIView):
             account=account,
             chair__uid=chair_uid,
             salon__uid=salon_uid,
-            account__members__user=user,
         )
 
     def perform_create(self, serializer):
@@ -525,7 +573,6 @@ class SalonChairBookingDetailView(RetrieveUpdateAPIView):
     lookup_url_kwarg = "booking_uid"
 
     def get_object(self):
-        user = self.request.user
         account = self.request.account
         salon_uid = self.kwargs.get("salon_uid")
         chair_uid = self.kwargs.get("chair_uid")
@@ -537,7 +584,6 @@ class SalonChairBookingDetailView(RetrieveUpdateAPIView):
             chair__uid=chair_uid,
             salon__uid=salon_uid,
             account=account,
-            account__members__user=user,
         )
 
     def perform_update(self, serializer):
@@ -554,7 +600,6 @@ class SalonBookingCalendarListView(ListAPIView):
     permission_classes = [IsOwnerOrAdminOrStaff]
 
     def get_queryset(self):
-        user = self.request.user
         account = self.request.account
         salon_uid = self.kwargs.get("salon_uid")
 
@@ -562,13 +607,17 @@ class SalonBookingCalendarListView(ListAPIView):
         date_str = self.request.query_params.get("date")
         status = self.request.query_params.get("status")
 
+        salon_today = get_object_or_404(
+            Salon, uid=salon_uid, account=account
+        ).local_today()
+
         if date_str:
             try:
                 target_date = datetime.strptime(date_str, "%Y-%m-%d").date()
             except ValueError:
-                target_date = datetime.now().date()
+                target_date = salon_today
         else:
-            target_date = datetime.now().date()
+            target_date = salon_today
 
         allowed_statuses = [
             BookingStatus.PLACED,
@@ -596,7 +645,6 @@ class SalonBookingCalendarListView(ListAPIView):
         return Employee.objects.filter(
             salon__uid=salon_uid,
             account=account,
-            account__members__user=user,
         ).prefetch_related(Prefetch("employee_bookings", queryset=booking_qs))
 
 
@@ -614,7 +662,6 @@ class SalonBookingCalendarDetailView(RetrieveUpdateAPIView):
         return super().get_permissions()
 
     def get_object(self):
-        user = self.request.user
         account = self.request.account
         salon_uid = self.kwargs.get("salon_uid")
         booking_uid = self.kwargs.get("booking_uid")
@@ -624,13 +671,33 @@ class SalonBookingCalendarDetailView(RetrieveUpdateAPIView):
             uid=booking_uid,
             salon__uid=salon_uid,
             account=account,
-            account__members__user=user,
+        )
+
+
+class SalonFreeSlotListView(APIView):
+    permission_classes = [IsOwnerOrAdminOrStaff]
+
+    def get(self, request, salon_uid):
+        salon = get_object_or_404(Salon, uid=salon_uid, account=request.account)
+
+        serializer = SalonFreeSlotQuerySerializer(
+            data=request.query_params, context={"salon": salon}
+        )
+        serializer.is_valid(raise_exception=True)
+
+        return Response(
+            {
+                "start_date": serializer.validated_data["start_date"],
+                "end_date": serializer.validated_data["end_date"],
+                "days": free_slot_grid(salon, **serializer.validated_data),
+            }
         )
 
 
 class SalonLookBookListView(ListAPIView):
     serializer_class = SalonLookBookSerializer
     permission_classes = [IsOwnerOrAdminOrStaff]
+    pagination_class = BookingCursorPagination
     filter_backends = [
         DjangoFilterBackend,
         filters.SearchFilter,
@@ -643,18 +710,16 @@ class SalonLookBookListView(ListAPIView):
         "customer__phone",
         "booking_id",
     ]
-    ordering_fields = ["created_at", "booking_date"]
-    ordering = ["-created_at"]
+    ordering_fields = ["booking_date"]
+    ordering = BOOKING_CURSOR_ORDERING
 
     def get_queryset(self):
-        user = self.request.user
         account = self.request.account
         salon_uid = self.kwargs.get("salon_uid")
 
         queryset = Booking.objects.filter(
             account=account,
             salon__uid=salon_uid,
-            account__members__user=user,
             status=BookingStatus.COMPLETED,
         )
 
@@ -675,7 +740,6 @@ class SalonLookBookDetailView(RetrieveUpdateAPIView):
         return super().get_permissions()
 
     def get_object(self):
-        user = self.request.user
         account = self.request.account
         salon_uid = self.kwargs.get("salon_uid")
         lookbook_uid = self.kwargs.get("lookbook_uid")
@@ -685,7 +749,6 @@ class SalonLookBookDetailView(RetrieveUpdateAPIView):
             uid=lookbook_uid,
             salon__uid=salon_uid,
             account=account,
-            account__members__user=user,
             status=BookingStatus.COMPLETED,
         )
 
@@ -730,9 +793,17 @@ class BaseRevenueAnalyticsView(generics.GenericAPIView):
 
     permission_classes = [IsOwnerOrAdminOrStaff]
 
+    def get_salon(self):
+        if not hasattr(self, "_salon"):
+            salon_uid = self.kwargs.get("salon_uid")
+            self._salon = get_object_or_404(
+                Salon, uid=salon_uid, account=self.request.account
+            )
+        return self._salon
+
     def get_date_range(self, period):
-        """Calculate date range based on period filter"""
-        today = timezone.now().date()
+        """Calculate date range based on period filter, in the salon's timezone"""
+        today = self.get_salon().local_today()
 
         if period == "this_week":
             start_date = today - timedelta(days=today.weekday())
@@ -755,51 +826,33 @@ class BaseRevenueAnalyticsView(generics.GenericAPIView):
 
         return start_date, end_date
 
-    def get_completed_bookings_queryset(self, start_date, end_date):
-        salon_uid = self.kwargs.get("salon_uid")
-        salon = get_object_or_404(Salon, uid=salon_uid, account=self.request.account)
-
-        qs = Booking.objects.filter(
-            status=BookingStatus.COMPLETED,
-            salon=salon,
-            account=self.request.account,
+    def get_top_revenue(self, dimension, model, start_date, end_date):
+        """Top 5 of a rollup dimension, as (instance, totals) pairs"""
+        return top_revenue_objects(
+            self.get_salon(),
+            dimension,
+            model,
+            start_date=start_date,
+            end_date=end_date,
         )
 
-        if start_date and end_date:
-            qs = qs.filter(
-                booking_date__gte=start_date,
-                booking_date__lte=end_date,
-            )
-
-        return qs
-
 
 class TopServiceCategoryRevenueView(BaseRevenueAnalyticsView):
+    @cache_salon_response
     def get(self, request, *args, **kwargs):
         period = request.query_params.get("period", "all_time")
         start_date, end_date = self.get_date_range(period)
 
-        bookings = self.get_completed_bookings_queryset(start_date, end_date)
-
-        category_revenue = (
-            bookings.values("services__category__name")
-            .annotate(
-                revenue=Sum(
-                    F("services__price")
-                    * (1 - F("services__discount_percentage") / 100),
-                    output_field=DecimalField(max_digits=12, decimal_places=2),
-                )
-            )
-            .filter(revenue__gt=0)
-            .order_by("-revenue")[:5]
+        category_revenue = self.get_top_revenue(
+            RevenueDimension.SERVICE_CATEGORY, ServiceCategory, start_date, end_date
         )
 
         data = [
             {
-                "service_category": item["services__category__name"],
+                "service_category": category.name if category else None,
                 "revenue": float(item["revenue"]),
             }
-            for item in category_revenue
+            for category, item in category_revenue
         ]
 
         return Response(data)
@@ -812,30 +865,21 @@ class TopProductCategoryRevenueView(BaseRevenueAnalyticsView):
     Returns top 5 product categories by revenue
     """
 
+    @cache_salon_response
     def get(self, request, *args, **kwargs):
         period = request.query_params.get("period", "all_time")
         start_date, end_date = self.get_date_range(period)
 
-        bookings = self.get_completed_bookings_queryset(start_date, end_date)
-
-        category_revenue = (
-            bookings.values("products__category__name")
-            .annotate(
-                revenue=Sum(
-                    "products__price",
-                    output_field=DecimalField(max_digits=12, decimal_places=2),
-                )
-            )
-            .filter(revenue__gt=0)
-            .order_by("-revenue")[:5]
+        category_revenue = self.get_top_revenue(
+            RevenueDimension.PRODUCT_CATEGORY, ProductCategory, start_date, end_date
         )
 
         data = [
             {
-                "product_category": item["products__category__name"],
+                "product_category": category.name if category else None,
                 "revenue": float(item["revenue"]),
             }
-            for item in category_revenue
+            for category, item in category_revenue
         ]
 
         return Response(data)
@@ -848,31 +892,21 @@ class TopServicesRevenueView(BaseRevenueAnalyticsView):
     Returns top 5 individual services by revenue
     """
 
+    @cache_salon_response
     def get(self, request, *args, **kwargs):
         period = request.query_params.get("period", "all_time")
         start_date, end_date = self.get_date_range(period)
 
-        bookings = self.get_completed_bookings_queryset(start_date, end_date)
-
-        service_revenue = (
-            bookings.values("services__name")
-            .annotate(
-                revenue=Sum(
-                    F("services__price")
-                    * (1 - F("services__discount_percentage") / 100),
-                    output_field=DecimalField(max_digits=12, decimal_places=2),
-                )
-            )
-            .filter(revenue__gt=0)
-            .order_by("-revenue")[:5]
+        service_revenue = self.get_top_revenue(
+            RevenueDimension.SERVICE, Service, start_date, end_date
         )
 
         data = [
             {
-                "service_name": item["services__name"],
+                "service_name": service.name if service else None,
                 "revenue": float(item["revenue"]),
             }
-            for item in service_revenue
+            for service, item in service_revenue
         ]
 
         return Response(data)
@@ -885,30 +919,21 @@ class TopProductsRevenueView(BaseRevenueAnalyticsView):
     Returns top 5 individual products by revenue
     """
 
+    @cache_salon_response
     def get(self, request, *args, **kwargs):
         period = request.query_params.get("period", "all_time")
         start_date, end_date = self.get_date_range(period)
 
-        bookings = self.get_completed_bookings_queryset(start_date, end_date)
-
-        product_revenue = (
-            bookings.values("products__name")
-            .annotate(
-                revenue=Sum(
-                    "products__price",
-                    output_field=DecimalField(max_digits=12, decimal_places=2),
-                )
-            )
-            .filter(revenue__gt=0)
-            .order_by("-revenue")[:5]
+        product_revenue = self.get_top_revenue(
+            RevenueDimension.PRODUCT, Product, start_date, end_date
         )
 
         data = [
             {
-                "product_name": item["products__name"],
+                "product_name": product.name if product else None,
                 "revenue": float(item["revenue"]),
             }
-            for item in product_revenue
+            for product, item in product_revenue
         ]
 
         return Response(data)
@@ -917,6 +942,7 @@ class TopProductsRevenueView(BaseRevenueAnalyticsView):
 class BookingsByMonthView(APIView):
     permission_classes = [IsOwnerOrAdminOrStaff]
 
+    @cache_salon_response
     def get(self, request, salon_uid):
         # Get query parameters
 
@@ -951,30 +977,20 @@ class BookingsByMonthView(APIView):
         # Get the number of days in the selected month
         _, days_in_month = monthrange(year, month)
 
-        # Build query filters
-        filters = Q(
-            account=account,
-            salon=salon,
-            status=BookingStatus.COMPLETED,
-            booking_date__year=year,
-            booking_date__month=month,
-        )
-
-        # Query completed bookings for the selected month
-        bookings = (
-            Booking.objects.filter(filters)
-            .values("booking_date")
-            .annotate(count=Count("id"))
-            .order_by("booking_date")
-        )
+        # Completed bookings per day of the selected month, from the rollups
+        bookings = revenue_rows(
+            salon,
+            RevenueDimension.TOTAL,
+            start_date=date(year, month, 1),
+            end_date=date(year, month, days_in_month),
+        ).values_list("date", "booking_count")
 
         # Initialize all dates with 0 bookings
         bookings_by_date = {day: 0 for day in range(1, days_in_month + 1)}
 
         # Fill in actual booking counts
-        for booking in bookings:
-            day = booking["booking_date"].day
-            bookings_by_date[day] = booking["count"]
+        for booking_date, count in bookings:
+            bookings_by_date[booking_date.day] = count
 
         # Get month name
         month_name = datetime(year, month, 1).strftime("%B")
@@ -990,6 +1006,7 @@ class BookingsByMonthView(APIView):
 class PeakHoursAnalyticsView(APIView):
     permission_classes = [IsOwnerOrAdminOrStaff]
 
+    @cache_salon_response
     def get(self, request, salon_uid):
         account = request.account
         salon = get_object_or_404(Salon, uid=salon_uid, account=account)
@@ -1004,30 +1021,25 @@ class PeakHoursAnalyticsView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # Define date filters
-        today = datetime.now().date()
+        # Define date filters (booking dates are salon-local)
+        today = salon.local_today()
 
         if filter_type == "today":
-            date_filter = Q(booking_date=today)
+            start_date, end_date = today, today
         elif filter_type == "last_7_days":
-            date_filter = Q(booking_date__gte=today - timedelta(days=7))
+            start_date, end_date = today - timedelta(days=7), None
         else:  # all_time
-            date_filter = Q()
+            start_date, end_date = None, None
 
-        # Build query filters
-        filters = (
-            Q(account=account, salon=salon, status=BookingStatus.COMPLETED)
-            & date_filter
-        )
-
-        # Query completed bookings and extract hour
-        bookings = (
-            Booking.objects.filter(filters)
-            .annotate(hour=ExtractHour("booking_time"))
-            .values("hour")
-            .annotate(count=Count("id"))
-            .order_by("hour")
+        # Completed bookings per hour of day, from the rollups
+        hours = (
+            revenue_rows(salon, RevenueDimension.HOUR, start_date, end_date)
+            .values("key")
+            .annotate(count=Sum("booking_count"))
         )
+        bookings = [
+            {"hour": int(item["key"]), "count": item["count"]} for item in hours
+        ]
 
         # Define 2-hour ranges for typical salon hours (9 AM - 9 PM)
         hour_ranges = {
@@ -1063,6 +1075,7 @@ class PeakHoursAnalyticsView(APIView):
 class PeakDaysAnalyticsView(APIView):
     permission_classes = [IsOwnerOrAdminOrStaff]
 
+    @cache_salon_response
     def get(self, request, salon_uid):
         account = request.account
         salon = get_object_or_404(Salon, uid=salon_uid, account=account)
@@ -1077,8 +1090,8 @@ class PeakDaysAnalyticsView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # Define date filters
-        today = datetime.now().date()
+        # Define date filters (booking dates are salon-local)
+        today = salon.local_today()
 
         # Get the start of this week (Monday)
         days_since_monday = today.weekday()
@@ -1086,30 +1099,19 @@ class PeakDaysAnalyticsView(APIView):
         this_week_end = this_week_start + timedelta(days=6)
 
         if filter_type == "this_week":
-            date_filter = Q(
-                booking_date__gte=this_week_start, booking_date__lte=this_week_end
-            )
+            start_date, end_date = this_week_start, this_week_end
         elif filter_type == "last_week":
-            last_week_start = this_week_start - timedelta(days=7)
-            last_week_end = this_week_start - timedelta(days=1)
-            date_filter = Q(
-                booking_date__gte=last_week_start, booking_date__lte=last_week_end
-            )
+            start_date = this_week_start - timedelta(days=7)
+            end_date = this_week_start - timedelta(days=1)
         else:  # all_time
-            date_filter = Q()
-
-        # Build query filters
-        filters = (
-            Q(account=account, salon=salon, status=BookingStatus.COMPLETED)
-            & date_filter
-        )
+            start_date, end_date = None, None
 
-        # Query completed bookings and extract weekday
+        # Completed bookings per weekday, from the daily rollups
         bookings = (
-            Booking.objects.filter(filters)
-            .annotate(weekday=ExtractWeekDay("booking_date"))
+            revenue_rows(salon, RevenueDimension.TOTAL, start_date, end_date)
+            .annotate(weekday=ExtractWeekDay("date"))
             .values("weekday")
-            .annotate(count=Count("id"))
+            .annotate(count=Sum("booking_count"))
             .order_by("weekday")
         )
 
@@ -1161,6 +1163,7 @@ class PeakDaysAnalyticsView(APIView):
 class CustomerAnalysisApiView(APIView):
     permission_classes = [IsOwnerOrAdminOrStaff]
 
+    @cache_salon_response
     def get(self, request, salon_uid, *args, **kwargs):
         account = request.account
         salon = get_object_or_404(Salon, uid=salon_uid, account=account)
@@ -1169,8 +1172,7 @@ class CustomerAnalysisApiView(APIView):
         period = request.query_params.get("period", "all_time")
 
         # Calculate date ranges
-        now = timezone.now()
-        today = now.date()
+        today = salon.local_today()
 
         if period == "this_week":
             start_date = today - timedelta(days=today.weekday())  # Monday
@@ -1193,9 +1195,10 @@ class CustomerAnalysisApiView(APIView):
             )
 
         # Base queryset - filter completed bookings
-        bookings = Booking.objects.filter(
+        completed = Booking.objects.filter(
             salon=salon, account=account, status=BookingStatus.COMPLETED
         )
+        bookings = completed
 
         # Apply date filter if not all_time
         if start_date and end_date:
@@ -1203,63 +1206,38 @@ class CustomerAnalysisApiView(APIView):
                 booking_date__gte=start_date, booking_date__lte=end_date
             )
 
-        # Get all unique customers who had bookings in this period
-        customers_in_period = bookings.values_list("customer_id", flat=True).distinct()
-
-        # For each customer, check if they had any completed bookings BEFORE this period
-        new_customers = []
-        repeated_customers = []
+        # Completed visits of the booking's customer, correlated per row
+        history = (
+            completed.filter(customer_id=OuterRef("customer_id"))
+            .order_by()
+            .values("customer_id")
+        )
 
-        for customer_id in customers_in_period:
-            # Check if customer had any completed bookings before this period
-            if start_date:
-                # For specific time periods, check bookings before start_date
-                previous_bookings = Booking.objects.filter(
-                    salon=salon,
-                    account=account,
-                    customer_id=customer_id,
-                    status=BookingStatus.COMPLETED,
-                    booking_date__lt=start_date,
-                ).exists()
-            else:
-                # For 'all_time', we consider the first booking
-                # Get customer's first completed booking
-                first_booking = (
-                    Booking.objects.filter(
-                        salon=salon,
-                        account=account,
-                        customer_id=customer_id,
-                        status=BookingStatus.COMPLETED,
-                    )
-                    .order_by("booking_date", "booking_time")
-                    .first()
+        if start_date:
+            # Returning: the customer completed a booking before this period
+            bookings = bookings.annotate(
+                first_visit=Subquery(
+                    history.annotate(first=Min("booking_date")).values("first")
                 )
-
-                # Check if customer has more than one booking
-                previous_bookings = (
-                    Booking.objects.filter(
-                        salon=salon,
-                        account=account,
-                        customer_id=customer_id,
-                        status=BookingStatus.COMPLETED,
-                    ).count()
-                    > 1
+            )
+            returning = Q(first_visit__lt=start_date)
+        else:
+            # For 'all_time', returning customers have more than one booking
+            bookings = bookings.annotate(
+                visit_count=Subquery(
+                    history.annotate(count=Count("id")).values("count")
                 )
+            )
+            returning = Q(visit_count__gt=1)
 
-            if previous_bookings:
-                repeated_customers.append(customer_id)
-            else:
-                new_customers.append(customer_id)
-
-        # Count bookings for each category
-        new_customer_booking_count = bookings.filter(
-            customer_id__in=new_customers
-        ).count()
-
-        repeated_customer_booking_count = bookings.filter(
-            customer_id__in=repeated_customers
-        ).count()
+        # Classify every booking of the period in a single aggregate
+        counts = bookings.aggregate(
+            new_customer_booking_count=Count("id", filter=~returning),
+            repeated_customer_booking_count=Count("id", filter=returning),
+        )
 
+        new_customer_booking_count = counts["new_customer_booking_count"]
+        repeated_customer_booking_count = counts["repeated_customer_booking_count"]
         total_bookings = new_customer_booking_count + repeated_customer_booking_count
 
         return Response(
@@ -1267,37 +1245,86 @@ class CustomerAnalysisApiView(APIView):
                 "total_bookings": total_bookings,
                 "new_customer_booking_count": new_customer_booking_count,
                 "repeated_customer_booking_count": repeated_customer_booking_count,
+                "cohort_retention": self.get_cohort_retention(
+                    completed, history, today, start_date, end_date
+                ),
             }
         )
 
+    def get_cohort_retention(self, completed, history, today, start_date, end_date):
+        """
+        Weekly cohorts: customers grouped by the week of their first completed
+        visit, and how many of them came back in each following week.
+        Cohorts starting in the period are returned, the last
+        COHORT_RETENTION_WEEKS weeks for 'all_time'.
+        """
+        this_week = today - timedelta(days=today.weekday())
+        if start_date:
+            first_cohort = start_date - timedelta(days=start_date.weekday())
+            last_cohort = end_date - timedelta(days=end_date.weekday())
+        else:
+            first_cohort = this_week - timedelta(weeks=COHORT_RETENTION_WEEKS - 1)
+            last_cohort = this_week
+
+        first_visit = Subquery(
+            history.annotate(first=Min("booking_date")).values("first"),
+            output_field=DateField(),
+        )
+
+        # Distinct customers per (cohort week, visit week), one query
+        rows = (
+            completed.filter(booking_date__gte=first_cohort)
+            .annotate(
+                cohort_week=TruncWeek(first_visit, output_field=DateField()),
+                week=TruncWeek("booking_date", output_field=DateField()),
+            )
+            .filter(cohort_week__gte=first_cohort, cohort_week__lte=last_cohort)
+            .values("cohort_week", "week")
+            .annotate(customers=Count("customer_id", distinct=True))
+            .order_by("cohort_week", "week")
+        )
+
+        cohorts = {}
+        for row in rows:
+            weeks = cohorts.setdefault(row["cohort_week"], {})
+            weeks[(row["week"] - row["cohort_week"]).days // 7] = row["customers"]
+
+        data = []
+        for cohort_week, weeks in cohorts.items():
+            size = weeks.get(0, 0)
+            data.append(
+                {
+                    "cohort_week": cohort_week,
+                    "customers": size,
+                    "retention": [
+                        {
+                            "week": week,
+                            "customers": weeks.get(week, 0),
+                            "rate": (
+                                round(weeks.get(week, 0) * 100 / size, 2)
+                                if size
+                                else 0.0
+                            ),
+                        }
+                        for week in range((this_week - cohort_week).days // 7 + 1)
+                    ],
+                }
+            )
+
+        return data
+
 
 class TopEmployeeApiView(APIView):
     permission_classes = [IsOwnerOrAdminOrStaff]
 
+    @cache_salon_response
     def get(self, request, salon_uid, *args, **kwargs):
         account = request.account
         salon = get_object_or_404(Salon, uid=salon_uid, account=account)
 
-        bookings = Booking.objects.filter(
-            status=BookingStatus.COMPLETED,
-            salon=salon,
-            account=account,
-        )
-
-        # Get top 5 employees by calculating revenue
-        top_employees = (
-            Employee.objects.filter(employee_bookings__in=bookings)
-            .annotate(
-                # Count number of bookings this employee handled
-                booking_count=Count("employee_bookings", distinct=True),
-                # Calculate total revenue from bookings handled by this employee
-                total_revenue=Sum(
-                    F("employee_bookings__services__price")
-                    * (1 - F("employee_bookings__services__discount_percentage") / 100),
-                    output_field=DecimalField(max_digits=10, decimal_places=2),
-                ),
-            )
-            .order_by("-total_revenue")[:5]
+        # Top 5 employees by revenue of the services they performed
+        top_employees = top_revenue_objects(
+            salon, RevenueDimension.EMPLOYEE, Employee, positive_only=False
         )
 
         return Response(
@@ -1308,9 +1335,10 @@ class TopEmployeeApiView(APIView):
                     "designation": (
                         employee.designation.name if employee.designation else ""
                     ),
-                    "total_revenue": float(employee.total_revenue or Decimal("0.00")),
+                    "total_revenue": float(item["revenue"] or Decimal("0.00")),
                 }
-                for employee in top_employees
+                for employee, item in top_employees
+                if employee is not None
             ]
         )
 
@@ -1318,6 +1346,7 @@ class TopEmployeeApiView(APIView):
 class TopSellingServiceApiView(APIView):
     permission_classes = [IsOwnerOrAdminOrStaff]
 
+    @cache_salon_response
     def get(self, request, salon_uid, *args, **kwargs):
         account = request.account
         salon = get_object_or_404(Salon, uid=salon_uid, account=account)
@@ -1325,8 +1354,7 @@ class TopSellingServiceApiView(APIView):
         period = request.query_params.get("period", "all_time")
 
         # Calculate date range
-        now = timezone.now()
-        today = now.date()
+        today = salon.local_today()
 
         if period == "this_week":
             start_date = today - timedelta(days=today.weekday())
@@ -1348,30 +1376,14 @@ class TopSellingServiceApiView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        bookings = Booking.objects.filter(
-            status=BookingStatus.COMPLETED,
-            salon=salon,
-            account=account,
-        )
-
-        if start_date and end_date:
-            bookings = bookings.filter(
-                booking_date__gte=start_date, booking_date__lte=end_date
-            )
-
-        # Get top 5 services by calculating revenue
-        top_services = (
-            Service.objects.filter(service_bookings__in=bookings)
-            .annotate(
-                # Count number of bookings this service appears in
-                booking_count=Count("service_bookings", distinct=True),
-                # Calculate total revenue (price * number of bookings)
-                total_revenue=Sum(
-                    F("price") * (1 - F("discount_percentage") / 100),
-                    output_field=DecimalField(max_digits=10, decimal_places=2),
-                ),
-            )
-            .order_by("-total_revenue")[:5]
+        # Top 5 services by revenue
+        top_services = top_revenue_objects(
+            salon,
+            RevenueDimension.SERVICE,
+            Service,
+            start_date=start_date,
+            end_date=end_date,
+            positive_only=False,
         )
 
         return Response(
@@ -1379,9 +1391,10 @@ class TopSellingServiceApiView(APIView):
                 {
                     "name": service.name,
                     "description": service.description,
-                    "total_revenue": float(service.total_revenue or Decimal("0.00")),
+                    "total_revenue": float(item["revenue"] or Decimal("0.00")),
                 }
-                for service in top_services
+                for service, item in top_services
+                if service is not None
             ]
         )
 
@@ -1389,6 +1402,7 @@ class TopSellingServiceApiView(APIView):
 class TopSellingProductApiView(APIView):
     permission_classes = [IsOwnerOrAdminOrStaff]
 
+    @cache_salon_response
     def get(self, request, salon_uid, *args, **kwargs):
         account = request.account
         salon = get_object_or_404(Salon, uid=salon_uid, account=account)
@@ -1396,8 +1410,7 @@ class TopSellingProductApiView(APIView):
         period = request.query_params.get("period", "all_time")
 
         # Calculate date range
-        now = timezone.now()
-        today = now.date()
+        today = salon.local_today()
 
         if period == "this_week":
             start_date = today - timedelta(days=today.weekday())  # Monday
@@ -1419,30 +1432,14 @@ class TopSellingProductApiView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        bookings = Booking.objects.filter(
-            status=BookingStatus.COMPLETED,
-            salon=salon,
-            account=account,
-        )
-
-        if start_date and end_date:
-            bookings = bookings.filter(
-                booking_date__gte=start_date, booking_date__lte=end_date
-            )
-
-        # Get top 5 products by calculating revenue
-        top_products = (
-            Product.objects.filter(product_bookings__in=bookings)
-            .annotate(
-                # Count number of bookings this product appears in
-                booking_count=Count("product_bookings", distinct=True),
-                # Calculate total revenue (price * number of bookings)
-                total_revenue=Sum(
-                    F("price"),
-                    output_field=DecimalField(max_digits=10, decimal_places=2),
-                ),
-            )
-            .order_by("-total_revenue")[:5]
+        # Top 5 products by revenue
+        top_products = top_revenue_objects(
+            salon,
+            RevenueDimension.PRODUCT,
+            Product,
+            start_date=start_date,
+            end_date=end_date,
+            positive_only=False,
         )
 
         return Response(
@@ -1450,9 +1447,10 @@ class TopSellingProductApiView(APIView):
                 {
                     "name": product.name,
                     "description": product.description,
-                    "total_revenue": float(product.total_revenue or Decimal("0.00")),
+                    "total_revenue": float(item["revenue"] or Decimal("0.00")),
                 }
-                for product in top_products
+                for product, item in top_products
+                if product is not None
             ]
         )
 
@@ -1532,9 +1530,6 @@ class SalonWhatsappView(APIView):
     def _encrypt(self, value):
         return encrypt_data(value, self._crypto_password())
 
-    def _decrypt(self, value):
-        return decrypt_data(value, self._crypto_password())
-
     def _serialize_config(self, account, config):
         return {
             "salon": config.salon.name,
@@ -1619,7 +1614,9 @@ class SalonWhatsappView(APIView):
         try:
             subaccount = get_or_create_subaccount(salon.uid)
 
-            client = TwilioClient(subaccount["account_sid"], subaccount["auth_token"])
+            client = get_twilio_client(
+                subaccount["account_sid"], subaccount["auth_token"]
+            )
 
             with transaction.atomic():
 
@@ -1689,12 +1686,9 @@ class SalonWhatsappView(APIView):
 
         config_obj = self._get_whatsapp_config(salon)
 
-        account_sid = self._decrypt(config_obj.account_sid)
-        auth_token = self._decrypt(config_obj.auth_token)
-
         try:
             with transaction.atomic():
-                client = TwilioClient(account_sid, auth_token)
+                client = get_chatbot_twilio_client(config_obj)
                 client.messaging.v2.channels_senders(config_obj.sender_sid).delete()
                 config_obj.delete()
 
@@ -1713,7 +1707,7 @@ class SalonWhatsappView(APIView):
 class SalonWhatsappChatbotMessageLogListAPIView(ListAPIView):
     serializer_class = SalonWhatsappChatbotMessageLogSerializer
     permission_classes = [IsOwnerOrAdminOrStaff]
-    pagination_class = None
+    pagination_class = MessageLogCursorPagination
 
     def get_queryset(self):
         account = self.request.account
@@ -1722,3 +1716,62 @@ class SalonWhatsappChatbotMessageLogListAPIView(ListAPIView):
         if not salon:
             return WhatsappChatbotMessageLog.objects.none()
         return WhatsappChatbotMessageLog.objects.filter(chatbot__salon=salon)
+
+
+class SalonImportJobListView(ListCreateAPIView):
+    """
+    POST a CSV / XLSX file (multipart: `kind`, `file`) to import services,
+    products, employees or customers in bulk. The file is processed in the
+    background; poll the returned job for its progress and error report.
+    """
+
+    serializer_class = SalonImportJobSerializer
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    filterset_fields = ["kind", "status"]
+    ordering_fields = ["created_at"]
+    ordering = ["-created_at"]
+
+    def get_permissions(self):
+        if self.request.method == "POST":
+            self.permission_classes = [IsOwnerOrAdmin]
+        else:
+            self.permission_classes = [IsOwnerOrAdminOrStaff]
+
+        return super().get_permissions()
+
+    def get_queryset(self):
+        account = self.request.account
+        salon_uid = self.kwargs.get("salon_uid")
+
+        return SalonImportJob.objects.filter(account=account, salon__uid=salon_uid)
+
+    def perform_create(self, serializer):
+        account = self.request.account
+        salon_uid = self.kwargs.get("salon_uid")
+        salon = get_object_or_404(Salon, uid=salon_uid, account=account)
+        job = serializer.save(
+            salon=salon, account=account, created_by=self.request.user
+        )
+        transaction.on_commit(lambda: process_import_job.delay(job.id))
+
+    def create(self, request, *args, **kwargs):
+        response = super().create(request, *args, **kwargs)
+        response.status_code = status.HTTP_202_ACCEPTED
+        return response
+
+
+class SalonImportJobDetailView(RetrieveAPIView):
+    serializer_class = SalonImportJobDetailSerializer
+    permission_classes = [IsOwnerOrAdminOrStaff]
+
+    def get_object(self):
+        account = self.request.account
+        salon_uid = self.kwargs.get("salon_uid")
+        import_uid = self.kwargs.get("import_uid")
+
+        return get_object_or_404(
+            SalonImportJob,
+            uid=import_uid,
+            salon__uid=salon_uid,
+            account=account,
+        )
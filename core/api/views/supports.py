@@ -39,12 +39,9 @@ class AccountEnquiryListView(ListCreateAPIView):
         return super().get_permissions()
 
     def get_queryset(self):
-        user = self.request.user
         account = self.request.account
 
-        return SupportTicket.objects.filter(
-            account=account, account__members__user=user
-        )
+        return SupportTicket.objects.filter(account=account)
 
     def perform_create(self, serializer):
         account = self.request.account
@@ -64,13 +61,10 @@ class AccountEnquiryDetailView(RetrieveDestroyAPIView):
         return super().get_permissions()
 
     def get_object(self):
-        user = self.request.user
         account = self.request.account
         uid = self.kwargs.get("account_enquiry_uid")
 
-        return SupportTicket.objects.get(
-            uid=uid, account=account, account__members__user=user
-        )
+        return SupportTicket.objects.get(uid=uid, account=account)
 
 
 class CustomerEnquiryListView(ListCreateAPIView):
@@ -92,12 +86,10 @@ class CustomerEnquiryListView(ListCreateAPIView):
     ordering = ["-created_at"]
 
     def get_queryset(self):
-        user = self.request.user
         account = self.request.account
 
         return AccountSupportTicket.objects.filter(
             account=account,
-            account__members__user=user,
         )
 
     def perform_create(self, serializer):
@@ -117,10 +109,7 @@ class CustomerEnquiryDetailView(RetrieveUpdateDestroyAPIView):
         return super().get_permissions()
 
     def get_object(self):
-        user = self.request.user
         account = self.request.account
         uid = self.kwargs.get("customer_enquiry_uid")
 
-        return AccountSupportTicket.objects.get(
-            uid=uid, account=account, account__members__user=user
-        )
+        return AccountSupportTicket.objects.get(uid=uid, account=account)
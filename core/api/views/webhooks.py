@@ -1,7 +1,6 @@
 import logging
 import stripe
 from decouple import config
-from twilio.rest import Client as TwilioClient
 
 from django.conf import settings
 from django.http import JsonResponse
@@ -21,6 +20,7 @@ from apps.thirdparty.models import (
     WhatsappChatbotMessageLog,
 )
 from apps.thirdparty.choices import WhatsappChatbotMessageRole
+from apps.thirdparty.tasks import enqueue_whatsapp_message
 
 from common.choices import CategoryType
 from common.utils import get_or_create_category
@@ -60,20 +60,6 @@ def _log_message(
         logger.warning("Could not save message log: %s", exc)
 
 
-def _send_whatsapp_reply(
-    account_sid: str,
-    auth_token: str,
-    to: str,
-    from_: str,
-    body: str,
-) -> None:
-    try:
-        client = TwilioClient(account_sid, auth_token)
-        client.messages.create(body=body, from_=from_, to=to)
-    except Exception as exc:
-        logger.error("Failed to send WhatsApp reply to %s: %s", to, exc)
-
-
 @csrf_exempt
 @api_view(["POST"])
 @permission_classes([AllowAny])
@@ -124,6 +110,9 @@ class WhatsappCallbackView(APIView):
               We look up MetaCoWhatsappChatbotConfignfig by whatsapp_number → find the salon
               → find its chatbot config.
 
+    The request only validates, logs the inbound message and enqueues
+    apps.thirdparty.tasks.process_whatsapp_message, which runs the assistant
+    once per burst of messages and one conversation at a time.
     Replies go out through the salon's own Twilio subaccount credentials
     (stored encrypted in WhatsappChatbotConfig), NOT the master account.
     """
@@ -190,55 +179,29 @@ class WhatsappCallbackView(APIView):
             },
         )
 
-        # ── 5. Log inbound message ────────────────────────────────────────────
-        _log_message(
-            bot, customer, incoming_message, WhatsappChatbotMessageRole.CUSTOMER
-        )
-
-        # ── 6. Check message quota ────────────────────────────────────────────
+        # ── 5. Check message quota ────────────────────────────────────────────
         if not bot.has_remaining_messages():
+            _log_message(
+                bot, customer, incoming_message, WhatsappChatbotMessageRole.CUSTOMER
+            )
             logger.warning("Message limit reached for salon: %s", salon.name)
             # Silently drop — customer already got a reply from their last message
             return JsonResponse({"status": "ok"})
 
-        # ── 7. Run OpenAI assistant ───────────────────────────────────────────
-        try:
-            from openAI.assistant_service import run_assistant
-
-            reply = run_assistant(
-                salon=salon,
-                customer=customer,
-                user_message=incoming_message,
-            )
-        except Exception as exc:
-            logger.exception("Assistant run failed for %s: %s", customer_phone, exc)
-            reply = (
-                "Sorry, we're experiencing a technical issue. "
-                "Please try again or call us directly."
-            )
-
-        # ── 8. Atomically consume one message from the stacked balance ────────
-        # Do this BEFORE sending so a failed send doesn't leak a free message.
-        allowed = bot.consume_message()
-        if not allowed:
-            # Race condition: quota hit between the check (step 6) and now
-            logger.warning(
-                "Message quota exhausted mid-flight for salon: %s", salon.name
-            )
-            return JsonResponse({"status": "ok"})
-
-        # ── 8. Log outbound reply ─────────────────────────────────────────────
-        _log_message(bot, customer, reply, WhatsappChatbotMessageRole.BOT)
-
-        # ── 9. Send reply using salon's own Twilio subaccount ─────────────────
-        _send_whatsapp_reply(
-            account_sid=_decrypt(bot.account_sid),
-            auth_token=_decrypt(bot.auth_token),
-            to=from_number,  # back to the customer
-            from_=to_number,  # from the salon's number
-            body=reply,
+        # ── 6. Persist inbound message ────────────────────────────────────────
+        inbound = WhatsappChatbotMessageLog.objects.create(
+            chatbot=bot,
+            customer=customer,
+            message=incoming_message,
+            role=WhatsappChatbotMessageRole.CUSTOMER,
         )
 
+        # ── 7. Hand off to Celery ─────────────────────────────────────────────
+        # The assistant run (and its polling) happens on a worker, so Twilio
+        # gets its 200 straight away and no web worker is held per message.
+        # Bursts from the same customer are coalesced into a single run.
+        enqueue_whatsapp_message(inbound, from_number)
+
         return Response({"status": "ok"})
 
 
@@ -1,11 +1,24 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
+
+
+def _membership_changed(sender, instance, **kwargs):
+    from apps.authentication.memberships import invalidate_membership_cache
+
+    invalidate_membership_cache(instance)
 
 
 class AuthenticationConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.authentication"
 
-    # def ready(self):
-    #     from apps.authentication.signals import register_account_signals
+    def ready(self):
+        from apps.authentication.models import AccountMembership
+
+        # Cached memberships must follow role / membership changes
+        post_save.connect(_membership_changed, sender=AccountMembership)
+        post_delete.connect(_membership_changed, sender=AccountMembership)
+
+        # from apps.authentication.signals import register_account_signals
 
-    #     register_account_signals()
+        # register_account_signals()
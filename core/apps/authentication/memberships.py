@@ -0,0 +1,97 @@
+"""
+Cached AccountMembership lookups.
+
+Every account-scoped request checks the user's role in the account. The
+membership (or its absence) is cached in Redis per (user, account). Each
+account has a version counter that is bumped whenever one of its
+memberships is saved or deleted, so stale entries are never read again
+and simply expire.
+"""
+
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import AccountMembership
+
+MEMBERSHIP_CACHE_TIMEOUT = 60 * 15
+
+# Fields kept in the cache, enough to rebuild a read-only AccountMembership
+MEMBERSHIP_CACHE_FIELDS = (
+    "id",
+    "uid",
+    "user_id",
+    "account_id",
+    "role",
+    "status",
+    "is_owner",
+)
+
+# Cached for users without a membership, so misses are not queried again
+NO_MEMBERSHIP = "none"
+
+
+def _version_key(account_id) -> str:
+    return f"membership:account:{account_id}:version"
+
+
+def _membership_key(user_id, account_id, version) -> str:
+    return f"membership:{user_id}:{account_id}:v{version}"
+
+
+def _get_version(account_id) -> int:
+    key = _version_key(account_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, 1, None)
+        version = cache.get(key, 1)
+    return version
+
+
+def bump_membership_version(account_id):
+    """Invalidate every cached membership of the account."""
+    key = _version_key(account_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Not cached yet (or evicted), start a new version sequence
+        cache.add(key, 1, None)
+
+
+def _to_membership(values: dict) -> AccountMembership:
+    membership = AccountMembership(**values)
+    membership._state.adding = False
+    return membership
+
+
+def get_membership(user, account):
+    """
+    The user's AccountMembership in the account, or None. Served from the
+    cache when possible; the returned instance is meant for reading only.
+    """
+    if not (user and user.is_authenticated and account):
+        return None
+
+    key = _membership_key(user.pk, account.pk, _get_version(account.pk))
+    cached = cache.get(key)
+    if cached == NO_MEMBERSHIP:
+        return None
+    if cached is not None:
+        return _to_membership(cached)
+
+    values = (
+        AccountMembership.objects.filter(user=user, account=account)
+        .values(*MEMBERSHIP_CACHE_FIELDS)
+        .first()
+    )
+    cache.set(key, values or NO_MEMBERSHIP, MEMBERSHIP_CACHE_TIMEOUT)
+    return _to_membership(values) if values else None
+
+
+def invalidate_membership_cache(membership):
+    """
+    Called when a membership is saved or deleted. The version is bumped after
+    commit so a concurrent request cannot cache the old row under the new
+    version.
+    """
+    account_id = membership.account_id
+    transaction.on_commit(lambda: bump_membership_version(account_id))
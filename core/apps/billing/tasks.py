@@ -19,6 +19,7 @@ from apps.billing.choices import PaymentTransactionStatus, SubscriptionStatus
 from apps.billing.models import PaymentTransaction, Subscription
 from apps.billing.utils import charge_customer, get_or_create_stripe_customer
 
+from common.queries import record_queries
 from common.email_notifications import (
     send_trial_expiry_warning_email,
     send_upcoming_renewal_reminder_email,
@@ -30,6 +31,7 @@ logger = logging.getLogger(__name__)
 
 
 @shared_task(name="apps.billing.tasks.process_auto_renewals")
+@record_queries
 def process_auto_renewals():
     now = timezone.now()
 
@@ -14,6 +14,7 @@ from .models import (
     Chair,
     Booking,
     Customer,
+    SalonImportJob,
 )
 
 admin.site.register(Salon)
@@ -29,3 +30,4 @@ admin.site.register(Employee)
 admin.site.register(Chair)
 admin.site.register(Booking)
 admin.site.register(Customer)
+admin.site.register(SalonImportJob)
@@ -0,0 +1,129 @@
+"""
+Cached analytics and dashboard responses.
+
+Responses are cached in Redis per (salon, view, query parameters, date), or
+per account for the account-wide dashboard. Each salon and account has a
+version counter in the key, bumped after commit whenever one of its
+bookings, services, products, employees, chairs or customers changes or its
+revenue rollups are rebuilt, so stale responses are never read again and
+simply expire. The date part rolls periods such as "this week" over at
+midnight.
+"""
+
+from functools import wraps
+from urllib.parse import urlencode
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import Salon
+
+ANALYTICS_CACHE_TIMEOUT = 60 * 60 * 6
+
+SALON_SCOPE = "salon"
+ACCOUNT_SCOPE = "account"
+
+
+def _version_key(scope, scope_id) -> str:
+    return f"analytics:{scope}:{scope_id}:version"
+
+
+def _get_version(scope, scope_id) -> int:
+    key = _version_key(scope, scope_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, 1, None)
+        version = cache.get(key, 1)
+    return version
+
+
+def _bump_version(scope, scope_id):
+    key = _version_key(scope, scope_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Not cached yet (or evicted), start a new version sequence
+        cache.add(key, 1, None)
+
+
+def bump_analytics_version(salon_id=None, account_id=None):
+    """Invalidate the cached responses of the salon and / or account."""
+    if salon_id:
+        _bump_version(SALON_SCOPE, salon_id)
+    if account_id:
+        _bump_version(ACCOUNT_SCOPE, account_id)
+
+
+def invalidate_analytics_cache(salon_id=None, account_id=None):
+    """
+    Bump the versions once the current transaction commits, after the
+    revenue rollups it scheduled are rebuilt, so a concurrent request cannot
+    cache the old figures under the new version.
+    """
+    transaction.on_commit(lambda: bump_analytics_version(salon_id, account_id))
+
+
+def _cache_key(scope, scope_id, view_name, request, day) -> str:
+    version = _get_version(scope, scope_id)
+    query = urlencode(sorted(request.query_params.items()))
+    return f"analytics:{scope}:{scope_id}:v{version}:{view_name}:{day}:{query}"
+
+
+def _cached_response(key, respond):
+    data = cache.get(key)
+    if data is not None:
+        return Response(data)
+
+    response = respond()
+    if response.status_code == status.HTTP_200_OK:
+        cache.set(key, response.data, ANALYTICS_CACHE_TIMEOUT)
+    return response
+
+
+def cache_salon_response(get):
+    """
+    Serve a salon-scoped GET from the cache. The salon comes from the
+    `salon_uid` URL kwarg, within `account_uid` when the URL has one (admin
+    views) or else the request's account.
+    """
+
+    @wraps(get)
+    def wrapper(view, request, *args, **kwargs):
+        lookup = {"uid": kwargs["salon_uid"]}
+        if "account_uid" in kwargs:
+            lookup["account__uid"] = kwargs["account_uid"]
+        else:
+            lookup["account"] = request.account
+
+        salon = Salon.objects.filter(**lookup).only("id", "timezone").first()
+        if salon is None:
+            # The view answers with its own 404
+            return get(view, request, *args, **kwargs)
+
+        key = _cache_key(
+            SALON_SCOPE, salon.id, type(view).__name__, request, salon.local_today()
+        )
+        return _cached_response(key, lambda: get(view, request, *args, **kwargs))
+
+    return wrapper
+
+
+def cache_account_response(get):
+    """Serve a GET scoped to the request's account from the cache."""
+
+    @wraps(get)
+    def wrapper(view, request, *args, **kwargs):
+        key = _cache_key(
+            ACCOUNT_SCOPE,
+            request.account.id,
+            type(view).__name__,
+            request,
+            timezone.now().date(),
+        )
+        return _cached_response(key, lambda: get(view, request, *args, **kwargs))
+
+    return wrapper
@@ -1,4 +1,66 @@
+import logging
+
 from django.apps import AppConfig
+from django.db import connections
+from django.db.models.signals import pre_migrate
+
+logger = logging.getLogger(__name__)
+
+
+def prepare_database(sender, using, **kwargs):
+    """
+    Create the database objects the salon models rely on but that are not
+    part of any model:
+
+    - btree_gist, so the booking exclusion constraints can compare chair /
+      employee ids with `=` inside a GiST index.
+    - the sequence behind Booking.booking_id.
+
+    It also renumbers booking IDs that the former random generator handed
+    out twice, before the migration making booking_id unique runs into them.
+    """
+    from apps.salon.utils import BOOKING_ID_SEQUENCE, BOOKING_ID_SEQUENCE_START
+
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+        cursor.execute(
+            f"CREATE SEQUENCE IF NOT EXISTS {BOOKING_ID_SEQUENCE} "
+            f"START WITH {BOOKING_ID_SEQUENCE_START}"
+        )
+        renumber_duplicate_booking_ids(connection, cursor)
+
+
+def renumber_duplicate_booking_ids(connection, cursor):
+    """
+    Give every booking but the oldest of a shared booking_id a new ID from
+    the sequence. Finds nothing to do once the unique constraint exists.
+    """
+    from apps.salon.models import Booking
+    from apps.salon.utils import BOOKING_ID_SEQUENCE
+
+    table = Booking._meta.db_table
+    if table not in connection.introspection.table_names(cursor):
+        return
+
+    cursor.execute(
+        f"""
+        UPDATE {table} AS booking
+        SET booking_id = 'bk' || nextval(%s)
+        FROM (
+            SELECT id, row_number() OVER (
+                PARTITION BY booking_id ORDER BY id
+            ) AS position
+            FROM {table}
+        ) AS duplicate
+        WHERE booking.id = duplicate.id AND duplicate.position > 1
+        """,
+        [BOOKING_ID_SEQUENCE],
+    )
+    if cursor.rowcount:
+        logger.warning("Renumbered %s duplicate booking IDs.", cursor.rowcount)
 
 
 class SalonConfig(AppConfig):
@@ -8,4 +70,6 @@ class SalonConfig(AppConfig):
     def ready(self):
         from apps.salon.signals import register_booking_signals
 
+        pre_migrate.connect(prepare_database, sender=self)
+
         register_booking_signals()
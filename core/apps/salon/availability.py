@@ -0,0 +1,401 @@
+"""
+Booking availability engine.
+
+Loads the active bookings of one salon-day in a single query and keeps, per
+chair and per employee, a sorted list of busy [start, end) intervals.
+"Is this resource free for [t, t + duration)?" is then a binary search.
+"""
+
+import bisect
+import random
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import time, timedelta
+
+from django.db import IntegrityError, transaction
+
+from .choices import BookingStatus, ChairStatus, DaysOfWeek, ServiceTimeSlot
+from .models import Booking, Chair, Employee, OpeningHours
+
+ACTIVE_BOOKING_STATUSES = (
+    BookingStatus.PLACED,
+    BookingStatus.INPROGRESS,
+    BookingStatus.RESCHEDULED,
+)
+
+# Exclusion constraints declared on Booking.Meta
+BOOKING_OVERLAP_CONSTRAINTS = (
+    "booking_chair_no_overlap",
+    "booking_employee_no_overlap",
+)
+
+# Used when a booking has no (or a zero) duration, mirrors Booking's default
+DEFAULT_BOOKING_DURATION = timedelta(minutes=30)
+
+# Distance between two candidate start times in the free-slot grid
+SLOT_INTERVAL_MINUTES = 15
+
+# Longest date range a single free-slot grid request may cover
+MAX_SLOT_GRID_DAYS = 31
+
+# [start, end) minutes of the day covered by each service time slot
+TIME_SLOT_WINDOWS = {
+    ServiceTimeSlot.MORNING: (6 * 60, 12 * 60),
+    ServiceTimeSlot.AFTERNOON: (12 * 60, 16 * 60),
+    ServiceTimeSlot.EVENING: (16 * 60, 20 * 60),
+    ServiceTimeSlot.AFTER_EVENING: (20 * 60, 24 * 60),
+    ServiceTimeSlot.ANYTIME: (0, 24 * 60),
+}
+
+# date.weekday() -> DaysOfWeek value
+WEEKDAYS = [
+    DaysOfWeek.MONDAY,
+    DaysOfWeek.TUESDAY,
+    DaysOfWeek.WEDNESDAY,
+    DaysOfWeek.THURSDAY,
+    DaysOfWeek.FRIDAY,
+    DaysOfWeek.SATURDAY,
+    DaysOfWeek.SUNDAY,
+]
+
+
+class BookingOverlapError(Exception):
+    """
+    The database rejected a booking because its chair or employee is already
+    taken for an overlapping period. Another request won the race, so
+    retrying with a different time (or resource) is safe.
+    """
+
+
+@contextmanager
+def booking_overlap_guard():
+    """
+    Run a booking insert/update in a savepoint and turn a violation of the
+    overlap exclusion constraints into BookingOverlapError.
+
+    The Python checks above stay as a fast path. This guard is what makes
+    concurrent WhatsApp and web bookings safe without locking rows.
+    """
+    try:
+        with transaction.atomic():
+            yield
+    except IntegrityError as exc:
+        diag = getattr(exc.__cause__, "diag", None)
+        if getattr(diag, "constraint_name", None) in BOOKING_OVERLAP_CONSTRAINTS:
+            raise BookingOverlapError(diag.constraint_name) from exc
+        raise
+
+
+def to_minutes(value: time) -> int:
+    """Minutes since midnight for a booking time."""
+    return value.hour * 60 + value.minute
+
+
+def duration_minutes(duration: timedelta | None) -> int:
+    """Booking length in whole minutes, falling back to the default duration."""
+    if not duration:
+        duration = DEFAULT_BOOKING_DURATION
+    return max(int(duration.total_seconds() // 60), 1)
+
+
+class IntervalSet:
+    """
+    Sorted, non-overlapping [start, end) intervals (in minutes) for one resource.
+    Overlapping input intervals are merged on construction so lookups stay exact
+    even when legacy data already contains double bookings.
+    """
+
+    def __init__(self, intervals=()):
+        merged = []
+        for start, end in sorted(intervals):
+            if merged and start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+
+        self._starts = [start for start, _ in merged]
+        self._ends = [end for _, end in merged]
+
+    def __len__(self):
+        return len(self._starts)
+
+    def is_free(self, start: int, end: int) -> bool:
+        # Last interval starting before `end` is the only one that can overlap,
+        # because intervals are disjoint and therefore sorted by end as well.
+        idx = bisect.bisect_left(self._starts, end)
+        return idx == 0 or self._ends[idx - 1] <= start
+
+
+class SalonDayAvailability:
+    """
+    Busy intervals of every chair and employee of a salon on one day.
+
+    Pass `exclude_booking` when moving an existing booking so it does not
+    conflict with itself. `rows` lets `for_date_range` hand over bookings it
+    already loaded instead of querying again.
+    """
+
+    def __init__(self, salon, day, exclude_booking=None, rows=None):
+        self.salon = salon
+        self.day = day
+
+        if rows is None:
+            bookings = Booking.objects.filter(
+                salon=salon,
+                booking_date=day,
+                status__in=ACTIVE_BOOKING_STATUSES,
+            )
+            if exclude_booking is not None and exclude_booking.pk:
+                bookings = bookings.exclude(pk=exclude_booking.pk)
+            rows = bookings.values_list(
+                "chair_id", "employee_id", "booking_time", "booking_duration"
+            )
+
+        chair_intervals = defaultdict(list)
+        employee_intervals = defaultdict(list)
+
+        for chair_id, employee_id, booking_time, booking_duration in rows:
+            start = to_minutes(booking_time)
+            end = start + duration_minutes(booking_duration)
+
+            if chair_id:
+                chair_intervals[chair_id].append((start, end))
+            if employee_id:
+                employee_intervals[employee_id].append((start, end))
+
+        self._chairs = {
+            chair_id: IntervalSet(intervals)
+            for chair_id, intervals in chair_intervals.items()
+        }
+        self._employees = {
+            employee_id: IntervalSet(intervals)
+            for employee_id, intervals in employee_intervals.items()
+        }
+
+    @classmethod
+    def for_date_range(cls, salon, start_date, end_date):
+        """
+        Availability of every day in [start_date, end_date], loaded with a
+        single bookings query. Returns a {date: SalonDayAvailability} dict.
+        """
+        rows_by_day = defaultdict(list)
+        for booking_date, *row in Booking.objects.filter(
+            salon=salon,
+            booking_date__range=(start_date, end_date),
+            status__in=ACTIVE_BOOKING_STATUSES,
+        ).values_list(
+            "booking_date", "chair_id", "employee_id", "booking_time", "booking_duration"
+        ):
+            rows_by_day[booking_date].append(row)
+
+        days = {}
+        day = start_date
+        while day <= end_date:
+            days[day] = cls(salon, day, rows=rows_by_day.get(day, []))
+            day += timedelta(days=1)
+        return days
+
+    @staticmethod
+    def _window(start_time: time, duration: timedelta | None) -> tuple[int, int]:
+        start = to_minutes(start_time)
+        return start, start + duration_minutes(duration)
+
+    def is_chair_free(self, chair_id, start_time, duration=None) -> bool:
+        busy = self._chairs.get(chair_id)
+        return busy is None or busy.is_free(*self._window(start_time, duration))
+
+    def is_employee_free(self, employee_id, start_time, duration=None) -> bool:
+        busy = self._employees.get(employee_id)
+        return busy is None or busy.is_free(*self._window(start_time, duration))
+
+    def free_chairs(self, chairs, start_time, duration=None) -> list:
+        """Keep the chairs (model instances) that are free for the window."""
+        return [
+            chair
+            for chair in chairs
+            if self.is_chair_free(chair.id, start_time, duration)
+        ]
+
+    def free_employees(self, employees, start_time, duration=None) -> list:
+        """Keep the employees (model instances) that are free for the window."""
+        return [
+            employee
+            for employee in employees
+            if self.is_employee_free(employee.id, start_time, duration)
+        ]
+
+
+def find_booking_conflicts(
+    salon,
+    booking_date,
+    booking_time,
+    duration=None,
+    chair=None,
+    employee=None,
+    exclude_booking=None,
+) -> list[str]:
+    """
+    Return the names of the resources ("chair", "employee") that are already
+    booked for the requested window. An empty list means the slot is free.
+    """
+    if chair is None and employee is None:
+        return []
+
+    availability = SalonDayAvailability(
+        salon, booking_date, exclude_booking=exclude_booking
+    )
+
+    conflicts = []
+    if chair is not None and not availability.is_chair_free(
+        chair.id, booking_time, duration
+    ):
+        conflicts.append("chair")
+    if employee is not None and not availability.is_employee_free(
+        employee.id, booking_time, duration
+    ):
+        conflicts.append("employee")
+
+    return conflicts
+
+
+def bookable_chairs(salon):
+    """Chairs of the salon that can take bookings, in a stable order."""
+    return Chair.objects.filter(salon=salon, status=ChairStatus.AVAILABLE).order_by(
+        "id"
+    )
+
+
+def qualified_employees(salon, service_ids=None):
+    """
+    Employees of the salon assigned to ALL of the given service UIDs.
+    Chaining one filter per service guarantees AND semantics, not OR.
+    """
+    employees = Employee.objects.filter(salon=salon).select_related("designation")
+    if service_ids:
+        for service_id in service_ids:
+            employees = employees.filter(employee_services__uid=service_id)
+        employees = employees.distinct()
+    return employees
+
+
+def assign_resources(availability, booking_time, duration=None, service_ids=None):
+    """
+    Pick a chair and an employee for the window.
+
+    The first free chair is used. The employee is drawn at random from the
+    free qualified ones so no single employee is always picked first.
+    Either value is None when nothing is free.
+    """
+    salon = availability.salon
+
+    chairs = availability.free_chairs(bookable_chairs(salon), booking_time, duration)
+    employees = availability.free_employees(
+        qualified_employees(salon, service_ids), booking_time, duration
+    )
+
+    chair = chairs[0] if chairs else None
+    employee = random.choice(employees) if employees else None
+    return chair, employee
+
+
+def allowed_start_windows(services) -> list[tuple[int, int]]:
+    """
+    Minute ranges of the day in which the selected services may start.
+
+    Every service must allow the start time, so the windows of the services
+    are intersected. A service without time slots is treated as ANYTIME.
+    """
+    windows = [TIME_SLOT_WINDOWS[ServiceTimeSlot.ANYTIME]]
+
+    for service in services:
+        slots = service.available_time_slots or [ServiceTimeSlot.ANYTIME]
+        service_windows = [TIME_SLOT_WINDOWS[slot] for slot in slots]
+
+        windows = [
+            (max(start, slot_start), min(end, slot_end))
+            for start, end in windows
+            for slot_start, slot_end in service_windows
+            if max(start, slot_start) < min(end, slot_end)
+        ]
+
+    return windows
+
+
+def free_slot_grid(salon, start_date, end_date, services=(), now=None) -> list[dict]:
+    """
+    Bookable start times for every day in [start_date, end_date].
+
+    A start time is bookable when the salon is open for the whole service
+    duration, the selected services allow it, and at least one chair is free.
+    Free qualified employees are counted but not required, like
+    `make_reservation`, which books without an employee when none is free.
+
+    Opening hours, chairs, employees and bookings are each loaded with one
+    query, whatever the length of the range.
+    """
+    services = list(services)
+    duration = sum(
+        (service.service_duration for service in services), timedelta()
+    ) or DEFAULT_BOOKING_DURATION
+    length = duration_minutes(duration)
+
+    opening_hours = {
+        hours.day: hours for hours in OpeningHours.objects.filter(salon=salon)
+    }
+    chairs = list(bookable_chairs(salon))
+    employees = list(qualified_employees(salon, [service.uid for service in services]))
+    days = SalonDayAvailability.for_date_range(salon, start_date, end_date)
+    windows = allowed_start_windows(services)
+
+    # Booking dates and times are salon wall-clock values
+    now = now or salon.local_now()
+
+    grid = []
+    for day, availability in days.items():
+        hours = opening_hours.get(WEEKDAYS[day.weekday()])
+        is_closed = (
+            hours is None
+            or hours.is_closed
+            or hours.opening_time is None
+            or hours.closing_time is None
+        )
+
+        slots = []
+        if not is_closed and day >= now.date():
+            opening = to_minutes(hours.opening_time)
+            closing = to_minutes(hours.closing_time)
+            earliest = to_minutes(now.time()) + 1 if day == now.date() else 0
+
+            for start in range(opening, closing - length + 1, SLOT_INTERVAL_MINUTES):
+                if start < earliest:
+                    continue
+                if not any(low <= start < high for low, high in windows):
+                    continue
+
+                start_time = time(start // 60, start % 60)
+                free_chairs = availability.free_chairs(chairs, start_time, duration)
+                if not free_chairs:
+                    continue
+
+                slots.append(
+                    {
+                        "time": start_time.strftime("%H:%M"),
+                        "available_chairs": len(free_chairs),
+                        "available_employees": len(
+                            availability.free_employees(
+                                employees, start_time, duration
+                            )
+                        ),
+                    }
+                )
+
+        grid.append(
+            {
+                "date": day,
+                "day": WEEKDAYS[day.weekday()],
+                "is_closed": is_closed,
+                "slots": slots,
+            }
+        )
+
+    return grid
@@ -139,3 +139,27 @@ class BookingPaymentType(models.TextChoices):
     GIFT_CARD = "GIFT_CARD", _("Gift Card")
     VENMO = "VENMO", _("Venmo")
     OTHER = "OTHER", _("Other")
+
+
+class RevenueDimension(models.TextChoices):
+    TOTAL = "TOTAL", _("Total")
+    HOUR = "HOUR", _("Hour of Day")
+    EMPLOYEE = "EMPLOYEE", _("Employee")
+    SERVICE = "SERVICE", _("Service")
+    SERVICE_CATEGORY = "SERVICE_CATEGORY", _("Service Category")
+    PRODUCT = "PRODUCT", _("Product")
+    PRODUCT_CATEGORY = "PRODUCT_CATEGORY", _("Product Category")
+
+
+class ImportKind(models.TextChoices):
+    SERVICE = "SERVICE", _("Service")
+    PRODUCT = "PRODUCT", _("Product")
+    EMPLOYEE = "EMPLOYEE", _("Employee")
+    CUSTOMER = "CUSTOMER", _("Customer")
+
+
+class ImportStatus(models.TextChoices):
+    PENDING = "PENDING", _("Pending")
+    PROCESSING = "PROCESSING", _("Processing")
+    COMPLETED = "COMPLETED", _("Completed")
+    FAILED = "FAILED", _("Failed")
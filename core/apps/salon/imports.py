@@ -0,0 +1,720 @@
+"""
+Bulk imports of services, products, employees and customers.
+
+A SalonImportJob's file (CSV or XLSX, one header row) is read into rows keyed
+by normalised column names ("Sub Category" -> "sub_category") and processed
+in batches of IMPORT_BATCH_SIZE rows:
+
+1. each row's own values are parsed and checked (prices, phones, choices,
+   lengths) without touching the database;
+2. the categories, sub-categories, designations and sources the batch names
+   are resolved with one query per lookup, the missing account categories
+   (and custom "Other" sub-categories) are created in bulk, and rows already
+   in the salon are found with one query;
+3. the valid rows are inserted with one bulk_create.
+
+A rejected row goes to the job's error report and never stops the import, so
+a fixed file can simply be uploaded again: rows imported the first time are
+reported as duplicates. bulk_create does not send post_save, so the analytics
+cache is invalidated once at the end instead of per row.
+"""
+
+import csv
+import io
+import zipfile
+from datetime import timedelta
+from decimal import Decimal, InvalidOperation
+
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+from phonenumber_field.phonenumber import to_python as to_phone_number
+
+from common.choices import CategoryType
+from common.models import Category
+
+from .analytics_cache import invalidate_analytics_cache
+from .choices import (
+    CustomerType,
+    ImportKind,
+    ImportStatus,
+    ProductCategoryType,
+    SalonType,
+    ServiceCategoryType,
+    ServiceTimeSlot,
+)
+from .models import (
+    Customer,
+    Employee,
+    Product,
+    ProductCategory,
+    ProductSubCategory,
+    SalonImportJob,
+    Service,
+    ServiceCategory,
+    ServiceSubCategory,
+)
+
+IMPORT_FILE_EXTENSIONS = ("csv", "xlsx")
+IMPORT_MAX_FILE_SIZE = 10 * 1024 * 1024
+IMPORT_MAX_ROWS = 20000
+IMPORT_BATCH_SIZE = 500
+
+# A job still processing this long after it started lost its worker
+IMPORT_STALLED_AFTER = timedelta(hours=1)
+
+# Rejected rows kept in the job's report; error_count counts them all
+IMPORT_MAX_REPORTED_ERRORS = 1000
+
+# Source of imported customers without one
+DEFAULT_CUSTOMER_SOURCE = "Import"
+
+# Cells holding several time slots
+LIST_SEPARATORS = (";", "|")
+
+PRICE_QUANTUM = Decimal("0.01")
+MAX_PRICE = Decimal("99999999.99")
+
+
+class ImportFileError(Exception):
+    """The file as a whole cannot be imported (format, header, size)."""
+
+
+# ── Reading ───────────────────────────────────────────────────────────────
+
+
+def _column_name(header) -> str:
+    return "_".join(str(header or "").strip().lower().split())
+
+
+def _cell(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        # Spreadsheets store IDs and phone numbers as numbers
+        value = int(value)
+    return str(value).strip()
+
+
+def _csv_rows(content: bytes):
+    text = io.TextIOWrapper(io.BytesIO(content), encoding="utf-8-sig", newline="")
+    yield from csv.reader(text)
+
+
+def _xlsx_rows(content: bytes):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ImportFileError("XLSX imports are not available, upload a CSV file.")
+
+    workbook = load_workbook(io.BytesIO(content), read_only=True, data_only=True)
+    try:
+        yield from workbook.active.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def read_rows(file) -> tuple[list[str], list[tuple[int, dict]]]:
+    """
+    Column names and (row number in the file, {column: value}) of the
+    non-blank rows of an uploaded CSV / XLSX file.
+    """
+    extension = file.name.rsplit(".", 1)[-1].lower()
+    with file.open("rb") as handle:
+        content = handle.read()
+
+    reader = _xlsx_rows(content) if extension == "xlsx" else _csv_rows(content)
+    try:
+        header = next(reader, None)
+        if not header:
+            raise ImportFileError("The file is empty.")
+        columns = [_column_name(name) for name in header]
+
+        rows = []
+        for number, values in enumerate(reader, start=2):
+            values = [_cell(value) for value in values]
+            if not any(values):
+                continue
+            if len(rows) == IMPORT_MAX_ROWS:
+                raise ImportFileError(
+                    f"A file can hold at most {IMPORT_MAX_ROWS} rows, split it up."
+                )
+            rows.append((number, dict(zip(columns, values))))
+    except (UnicodeDecodeError, csv.Error, zipfile.BadZipFile):
+        raise ImportFileError(f"The file is not a valid {extension.upper()} file.")
+
+    return columns, rows
+
+
+# ── Row values ────────────────────────────────────────────────────────────
+
+
+class ImportRow:
+    """A data row, its parsed values and the errors found, by column."""
+
+    __slots__ = ("number", "data", "values", "errors")
+
+    def __init__(self, number, data):
+        self.number = number
+        self.data = data
+        self.values = {}
+        self.errors = {}
+
+    def reject(self, column, message):
+        self.errors.setdefault(column, message)
+
+    def report(self) -> dict:
+        return {"row": self.number, "errors": self.errors}
+
+
+def _choice_lookup(choices) -> dict:
+    """Choice values by their lowercased value and label."""
+    lookup = {}
+    for value, label in choices.choices:
+        lookup[value.lower()] = value
+        lookup[str(label).lower()] = value
+    return lookup
+
+
+def _text(row, column, max_length, required=False):
+    value = row.data.get(column, "")
+    if not value:
+        if required:
+            row.reject(column, "This field is required.")
+        return None
+    if len(value) > max_length:
+        row.reject(column, f"Ensure this value has at most {max_length} characters.")
+    return value
+
+
+def _decimal(row, column, required=False, max_value=MAX_PRICE):
+    value = row.data.get(column, "")
+    if not value:
+        if required:
+            row.reject(column, "This field is required.")
+        return None
+    try:
+        number = Decimal(value.replace(",", ""))
+        if not number.is_finite():
+            raise InvalidOperation
+        number = number.quantize(PRICE_QUANTUM)
+    except InvalidOperation:
+        row.reject(column, "A valid number is required.")
+        return None
+    if not 0 <= number <= max_value:
+        row.reject(column, f"Ensure this value is between 0 and {max_value}.")
+    return number
+
+
+def _choice(row, column, lookup, default=None):
+    value = row.data.get(column, "")
+    if not value:
+        if default is None:
+            row.reject(column, "This field is required.")
+        return default
+    choice = lookup.get(value.lower())
+    if choice is None:
+        row.reject(column, f'"{value}" is not a valid choice.')
+    return choice
+
+
+def _phone(row, column, region):
+    value = row.data.get(column, "")
+    if not value:
+        row.reject(column, "This field is required.")
+        return None
+    phone = to_phone_number(value, region=region)
+    if not phone or not phone.is_valid():
+        row.reject(column, "Enter a valid phone number.")
+        return None
+    return phone
+
+
+def _email(row, column):
+    value = row.data.get(column, "")
+    if not value:
+        return None
+    try:
+        validate_email(value)
+    except ValidationError:
+        row.reject(column, "Enter a valid email address.")
+    return value
+
+
+def _account_categories(account, category_type, names) -> dict:
+    """
+    Account categories by name, creating the missing ones. Names are
+    title-cased as by common.utils.get_or_create_category.
+    """
+    lookup = {"account": account, "category_type": category_type}
+    categories = {
+        category.name: category
+        for category in Category.objects.filter(name__in=names, **lookup)
+    }
+    missing = set(names) - categories.keys()
+    if missing:
+        Category.objects.bulk_create(
+            [Category(name=name, **lookup) for name in missing],
+            ignore_conflicts=True,
+        )
+        categories.update(
+            (category.name, category)
+            for category in Category.objects.filter(name__in=missing, **lookup)
+        )
+    return categories
+
+
+# ── Importers ─────────────────────────────────────────────────────────────
+
+
+class BaseImporter:
+    """
+    Imports the rows of one kind. Subclasses parse a row in `clean_row`,
+    resolve the lookups of a whole batch in `resolve` and build the model
+    instance in `build`. `key_column` identifies a row among the salon's
+    existing ones (see `row_key` / `existing_keys`).
+    """
+
+    model = None
+    columns = ()
+    required_columns = ()
+    key_column = None
+    duplicate_message = ""
+
+    def __init__(self, job: SalonImportJob):
+        self.job = job
+        self.salon = job.salon
+        self.account = job.account
+        # Keys of the rows imported so far, to catch duplicates in the file
+        self.seen_keys = set()
+
+    def max_length(self, field) -> int:
+        return self.model._meta.get_field(field).max_length
+
+    def check_columns(self, columns):
+        missing = [column for column in self.required_columns if column not in columns]
+        if missing:
+            raise ImportFileError(
+                f"Missing required columns: {', '.join(missing)}. "
+                f"Accepted columns: {', '.join(self.columns)}."
+            )
+
+    def clean_row(self, row: ImportRow):
+        raise NotImplementedError
+
+    def resolve(self, rows: list[ImportRow]):
+        pass
+
+    def build(self, row: ImportRow):
+        raise NotImplementedError
+
+    def row_key(self, row: ImportRow):
+        return None
+
+    def existing_keys(self, keys) -> set:
+        return set()
+
+    def _reject_duplicates(self, rows):
+        keys = {self.row_key(row) for row in rows}
+        existing = self.existing_keys(keys - self.seen_keys) if keys else set()
+        for row in rows:
+            key = self.row_key(row)
+            if key in self.seen_keys or key in existing:
+                row.reject(self.key_column, self.duplicate_message)
+            else:
+                self.seen_keys.add(key)
+
+    def _save(self, rows) -> int:
+        instances = [self.build(row) for row in rows]
+        try:
+            with transaction.atomic():
+                self.model.objects.bulk_create(instances)
+            return len(instances)
+        except IntegrityError:
+            pass
+
+        # A row saved concurrently took one of the keys, insert one by one
+        created = 0
+        for row, instance in zip(rows, instances):
+            try:
+                with transaction.atomic():
+                    instance.save()
+            except IntegrityError:
+                row.reject(self.key_column, self.duplicate_message)
+            else:
+                created += 1
+        return created
+
+    def import_batch(self, batch) -> tuple[int, list[ImportRow]]:
+        """Import `batch` of (number, data) rows; (created, rejected rows)."""
+        rows = [ImportRow(number, data) for number, data in batch]
+        for row in rows:
+            self.clean_row(row)
+
+        valid = [row for row in rows if not row.errors]
+        if valid:
+            self.resolve(valid)
+            valid = [row for row in valid if not row.errors]
+        if valid and self.key_column:
+            self._reject_duplicates(valid)
+            valid = [row for row in valid if not row.errors]
+
+        created = self._save(valid) if valid else 0
+        return created, [row for row in rows if row.errors]
+
+
+class CatalogImporter(BaseImporter):
+    """Services and products: a catalogue category and sub-category by name."""
+
+    category_model = None
+    sub_category_model = None
+    category_choices = None
+    # The only category custom sub-categories may be added to, as through
+    # the sub-category list views
+    other_category = None
+
+    columns = ("name", "price", "category", "sub_category", "description")
+    required_columns = ("name", "price", "category")
+    key_column = "name"
+
+    def __init__(self, job):
+        super().__init__(job)
+        self.category_lookup = _choice_lookup(self.category_choices)
+
+    def clean_row(self, row):
+        row.values.update(
+            name=_text(row, "name", self.max_length("name"), required=True),
+            price=_decimal(row, "price", required=True),
+            category=_choice(row, "category", self.category_lookup),
+            sub_category=_text(
+                row,
+                "sub_category",
+                self.sub_category_model._meta.get_field("name").max_length,
+            ),
+            description=_text(row, "description", self.max_length("description")),
+        )
+
+    def row_key(self, row):
+        return row.values["name"].lower()
+
+    def existing_keys(self, keys):
+        return set(
+            self.model.objects.filter(salon=self.salon)
+            .annotate(lower_name=Lower("name"))
+            .filter(lower_name__in=keys)
+            .values_list("lower_name", flat=True)
+        )
+
+    def _sub_categories(self, categories, names) -> dict:
+        return {
+            (sub_category.category_id, sub_category.lower_name): sub_category
+            for sub_category in self.sub_category_model.objects.annotate(
+                lower_name=Lower("name")
+            ).filter(category__in=categories, lower_name__in=names)
+        }
+
+    def resolve(self, rows):
+        categories = {
+            category.name: category
+            for category in self.category_model.objects.filter(
+                name__in={row.values["category"] for row in rows}
+            )
+        }
+        names = {
+            row.values["sub_category"].lower()
+            for row in rows
+            if row.values["sub_category"]
+        }
+        sub_categories = (
+            self._sub_categories(list(categories.values()), names) if names else {}
+        )
+
+        other = categories.get(self.other_category)
+        if other:
+            custom = {
+                row.values["sub_category"].lower(): row.values["sub_category"]
+                for row in rows
+                if row.values["category"] == self.other_category
+                and row.values["sub_category"]
+                and (other.id, row.values["sub_category"].lower()) not in sub_categories
+            }
+            if custom:
+                self.sub_category_model.objects.bulk_create(
+                    [
+                        self.sub_category_model(
+                            category=other, name=name, is_custom=True
+                        )
+                        for name in custom.values()
+                    ],
+                    ignore_conflicts=True,
+                )
+                sub_categories.update(self._sub_categories([other], list(custom)))
+
+        for row in rows:
+            category = categories.get(row.values["category"])
+            if category is None:
+                row.reject("category", "This category is not set up yet.")
+                continue
+            row.values["category"] = category
+
+            name = row.values["sub_category"]
+            if name:
+                sub_category = sub_categories.get((category.id, name.lower()))
+                if sub_category is None:
+                    row.reject(
+                        "sub_category",
+                        "Sub-category does not belong to the selected category.",
+                    )
+                row.values["sub_category"] = sub_category
+
+    def build(self, row):
+        return self.model(account=self.account, salon=self.salon, **row.values)
+
+
+class ServiceImporter(CatalogImporter):
+    model = Service
+    category_model = ServiceCategory
+    sub_category_model = ServiceSubCategory
+    category_choices = ServiceCategoryType
+    other_category = ServiceCategoryType.OTHER_SERVICES.value
+    duplicate_message = "A service with this name already exists in the salon."
+
+    columns = CatalogImporter.columns + (
+        "discount_percentage",
+        "service_duration",
+        "available_time_slots",
+        "gender_specific",
+    )
+
+    def __init__(self, job):
+        super().__init__(job)
+        self.time_slot_lookup = _choice_lookup(ServiceTimeSlot)
+        self.gender_lookup = _choice_lookup(SalonType)
+
+    def clean_row(self, row):
+        super().clean_row(row)
+        row.values.update(
+            discount_percentage=_decimal(
+                row, "discount_percentage", max_value=Decimal("100")
+            )
+            or Decimal("0"),
+            gender_specific=_choice(
+                row,
+                "gender_specific",
+                self.gender_lookup,
+                default=SalonType.UNISEX_SALON,
+            ),
+        )
+
+        # Duration in minutes
+        duration = row.data.get("service_duration", "")
+        if duration:
+            if duration.isdigit() and int(duration) > 0:
+                row.values["service_duration"] = timedelta(minutes=int(duration))
+            else:
+                row.reject("service_duration", "Enter the duration in minutes.")
+
+        slots = row.data.get("available_time_slots", "")
+        for separator in LIST_SEPARATORS:
+            slots = slots.replace(separator, ",")
+        available_time_slots = []
+        for slot in filter(None, (slot.strip() for slot in slots.split(","))):
+            value = self.time_slot_lookup.get(slot.lower())
+            if value is None:
+                row.reject("available_time_slots", f'"{slot}" is not a valid choice.')
+            elif value not in available_time_slots:
+                available_time_slots.append(value)
+        row.values["available_time_slots"] = available_time_slots
+
+
+class ProductImporter(CatalogImporter):
+    model = Product
+    category_model = ProductCategory
+    sub_category_model = ProductSubCategory
+    category_choices = ProductCategoryType
+    other_category = ProductCategoryType.OTHER_PRODUCTS.value
+    duplicate_message = "A product with this name already exists in the salon."
+
+
+class EmployeeImporter(BaseImporter):
+    model = Employee
+    columns = ("employee_id", "name", "phone", "designation")
+    required_columns = columns
+    key_column = "employee_id"
+    duplicate_message = "Employee ID must be unique within the salon."
+
+    def clean_row(self, row):
+        employee_id = _text(
+            row, "employee_id", self.max_length("employee_id"), required=True
+        )
+        designation = _text(
+            row,
+            "designation",
+            Category._meta.get_field("name").max_length,
+            required=True,
+        )
+        row.values.update(
+            employee_id=employee_id.upper() if employee_id else None,
+            name=_text(row, "name", self.max_length("name"), required=True),
+            phone=_phone(row, "phone", self.salon.country.code),
+            designation=designation.title() if designation else None,
+        )
+
+    def row_key(self, row):
+        return row.values["employee_id"]
+
+    def existing_keys(self, keys):
+        return set(
+            Employee.objects.filter(
+                account=self.account, salon=self.salon, employee_id__in=keys
+            ).values_list("employee_id", flat=True)
+        )
+
+    def resolve(self, rows):
+        designations = _account_categories(
+            self.account,
+            CategoryType.EMPLOYEE,
+            {row.values["designation"] for row in rows},
+        )
+        for row in rows:
+            row.values["designation"] = designations[row.values["designation"]]
+
+    def build(self, row):
+        return Employee(account=self.account, salon=self.salon, **row.values)
+
+
+class CustomerImporter(BaseImporter):
+    model = Customer
+    columns = ("first_name", "last_name", "email", "phone", "source", "type")
+    required_columns = ("first_name", "phone")
+    key_column = "phone"
+    duplicate_message = "A customer with this phone number already exists."
+
+    def __init__(self, job):
+        super().__init__(job)
+        self.type_lookup = _choice_lookup(CustomerType)
+
+    def clean_row(self, row):
+        source = _text(row, "source", Category._meta.get_field("name").max_length)
+        row.values.update(
+            first_name=_text(
+                row, "first_name", self.max_length("first_name"), required=True
+            ),
+            last_name=_text(row, "last_name", self.max_length("last_name")),
+            email=_email(row, "email"),
+            phone=_phone(row, "phone", self.salon.country.code),
+            source=(source or DEFAULT_CUSTOMER_SOURCE).title(),
+            type=_choice(row, "type", self.type_lookup, default=CustomerType.CUSTOMER),
+        )
+
+    def row_key(self, row):
+        return row.values["phone"].as_e164
+
+    def existing_keys(self, keys):
+        # Phone numbers are unique across all salons
+        return {
+            phone.as_e164
+            for phone in Customer.objects.filter(phone__in=keys).values_list(
+                "phone", flat=True
+            )
+        }
+
+    def resolve(self, rows):
+        sources = _account_categories(
+            self.account,
+            CategoryType.CUSTOMER_SOURCE,
+            {row.values["source"] for row in rows},
+        )
+        for row in rows:
+            row.values["source"] = sources[row.values["source"]]
+
+    def build(self, row):
+        return Customer(account=self.account, salon=self.salon, **row.values)
+
+
+IMPORTERS = {
+    ImportKind.SERVICE: ServiceImporter,
+    ImportKind.PRODUCT: ProductImporter,
+    ImportKind.EMPLOYEE: EmployeeImporter,
+    ImportKind.CUSTOMER: CustomerImporter,
+}
+
+
+# ── Job ───────────────────────────────────────────────────────────────────
+
+
+def _update_job(job, **fields):
+    for name, value in fields.items():
+        setattr(job, name, value)
+    SalonImportJob.objects.filter(pk=job.pk).update(**fields)
+
+
+def fail_import(job, message):
+    _update_job(
+        job,
+        status=ImportStatus.FAILED,
+        errors=[*job.errors, {"row": None, "errors": {"file": message}}],
+        completed_at=timezone.now(),
+    )
+
+
+def claim_import(job_id) -> bool:
+    """Move a pending job to processing; False if another worker got it first."""
+    return bool(
+        SalonImportJob.objects.filter(pk=job_id, status=ImportStatus.PENDING).update(
+            status=ImportStatus.PROCESSING, started_at=timezone.now()
+        )
+    )
+
+
+def is_import_stalled(job: SalonImportJob) -> bool:
+    return (
+        job.status == ImportStatus.PROCESSING
+        and job.started_at is not None
+        and job.started_at < timezone.now() - IMPORT_STALLED_AFTER
+    )
+
+
+def run_import(job: SalonImportJob):
+    """
+    Import the job's file, reporting progress on the job after each batch.
+    The job must have been claimed with claim_import.
+    """
+    importer = IMPORTERS[job.kind](job)
+
+    try:
+        columns, rows = read_rows(job.file)
+        importer.check_columns(columns)
+    except ImportFileError as error:
+        fail_import(job, str(error))
+        return
+
+    _update_job(job, total_rows=len(rows))
+
+    processed = created = error_count = 0
+    errors = []
+    for start in range(0, len(rows), IMPORT_BATCH_SIZE):
+        batch = rows[start : start + IMPORT_BATCH_SIZE]
+        batch_created, rejected = importer.import_batch(batch)
+
+        processed += len(batch)
+        created += batch_created
+        error_count += len(rejected)
+        errors += [
+            row.report() for row in rejected[: IMPORT_MAX_REPORTED_ERRORS - len(errors)]
+        ]
+        _update_job(
+            job,
+            processed_rows=processed,
+            created_count=created,
+            error_count=error_count,
+            errors=errors,
+        )
+
+    _update_job(job, status=ImportStatus.COMPLETED, completed_at=timezone.now())
+
+    if created:
+        invalidate_analytics_cache(job.salon_id, job.account_id)
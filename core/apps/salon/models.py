@@ -1,7 +1,12 @@
 from datetime import timedelta
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
 from django.contrib.gis.db import models as gis_models
+from django.contrib.postgres.constraints import ExclusionConstraint
+from django.contrib.postgres.fields import DateTimeRangeField, RangeOperators
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.db import models
+from django.db.models import F, Func, Q
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 
@@ -23,6 +28,9 @@ from .choices import (
     ChairStatus,
     CustomerType,
     BookingPaymentType,
+    RevenueDimension,
+    ImportKind,
+    ImportStatus,
     HairServiceType,
     BridalMakeupServiceType,
     AdditionalServiceType,
@@ -30,9 +38,12 @@ from .choices import (
     ProductCategoryType,
 )
 from .utils import (
+    DEFAULT_SALON_TIMEZONE,
+    get_salon_import_path,
     get_salon_media_path,
     get_salon_logo_path,
     get_salon_employee_image_path,
+    resolve_timezone_name,
     unique_booking_id_generator,
     validate_available_time_slots,
 )
@@ -80,6 +91,12 @@ class Salon(BaseModel):
     city = models.CharField(max_length=100)
     postal_code = models.CharField(max_length=20, blank=True, null=True)
     country = CountryField()
+    timezone = models.CharField(
+        max_length=64,
+        blank=True,
+        null=True,
+        help_text="IANA timezone, resolved from location on save.",
+    )
 
     # contacts
     phone_number_one = PhoneNumberField()
@@ -104,6 +121,39 @@ class Salon(BaseModel):
         Account, on_delete=models.CASCADE, related_name="account_salons"
     )
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_location = instance.__dict__.get("location")
+        return instance
+
+    def save(self, *args, **kwargs):
+        # Resolve the timezone once, not every time a date is needed
+        location_changed = self.location != getattr(self, "_loaded_location", None)
+        if self.location and (not self.timezone or location_changed):
+            self.timezone = resolve_timezone_name(self.location)
+
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "timezone"}
+
+        super().save(*args, **kwargs)
+        self._loaded_location = self.location
+
+    def get_timezone(self) -> ZoneInfo:
+        try:
+            return ZoneInfo(self.timezone or DEFAULT_SALON_TIMEZONE)
+        except (ZoneInfoNotFoundError, ValueError):
+            return ZoneInfo(DEFAULT_SALON_TIMEZONE)
+
+    def local_now(self):
+        """Current datetime in the salon's timezone."""
+        return timezone.localtime(timezone=self.get_timezone())
+
+    def local_today(self):
+        """Current date in the salon's timezone; booking dates are local."""
+        return self.local_now().date()
+
     def __str__(self):
         return f"{self.uid} - {self.name} - {self.city} - Owner: {self.account.name}"
 
@@ -360,12 +410,67 @@ class Customer(BaseModel):
         Salon, on_delete=models.CASCADE, related_name="salon_customers"
     )
 
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            # Cursor pagination of the customer / lead lists
+            models.Index(
+                fields=["account", "type", "-created_at", "-id"],
+                name="customer_account_type_keyset",
+            ),
+        ]
+
     def __str__(self):
         return f"Customer {self.uid} - {self.first_name} {self.last_name} - {self.salon.name}"
 
 
+class BookingPeriod(Func):
+    """
+    [booking_date + booking_time, + booking_duration) as a tstzrange. A
+    missing or zero duration (no services) counts as 30 minutes, like
+    apps.salon.availability's DEFAULT_BOOKING_DURATION; an empty range would
+    never overlap anything.
+
+    Booking times are salon wall-clock times. They are pinned to UTC only to
+    keep the expression IMMUTABLE, which generated columns and exclusion
+    constraints require. Overlap checks are unaffected.
+    """
+
+    output_field = DateTimeRangeField()
+    template = (
+        "tstzrange("
+        "timezone('UTC', %(date)s + %(time)s), "
+        "timezone('UTC', %(date)s + %(time)s + "
+        "COALESCE(NULLIF(%(duration)s, interval '0'), interval '30 minutes')), "
+        "'[)')"
+    )
+
+    def __init__(self, **extra):
+        super().__init__(
+            F("booking_date"), F("booking_time"), F("booking_duration"), **extra
+        )
+
+    def as_sql(self, compiler, connection, **extra_context):
+        # Plain column references, so there are no params to repeat.
+        date, time, duration = (
+            compiler.compile(expression)[0]
+            for expression in self.get_source_expressions()
+        )
+        return self.template % {"date": date, "time": time, "duration": duration}, []
+
+
+# Only these statuses hold a chair / employee, see apps.salon.availability
+ACTIVE_BOOKING_CONDITION = Q(
+    status__in=[
+        BookingStatus.PLACED,
+        BookingStatus.INPROGRESS,
+        BookingStatus.RESCHEDULED,
+    ]
+)
+
+
 class Booking(BaseModel):
-    booking_id = models.CharField(max_length=8)
+    booking_id = models.CharField(max_length=12, unique=True)
     booking_date = models.DateField()
     booking_time = models.TimeField()
     status = models.CharField(
@@ -387,6 +492,21 @@ class Booking(BaseModel):
         default=BookingPaymentType.CASH,
     )
 
+    # Price snapshot of the services / products, see apps.salon.pricing
+    line_items = models.JSONField(default=list, blank=True)
+    total_services = models.PositiveIntegerField(default=0)
+    total_services_price = models.DecimalField(
+        max_digits=12, decimal_places=2, default=0
+    )
+    # Services after their discount
+    services_discount_price = models.DecimalField(
+        max_digits=12, decimal_places=2, default=0
+    )
+    total_products = models.PositiveIntegerField(default=0)
+    total_products_price = models.DecimalField(
+        max_digits=12, decimal_places=2, default=0
+    )
+
     # Fk
     cancelled_by = models.ForeignKey(
         User,
@@ -425,16 +545,73 @@ class Booking(BaseModel):
         Product, related_name="product_bookings", blank=True
     )
 
+    # Maintained by Postgres, used by the overlap exclusion constraints
+    period = models.GeneratedField(
+        expression=BookingPeriod(),
+        output_field=DateTimeRangeField(),
+        db_persist=True,
+    )
+
     class Meta:
         ordering = ["-booking_date", "-booking_time"]
         indexes = [
             models.Index(fields=["booking_date", "booking_time"]),
-            models.Index(fields=["salon", "status"]),
+            # Cursor pagination of the booking lists, see common.pagination
+            models.Index(
+                fields=["salon", "-booking_date", "-booking_time", "-id"],
+                name="booking_salon_keyset",
+            ),
+            models.Index(
+                fields=["salon", "status", "-booking_date", "-booking_time", "-id"],
+                name="booking_salon_status_keyset",
+            ),
+            # Visit history of a customer (first visit, visit count)
+            models.Index(fields=["customer", "status", "booking_date"]),
         ]
+        constraints = [
+            ExclusionConstraint(
+                name="booking_chair_no_overlap",
+                expressions=[
+                    ("chair", RangeOperators.EQUAL),
+                    ("period", RangeOperators.OVERLAPS),
+                ],
+                condition=ACTIVE_BOOKING_CONDITION & Q(chair__isnull=False),
+            ),
+            ExclusionConstraint(
+                name="booking_employee_no_overlap",
+                expressions=[
+                    ("employee", RangeOperators.EQUAL),
+                    ("period", RangeOperators.OVERLAPS),
+                ],
+                condition=ACTIVE_BOOKING_CONDITION & Q(employee__isnull=False),
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Lets the revenue rollups refresh the day a booking moved away from
+        instance._loaded_status = instance.__dict__.get("status")
+        instance._loaded_booking_date = instance.__dict__.get("booking_date")
+        return instance
+
+    @property
+    def total_price(self):
+        return self.total_services_price + self.total_products_price
+
+    @property
+    def final_price(self):
+        return (
+            self.services_discount_price
+            + self.total_products_price
+            + (self.tips_amount or Decimal("0.00"))
+        )
 
     def save(self, *args, **kwargs):
         if not self.booking_id:
-            self.booking_id = unique_booking_id_generator(self)
+            self.booking_id = unique_booking_id_generator(
+                self, using=kwargs.get("using")
+            )
 
         if self.status == BookingStatus.COMPLETED and not self.completed_at:
             self.completed_at = timezone.now()
@@ -443,3 +620,89 @@ class Booking(BaseModel):
 
     def __str__(self):
         return f"Booking {self.uid} - {self.customer.phone} on {self.booking_date} at {self.booking_time} - Booking ID: {self.booking_id} - Status: {self.status}"
+
+
+class SalonDailyRevenue(BaseModel):
+    """
+    Completed-booking totals of one salon-day, broken down by dimension.
+    `key` is the hour of day, or the id of the employee / service / product /
+    category, and is empty for the TOTAL row.
+
+    Maintained by apps.salon.rollups and read by the analytics views, so
+    their cost grows with the number of days, not of bookings.
+    """
+
+    date = models.DateField()
+    dimension = models.CharField(max_length=20, choices=RevenueDimension.choices)
+    key = models.CharField(max_length=64, blank=True, default="")
+    booking_count = models.PositiveIntegerField(default=0)
+    gross_amount = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    discount_amount = models.DecimalField(
+        max_digits=12, decimal_places=2, default=0
+    )
+    tips_amount = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+
+    # Fk
+    salon = models.ForeignKey(
+        Salon, on_delete=models.CASCADE, related_name="salon_daily_revenues"
+    )
+
+    class Meta:
+        ordering = ["date"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["salon", "date", "dimension", "key"],
+                name="salon_daily_revenue_unique",
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["salon", "dimension", "date"],
+                name="salon_daily_revenue_lookup",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.salon_id} - {self.date} - {self.dimension}:{self.key}"
+
+
+class SalonImportJob(BaseModel):
+    """
+    A CSV / XLSX upload of services, products, employees or customers,
+    processed in the background by apps.salon.tasks.process_import_job.
+    The counters report progress while it runs; `errors` lists the rejected
+    rows as {"row": <line in the file>, "errors": {<column>: <message>}}.
+    `started_at` is set when a worker claims the job, so a job left
+    processing by a killed worker can be told apart from a long import.
+    """
+
+    kind = models.CharField(max_length=20, choices=ImportKind.choices)
+    status = models.CharField(
+        max_length=20, choices=ImportStatus.choices, default=ImportStatus.PENDING
+    )
+    file = models.FileField(upload_to=get_salon_import_path)
+    total_rows = models.PositiveIntegerField(default=0)
+    processed_rows = models.PositiveIntegerField(default=0)
+    created_count = models.PositiveIntegerField(default=0)
+    error_count = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    completed_at = models.DateTimeField(blank=True, null=True)
+
+    # Fk
+    created_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        related_name="salon_import_jobs",
+        blank=True,
+        null=True,
+    )
+    account = models.ForeignKey(
+        Account, on_delete=models.CASCADE, related_name="account_import_jobs"
+    )
+    salon = models.ForeignKey(
+        Salon, on_delete=models.CASCADE, related_name="salon_import_jobs"
+    )
+
+    def __str__(self):
+        return f"Import {self.uid} - {self.kind} - {self.status} - {self.salon_id}"
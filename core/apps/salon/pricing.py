@@ -0,0 +1,123 @@
+"""
+Booking price snapshots.
+
+A booking stores its line items (the services and products with the prices
+they had when they were added) and the totals derived from them. Both are
+refreshed whenever Booking.services / Booking.products change, so reading
+a booking's prices never touches the M2M tables and later price changes of
+a service or product leave past bookings untouched.
+"""
+
+from decimal import ROUND_HALF_UP, Decimal
+
+from .models import Booking
+
+CENT = Decimal("0.01")
+
+SERVICE_LINE = "service"
+PRODUCT_LINE = "product"
+
+
+def service_line_item(service) -> dict:
+    price = Decimal(service.price)
+    return {
+        "kind": SERVICE_LINE,
+        "id": service.id,
+        "uid": str(service.uid),
+        "name": service.name,
+        "category_id": service.category_id,
+        "price": str(price),
+        "discount_percentage": str(service.discount_percentage or Decimal("0")),
+        "final_price": str(service.final_price()),
+    }
+
+
+def product_line_item(product) -> dict:
+    price = Decimal(product.price).quantize(CENT, rounding=ROUND_HALF_UP)
+    return {
+        "kind": PRODUCT_LINE,
+        "id": product.id,
+        "uid": str(product.uid),
+        "name": product.name,
+        "category_id": product.category_id,
+        "price": str(price),
+        "discount_percentage": "0",
+        "final_price": str(price),
+    }
+
+
+def build_line_items(booking) -> list[dict]:
+    """
+    Current services and products of the booking as line items. Items that
+    were already on the booking keep their snapshotted prices.
+    """
+    previous = {(line["kind"], line["id"]): line for line in booking.line_items or []}
+
+    lines = []
+    for kind, related, build in (
+        (SERVICE_LINE, booking.services.all(), service_line_item),
+        (PRODUCT_LINE, booking.products.all(), product_line_item),
+    ):
+        # Sorted here rather than in SQL so prefetched items are used
+        for item in sorted(related, key=lambda item: item.id):
+            lines.append(previous.get((kind, item.id)) or build(item))
+    return lines
+
+
+def split_line_items(line_items) -> tuple[list[dict], list[dict]]:
+    """(service lines, product lines)"""
+    services = [line for line in line_items if line["kind"] == SERVICE_LINE]
+    products = [line for line in line_items if line["kind"] == PRODUCT_LINE]
+    return services, products
+
+
+def snapshot_totals(line_items) -> dict:
+    """Booking price columns derived from line items."""
+    services, products = split_line_items(line_items)
+
+    def total(lines, key):
+        return sum((Decimal(line[key]) for line in lines), Decimal("0.00"))
+
+    return {
+        "total_services": len(services),
+        "total_services_price": total(services, "price"),
+        "services_discount_price": total(services, "final_price"),
+        "total_products": len(products),
+        "total_products_price": total(products, "price"),
+    }
+
+
+def refresh_booking_prices(booking):
+    """Rebuild the snapshot of a saved booking and store it."""
+    line_items = build_line_items(booking)
+    values = {"line_items": line_items, **snapshot_totals(line_items)}
+
+    # update(), not save(): the snapshot is not a booking edit
+    Booking.objects.filter(pk=booking.pk).update(**values)
+    for field, value in values.items():
+        setattr(booking, field, value)
+
+
+def refresh_booking_items_prices(sender, instance, action, reverse, pk_set):
+    """m2m_changed of Booking.services / Booking.products."""
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            refresh_booking_prices(instance)
+        return
+
+    # `instance` is a service / product added to or removed from bookings
+    if action == "pre_clear":
+        # The cleared bookings are only known before the rows are deleted
+        instance._cleared_booking_ids = list(
+            sender.objects.filter(**{instance._meta.model_name: instance}).values_list(
+                "booking_id", flat=True
+            )
+        )
+        return
+    if action == "post_clear":
+        pk_set = instance.__dict__.pop("_cleared_booking_ids", None)
+    elif action not in ("post_add", "post_remove"):
+        return
+
+    for booking in Booking.objects.filter(pk__in=pk_set or []):
+        refresh_booking_prices(booking)
@@ -0,0 +1,275 @@
+"""
+Daily salon revenue rollups.
+
+SalonDailyRevenue keeps, per salon-day, the totals of the completed bookings
+broken down by dimension (see RevenueDimension). A day is always rebuilt as
+a whole from its bookings, which keeps the rollup exact whatever changed:
+a booking completed, edited, moved to another date or deleted.
+
+Line prices come from each booking's price snapshot (see apps.salon.pricing),
+so later price changes of a service or product do not rewrite past revenue.
+"""
+
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import F, Sum
+
+from .analytics_cache import invalidate_analytics_cache
+from .choices import BookingStatus, RevenueDimension
+from .models import Booking, Salon, SalonDailyRevenue
+from .pricing import SERVICE_LINE
+
+# Days rebuilt per transaction by the backfill command
+BACKFILL_CHUNK_DAYS = 31
+
+
+def _build_rows(salon_id, start_date, end_date) -> list[SalonDailyRevenue]:
+    bookings = Booking.objects.filter(
+        salon_id=salon_id,
+        status=BookingStatus.COMPLETED,
+        booking_date__range=(start_date, end_date),
+    )
+
+    # ── Fold bookings into (date, dimension, key) rows ─────────────────────
+    rows = {}
+
+    def add(day, dimension, key, gross=0, discount=0, tips=0):
+        row = rows.get((day, dimension, key))
+        if row is None:
+            row = rows[(day, dimension, key)] = SalonDailyRevenue(
+                salon_id=salon_id,
+                date=day,
+                dimension=dimension,
+                key=key,
+                gross_amount=Decimal("0"),
+                discount_amount=Decimal("0"),
+                tips_amount=Decimal("0"),
+            )
+        row.booking_count += 1
+        row.gross_amount += gross
+        row.discount_amount += discount
+        row.tips_amount += tips
+
+    for day, booking_time, employee_id, tips, line_items in bookings.values_list(
+        "booking_date", "booking_time", "employee_id", "tips_amount", "line_items"
+    ).iterator():
+        # (id, category id, gross, discount) from the booking's price snapshot
+        service_lines = []
+        product_lines = []
+        for line in line_items or []:
+            price = Decimal(line["price"])
+            if line["kind"] == SERVICE_LINE:
+                service_lines.append(
+                    (
+                        line["id"],
+                        line["category_id"],
+                        price,
+                        price - Decimal(line["final_price"]),
+                    )
+                )
+            else:
+                product_lines.append((line["id"], line["category_id"], price))
+
+        service_gross = sum((line[2] for line in service_lines), Decimal("0"))
+        service_discount = sum((line[3] for line in service_lines), Decimal("0"))
+        product_gross = sum((line[2] for line in product_lines), Decimal("0"))
+        tips = tips or Decimal("0")
+
+        booking_totals = {
+            "gross": service_gross + product_gross,
+            "discount": service_discount,
+            "tips": tips,
+        }
+        add(day, RevenueDimension.TOTAL, "", **booking_totals)
+        add(day, RevenueDimension.HOUR, str(booking_time.hour), **booking_totals)
+
+        # Employees are credited with the services they performed
+        if employee_id:
+            add(
+                day,
+                RevenueDimension.EMPLOYEE,
+                str(employee_id),
+                gross=service_gross,
+                discount=service_discount,
+                tips=tips,
+            )
+
+        service_categories = defaultdict(lambda: [Decimal("0"), Decimal("0")])
+        for service_id, category_id, gross, discount in service_lines:
+            add(day, RevenueDimension.SERVICE, str(service_id), gross, discount)
+            service_categories[category_id][0] += gross
+            service_categories[category_id][1] += discount
+        for category_id, (gross, discount) in service_categories.items():
+            add(
+                day,
+                RevenueDimension.SERVICE_CATEGORY,
+                str(category_id or ""),
+                gross,
+                discount,
+            )
+
+        product_categories = defaultdict(Decimal)
+        for product_id, category_id, gross in product_lines:
+            add(day, RevenueDimension.PRODUCT, str(product_id), gross)
+            product_categories[category_id] += gross
+        for category_id, gross in product_categories.items():
+            add(day, RevenueDimension.PRODUCT_CATEGORY, str(category_id or ""), gross)
+
+    return list(rows.values())
+
+
+@transaction.atomic
+def rebuild_salon_revenue(salon_id, start_date, end_date) -> int:
+    """
+    Recompute the rollup rows of a salon for [start_date, end_date] and
+    return how many rows were written.
+    """
+    # Serializes rebuilds of the same salon, so two of them never insert the
+    # same (salon, date, dimension, key) row.
+    account_id = (
+        Salon.objects.select_for_update()
+        .filter(pk=salon_id)
+        .values_list("account_id", flat=True)
+        .first()
+    )
+    if account_id is None:
+        return 0
+
+    SalonDailyRevenue.objects.filter(
+        salon_id=salon_id, date__range=(start_date, end_date)
+    ).delete()
+    rows = _build_rows(salon_id, start_date, end_date)
+    SalonDailyRevenue.objects.bulk_create(rows, batch_size=1000)
+    invalidate_analytics_cache(salon_id, account_id)
+    return len(rows)
+
+
+def refresh_salon_day(salon_id, day):
+    rebuild_salon_revenue(salon_id, day, day)
+
+
+def _pending_day_refreshes() -> set:
+    """(salon_id, day) pairs waiting for the commit, per connection."""
+    connection = transaction.get_connection()
+    if not hasattr(connection, "salon_day_refreshes"):
+        connection.salon_day_refreshes = set()
+    return connection.salon_day_refreshes
+
+
+def _refresh_pending_days():
+    pending = _pending_day_refreshes()
+    while pending:
+        refresh_salon_day(*pending.pop())
+
+
+def schedule_day_refresh(salon_id, day):
+    """
+    Rebuild the salon-day once the current transaction commits. A booking
+    saved with its services and products schedules the same day several
+    times; the first callback rebuilds every pending day once and the
+    others find nothing left to do. Days left over by a rolled back
+    transaction are rebuilt with the next commit, which is harmless since a
+    rebuild is exact.
+    """
+    _pending_day_refreshes().add((salon_id, day))
+    transaction.on_commit(_refresh_pending_days)
+
+
+# ── Signal handlers ────────────────────────────────────────────────────────
+
+
+def refresh_booking_revenue(booking):
+    """
+    A booking was saved or deleted: refresh the day it counts in now and,
+    if it was completed before, the day it counted in until now.
+    """
+    days = set()
+    if booking.status == BookingStatus.COMPLETED:
+        days.add(booking.booking_date)
+    if getattr(booking, "_loaded_status", None) == BookingStatus.COMPLETED:
+        days.add(booking._loaded_booking_date)
+
+    for day in days:
+        schedule_day_refresh(booking.salon_id, day)
+
+    booking._loaded_status = booking.status
+    booking._loaded_booking_date = booking.booking_date
+
+
+def refresh_booking_items_revenue(sender, instance, action, reverse, pk_set):
+    """m2m_changed of Booking.services / Booking.products."""
+    if not reverse:
+        if (
+            action in ("post_add", "post_remove", "post_clear")
+            and instance.status == BookingStatus.COMPLETED
+        ):
+            schedule_day_refresh(instance.salon_id, instance.booking_date)
+        return
+
+    # `instance` is a service / product added to or removed from bookings
+    if action in ("post_add", "post_remove"):
+        booking_ids = pk_set
+    elif action == "pre_clear":
+        booking_ids = sender.objects.filter(
+            **{instance._meta.model_name: instance}
+        ).values("booking_id")
+    else:
+        return
+
+    for salon_id, day in (
+        Booking.objects.filter(pk__in=booking_ids, status=BookingStatus.COMPLETED)
+        .values_list("salon_id", "booking_date")
+        .distinct()
+    ):
+        schedule_day_refresh(salon_id, day)
+
+
+# ── Reads ──────────────────────────────────────────────────────────────────
+
+
+def revenue_rows(salon, dimension, start_date=None, end_date=None):
+    """Rollup rows of one dimension, optionally limited to a date range."""
+    rows = SalonDailyRevenue.objects.filter(salon=salon, dimension=dimension)
+    if start_date:
+        rows = rows.filter(date__gte=start_date)
+    if end_date:
+        rows = rows.filter(date__lte=end_date)
+    return rows
+
+
+def top_revenue_keys(
+    salon, dimension, start_date=None, end_date=None, limit=5, positive_only=True
+) -> list[dict]:
+    """
+    Keys of the dimension with the highest net revenue (gross - discount):
+    [{"key", "revenue", "booking_count"}, ...].
+    """
+    totals = (
+        revenue_rows(salon, dimension, start_date, end_date)
+        .values("key")
+        .annotate(
+            revenue=Sum(F("gross_amount") - F("discount_amount")),
+            booking_count=Sum("booking_count"),
+        )
+        .order_by("-revenue", "key")
+    )
+    if positive_only:
+        totals = totals.filter(revenue__gt=0)
+    return list(totals[:limit])
+
+
+def top_revenue_objects(salon, dimension, model, **kwargs) -> list[tuple]:
+    """
+    `top_revenue_keys` with every key resolved to its `model` instance:
+    [(instance or None, totals), ...]. One extra query for the instances.
+    """
+    totals = top_revenue_keys(salon, dimension, **kwargs)
+    instances = model.objects.in_bulk(
+        [int(item["key"]) for item in totals if item["key"]]
+    )
+    return [
+        (instances.get(int(item["key"])) if item["key"] else None, item)
+        for item in totals
+    ]
@@ -1,10 +1,16 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 
 
 def register_booking_signals():
     """Call this from SalonConfig.ready()"""
-    from apps.salon.models import Booking
+    from apps.salon.analytics_cache import invalidate_analytics_cache
+    from apps.salon.models import Booking, Chair, Customer, Employee, Product, Service
+    from apps.salon.pricing import refresh_booking_items_prices
+    from apps.salon.rollups import (
+        refresh_booking_items_revenue,
+        refresh_booking_revenue,
+    )
     from common.email_notifications import (
         send_new_booking_admin_email,
         send_new_booking_customer_email,
@@ -30,3 +36,45 @@ def register_booking_signals():
             logging.getLogger(__name__).warning(
                 "Customer booking email failed for booking %s: %s", instance.uid, exc
             )
+
+    # ── Keep the price snapshot in step with services / products ────────────
+    # Connected before the rollup handlers, which read the snapshot
+    @receiver(m2m_changed, sender=Booking.services.through, weak=False)
+    @receiver(m2m_changed, sender=Booking.products.through, weak=False)
+    def on_booking_items_priced(sender, instance, action, reverse, pk_set, **kwargs):
+        refresh_booking_items_prices(sender, instance, action, reverse, pk_set)
+
+    # ── Keep the daily revenue rollups in step with completed bookings ───────
+    @receiver(post_save, sender=Booking, weak=False)
+    @receiver(post_delete, sender=Booking, weak=False)
+    def on_booking_changed(sender, instance, **kwargs):
+        refresh_booking_revenue(instance)
+
+    @receiver(m2m_changed, sender=Booking.services.through, weak=False)
+    @receiver(m2m_changed, sender=Booking.products.through, weak=False)
+    def on_booking_items_changed(sender, instance, action, reverse, pk_set, **kwargs):
+        refresh_booking_items_revenue(sender, instance, action, reverse, pk_set)
+
+    # ── Invalidate cached analytics of the salon ─────────────────────────────
+    # Connected after the rollup handlers: their rebuild runs first on commit
+    @receiver(post_save, sender=Booking, weak=False)
+    @receiver(post_delete, sender=Booking, weak=False)
+    @receiver(post_save, sender=Service, weak=False)
+    @receiver(post_delete, sender=Service, weak=False)
+    @receiver(post_save, sender=Product, weak=False)
+    @receiver(post_delete, sender=Product, weak=False)
+    @receiver(post_save, sender=Employee, weak=False)
+    @receiver(post_delete, sender=Employee, weak=False)
+    @receiver(post_save, sender=Chair, weak=False)
+    @receiver(post_delete, sender=Chair, weak=False)
+    @receiver(post_save, sender=Customer, weak=False)
+    @receiver(post_delete, sender=Customer, weak=False)
+    def on_salon_data_changed(sender, instance, **kwargs):
+        invalidate_analytics_cache(instance.salon_id, instance.account_id)
+
+    @receiver(m2m_changed, sender=Booking.services.through, weak=False)
+    @receiver(m2m_changed, sender=Booking.products.through, weak=False)
+    def on_booking_items_cached(sender, instance, action, **kwargs):
+        # Either side of the relation belongs to the salon
+        if action in ("post_add", "post_remove", "post_clear"):
+            invalidate_analytics_cache(instance.salon_id, instance.account_id)
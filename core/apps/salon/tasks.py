@@ -0,0 +1,32 @@
+"""
+apps/salon/tasks.py
+
+  - process_import_job: run a SalonImportJob uploaded through
+    SalonImportJobListView (see apps.salon.imports).
+"""
+
+import logging
+
+from celery import shared_task
+
+from apps.salon.imports import claim_import, fail_import, run_import
+from apps.salon.models import SalonImportJob
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name="apps.salon.tasks.process_import_job")
+def process_import_job(job_id: int):
+    # Claimed with a conditional update so a redelivered task can't run it twice
+    if not claim_import(job_id):
+        logger.warning("Import job %s is gone or was already processed.", job_id)
+        return
+
+    job = SalonImportJob.objects.select_related("salon", "account").get(id=job_id)
+
+    try:
+        run_import(job)
+    except Exception:
+        # Not retried: the batches imported so far are committed
+        logger.exception("Import job %s failed.", job_id)
+        fail_import(job, "The import stopped unexpectedly, please try again.")
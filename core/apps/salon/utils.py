@@ -1,7 +1,7 @@
-import random
+from functools import lru_cache
 
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import DEFAULT_DB_ALIAS, connections, models
 from django.utils.translation import gettext_lazy as _
 
 from .choices import ServiceTimeSlot
@@ -22,16 +22,65 @@ def get_salon_media_path(instance, filename):
     return f"salon_{instance.uid}/{filename}"
 
 
-def unique_booking_id_generator(instance) -> str:
-    model = instance.__class__
-    unique_number = random.randint(111111, 999999)
-    booking_id = f"bk{unique_number}"
+def get_salon_import_path(instance, filename):
+    # file will be uploaded to MEDIA_ROOT/salon_<id>/imports/<filename>
+    return f"salon_{instance.salon.uid}/imports/{filename}"
 
-    while model.objects.filter(booking_id=booking_id).exists():
-        unique_number = random.randint(111111, 999999)
-        booking_id = f"bk{unique_number}"
 
-    return booking_id
+# Used when a salon's timezone cannot be resolved from its location
+DEFAULT_SALON_TIMEZONE = "Asia/Dubai"
+
+
+@lru_cache(maxsize=None)
+def get_timezone_finder():
+    """
+    Process-wide TimezoneFinder. Its dataset takes a lot of memory, so it is
+    only loaded the first time a salon timezone has to be resolved.
+    """
+    from timezonefinder import TimezoneFinder
+
+    return TimezoneFinder()
+
+
+def resolve_timezone_name(location) -> str:
+    """IANA timezone name for a salon location (PointField value)."""
+    try:
+        timezone_name = get_timezone_finder().timezone_at(
+            lat=location.y, lng=location.x
+        )
+    except Exception:
+        timezone_name = None
+
+    return timezone_name or DEFAULT_SALON_TIMEZONE
+
+
+# Postgres sequence behind booking IDs, created by SalonConfig's pre_migrate hook.
+# It starts above the legacy random six-digit IDs (bk111111..bk999999), so new
+# IDs can never collide with them.
+BOOKING_ID_SEQUENCE = "salon_booking_id_seq"
+BOOKING_ID_SEQUENCE_START = 1000000
+
+
+def unique_booking_id_generator(instance, using=None) -> str:
+    # One round-trip whatever the table size; nextval() never hands out the
+    # same value twice, even to concurrent transactions. The sequence is read
+    # on the database the booking is saved to.
+    using = using or instance._state.db or DEFAULT_DB_ALIAS
+    with connections[using].cursor() as cursor:
+        cursor.execute("SELECT nextval(%s)", [BOOKING_ID_SEQUENCE])
+        unique_number = cursor.fetchone()[0]
+
+    return f"bk{unique_number}"
+
+
+def unique_booking_ids(count, using=DEFAULT_DB_ALIAS) -> list[str]:
+    """`count` booking IDs in one round-trip, for bulk-created bookings."""
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            "SELECT nextval(%s) FROM generate_series(1, %s)",
+            [BOOKING_ID_SEQUENCE, count],
+        )
+        return [f"bk{unique_number}" for (unique_number,) in cursor.fetchall()]
 
 
 def validate_available_time_slots(value):
@@ -1,6 +1,20 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
+
+
+def _ticket_changed(sender, instance, **kwargs):
+    from apps.salon.analytics_cache import invalidate_analytics_cache
+
+    invalidate_analytics_cache(account_id=instance.account_id)
 
 
 class SupportConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.support"
+
+    def ready(self):
+        from apps.support.models import AccountSupportTicket
+
+        # The account dashboard counts client requests
+        post_save.connect(_ticket_changed, sender=AccountSupportTicket)
+        post_delete.connect(_ticket_changed, sender=AccountSupportTicket)
@@ -1,6 +1,26 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
+
+
+def _chatbot_config_saved(sender, instance, **kwargs):
+    from apps.thirdparty.twilio_clients import invalidate_chatbot_client
+
+    invalidate_chatbot_client(instance)
+
+
+def _chatbot_config_deleted(sender, instance, **kwargs):
+    from apps.thirdparty.twilio_clients import invalidate_chatbot_client
+
+    invalidate_chatbot_client(instance, drop_client=True)
 
 
 class ThirdpartyConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.thirdparty"
+
+    def ready(self):
+        from apps.thirdparty.models import WhatsappChatbotConfig
+
+        # Cached Twilio credentials must follow the chatbot config
+        post_save.connect(_chatbot_config_saved, sender=WhatsappChatbotConfig)
+        post_delete.connect(_chatbot_config_deleted, sender=WhatsappChatbotConfig)
@@ -20,6 +20,8 @@ class WhatsappChatbotConfig(BaseModel):
     sender_sid = models.CharField(max_length=255)
     status = models.CharField(max_length=255)
     assistant_id = models.JSONField(default=dict, blank=True, null=True)
+    # sha256 of the instructions + tools last pushed to the OpenAI assistant
+    assistant_config_hash = models.CharField(max_length=64, blank=True, null=True)
     chatbot_name = models.CharField(max_length=255, blank=True, null=True)
     is_active = models.BooleanField(default=True)
 
@@ -115,6 +117,13 @@ class WhatsappChatbotMessageLog(BaseModel):
 
     class Meta:
         ordering = ["sent_at"]
+        indexes = [
+            # Cursor pagination of a chatbot's message history
+            models.Index(
+                fields=["chatbot", "-sent_at", "-id"],
+                name="chatbot_message_keyset",
+            ),
+        ]
 
     def __str__(self):
         return f"[{self.role}] {self.customer} — {self.sent_at:%Y-%m-%d %H:%M}"
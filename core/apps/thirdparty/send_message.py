@@ -5,13 +5,10 @@ from twilio.rest import Client
 logger = logging.getLogger(__name__)
 
 
-def send_whatsapp_reply(
-    twilio_sid: str, twilio_token: str, to: str, from_: str, body: str
-) -> None:
-    """Send a WhatsApp message via Twilio."""
+def send_whatsapp_reply(client: Client, to: str, from_: str, body: str) -> None:
+    """Send a WhatsApp message via Twilio (see apps.thirdparty.twilio_clients)."""
     try:
-        twilio = Client(twilio_sid, twilio_token)
-        twilio.messages.create(
+        client.messages.create(
             body=body,
             from_=from_,
             to=to,
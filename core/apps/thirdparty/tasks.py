@@ -0,0 +1,230 @@
+"""
+apps/thirdparty/tasks.py
+
+WhatsApp inbound pipeline:
+  - enqueue_whatsapp_message: called by WhatsappCallbackView once the
+    inbound message is logged. Schedules a debounced task for it.
+  - process_whatsapp_message: run the salon assistant once for every
+    unanswered message of the conversation and send a single reply.
+
+Conversations (one per customer, i.e. one OpenAI thread) are serialized
+with a Redis lock so two runs never race on the same thread. Messages
+that arrive within DEBOUNCE_SECONDS of each other are coalesced into one
+assistant run.
+"""
+
+import logging
+
+from celery import shared_task
+from celery.exceptions import MaxRetriesExceededError
+from django.core.cache import cache
+
+from apps.thirdparty.choices import WhatsappChatbotMessageRole
+from apps.thirdparty.models import WhatsappChatbotConfig, WhatsappChatbotMessageLog
+from apps.thirdparty.send_message import send_whatsapp_reply
+from apps.thirdparty.twilio_clients import get_chatbot_twilio_client
+from common.queries import record_queries
+
+logger = logging.getLogger(__name__)
+
+FALLBACK_REPLY = (
+    "Sorry, we're experiencing a technical issue. "
+    "Please try again or call us directly."
+)
+
+# Quiet period after the latest message before the assistant runs
+DEBOUNCE_SECONDS = 3
+
+# Longer than the assistant's MAX_RUN_SECONDS plus the reply send
+CONVERSATION_LOCK_TIMEOUT = 120
+
+# How many times a task waits for a running conversation before giving up
+MAX_LOCK_RETRIES = 40
+
+# Keeps the high-water mark around well beyond any realistic burst
+STATE_TIMEOUT = 60 * 60 * 24
+
+
+def _latest_key(bot_id: int, customer_id: int) -> str:
+    return f"whatsapp:conversation:{bot_id}:{customer_id}:latest"
+
+
+def _processed_key(bot_id: int, customer_id: int) -> str:
+    return f"whatsapp:conversation:{bot_id}:{customer_id}:processed"
+
+
+def _lock_key(bot_id: int, customer_id: int) -> str:
+    return f"whatsapp:conversation:{bot_id}:{customer_id}:lock"
+
+
+# Deletes the lock only if it still holds the caller's token
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+def _release_lock(lock_key: str, token: int):
+    """
+    Release a conversation lock taken with `token`. A run that outlived
+    CONVERSATION_LOCK_TIMEOUT may find the lock taken by another task, which
+    must keep it.
+    """
+    backend = getattr(cache, "_cache", None)
+    if hasattr(backend, "get_client"):
+        # Compare and delete in one step on Redis
+        backend.get_client(lock_key, write=True).eval(
+            RELEASE_LOCK_SCRIPT, 1, cache.make_and_validate_key(lock_key), token
+        )
+    elif cache.get(lock_key) == token:
+        cache.delete(lock_key)
+
+
+def enqueue_whatsapp_message(inbound: WhatsappChatbotMessageLog, reply_to: str):
+    """
+    Remember `inbound` as the newest message of its conversation and schedule
+    its task after the debounce window. Older tasks of the same burst see a
+    newer message when they wake up and leave the work to it.
+    """
+    cache.set(
+        _latest_key(inbound.chatbot_id, inbound.customer_id),
+        inbound.id,
+        STATE_TIMEOUT,
+    )
+    process_whatsapp_message.apply_async(
+        args=[inbound.id, reply_to], countdown=DEBOUNCE_SECONDS
+    )
+
+
+def _pending_messages(bot, customer, message_log_id: int) -> list:
+    """
+    Inbound messages of the conversation not answered yet, oldest first.
+    Without a high-water mark (expired / evicted) everything after the last
+    bot reply up to this task's message is pending.
+    """
+    messages = WhatsappChatbotMessageLog.objects.filter(
+        chatbot=bot,
+        customer=customer,
+        role=WhatsappChatbotMessageRole.CUSTOMER,
+    ).order_by("id")
+
+    processed = cache.get(_processed_key(bot.id, customer.id))
+    if processed is None:
+        last_reply = (
+            WhatsappChatbotMessageLog.objects.filter(
+                chatbot=bot,
+                customer=customer,
+                role=WhatsappChatbotMessageRole.BOT,
+            )
+            .order_by("-id")
+            .values_list("id", flat=True)
+            .first()
+        )
+        messages = messages.filter(id__lte=message_log_id)
+        processed = last_reply or 0
+
+    return list(messages.filter(id__gt=processed))
+
+
+@shared_task(
+    bind=True,
+    name="apps.thirdparty.tasks.process_whatsapp_message",
+    max_retries=MAX_LOCK_RETRIES,
+)
+@record_queries
+def process_whatsapp_message(self, message_log_id: int, reply_to: str):
+    """
+    `message_log_id` is the inbound WhatsappChatbotMessageLog, `reply_to`
+    the customer's number as Twilio sent it (whatsapp:+...).
+    """
+    try:
+        inbound = WhatsappChatbotMessageLog.objects.only(
+            "id", "chatbot_id", "customer_id"
+        ).get(id=message_log_id)
+    except WhatsappChatbotMessageLog.DoesNotExist:
+        logger.warning("Inbound WhatsApp message %s no longer exists.", message_log_id)
+        return
+
+    bot_id, customer_id = inbound.chatbot_id, inbound.customer_id
+
+    # ── Debounce: a newer message of the burst will answer for this one ──────
+    latest = cache.get(_latest_key(bot_id, customer_id))
+    if latest is not None and latest > message_log_id:
+        return
+
+    # ── Serialize: one run per conversation at a time ─────────────────────────
+    lock_key = _lock_key(bot_id, customer_id)
+    if not cache.add(lock_key, message_log_id, CONVERSATION_LOCK_TIMEOUT):
+        try:
+            raise self.retry(countdown=DEBOUNCE_SECONDS)
+        except MaxRetriesExceededError:
+            # The processed mark was not advanced, so the next run of the
+            # conversation still answers this message
+            logger.error(
+                "Conversation %s/%s stayed locked, message %s left pending.",
+                bot_id,
+                customer_id,
+                message_log_id,
+            )
+            return
+
+    try:
+        _answer_conversation(bot_id, inbound, reply_to)
+    finally:
+        _release_lock(lock_key, message_log_id)
+
+
+def _answer_conversation(bot_id: int, inbound, reply_to: str):
+    bot = WhatsappChatbotConfig.objects.select_related("salon", "account").get(
+        id=bot_id
+    )
+    salon = bot.salon
+    customer = inbound.customer
+
+    pending = _pending_messages(bot, customer, inbound.id)
+    if not pending:
+        return
+
+    if not bot.is_active:
+        logger.warning("Chatbot inactive for salon: %s", salon.name)
+        return
+
+    # ── Run OpenAI assistant once for the whole burst ─────────────────────────
+    try:
+        from openAI.assistant_service import run_assistant
+
+        reply = run_assistant(
+            salon=salon,
+            customer=customer,
+            user_message=[message.message for message in pending],
+        )
+    except Exception as exc:
+        logger.exception("Assistant run failed for %s: %s", customer.phone, exc)
+        reply = FALLBACK_REPLY
+
+    # The burst is handled whatever happens next, never answer it twice
+    cache.set(_processed_key(bot.id, customer.id), pending[-1].id, STATE_TIMEOUT)
+
+    # ── Atomically consume one message from the stacked balance ──────────────
+    # Do this BEFORE sending so a failed send doesn't leak a free message.
+    if not bot.consume_message():
+        logger.warning("Message quota exhausted mid-flight for salon: %s", salon.name)
+        return
+
+    # ── Log outbound reply ────────────────────────────────────────────────────
+    WhatsappChatbotMessageLog.objects.create(
+        chatbot=bot,
+        customer=customer,
+        message=reply,
+        role=WhatsappChatbotMessageRole.BOT,
+    )
+
+    # ── Send reply using salon's own Twilio subaccount ────────────────────────
+    send_whatsapp_reply(
+        client=get_chatbot_twilio_client(bot),
+        to=reply_to,
+        from_=bot.whatsapp_number,
+        body=reply,
+    )
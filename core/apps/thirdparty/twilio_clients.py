@@ -0,0 +1,86 @@
+"""
+Process-wide registry of Twilio REST clients.
+
+Building a `twilio.rest.Client` per operation means a new HTTP session and
+a new TLS handshake every time. Clients here are created once per Twilio
+(sub)account SID and reuse a pooled keep-alive session.
+
+Chatbot configs are mapped to their decrypted credentials once; the entry
+is dropped when the config is saved or deleted (signals, this process) or
+when its `updated_at` no longer matches (other processes).
+"""
+
+import hashlib
+import threading
+
+from django.conf import settings
+from twilio.http.http_client import TwilioHttpClient
+from twilio.rest import Client
+
+from common.crypto import decrypt_data
+
+# Seconds before an HTTP call to Twilio gives up
+TWILIO_HTTP_TIMEOUT = 15
+
+_lock = threading.Lock()
+
+# account_sid -> (auth token fingerprint, Client)
+_clients = {}
+
+# WhatsappChatbotConfig pk -> (updated_at, account_sid, auth_token)
+_chatbot_credentials = {}
+
+
+def _fingerprint(auth_token: str) -> str:
+    return hashlib.sha256(auth_token.encode()).hexdigest()
+
+
+def get_twilio_client(account_sid: str, auth_token: str) -> Client:
+    """
+    Shared client for the account. A new one is built only when the
+    account's auth token changed.
+    """
+    fingerprint = _fingerprint(auth_token)
+
+    with _lock:
+        entry = _clients.get(account_sid)
+        if entry and entry[0] == fingerprint:
+            return entry[1]
+
+        client = Client(
+            account_sid,
+            auth_token,
+            http_client=TwilioHttpClient(
+                pool_connections=True, timeout=TWILIO_HTTP_TIMEOUT
+            ),
+        )
+        _clients[account_sid] = (fingerprint, client)
+        return client
+
+
+def get_chatbot_twilio_client(chatbot_config) -> Client:
+    """Client for the salon subaccount stored (encrypted) on the chatbot config."""
+    with _lock:
+        entry = _chatbot_credentials.get(chatbot_config.pk)
+
+    if entry is None or entry[0] != chatbot_config.updated_at:
+        account_sid = decrypt_data(chatbot_config.account_sid, settings.CRYPTO_PASSWORD)
+        auth_token = decrypt_data(chatbot_config.auth_token, settings.CRYPTO_PASSWORD)
+        entry = (chatbot_config.updated_at, account_sid, auth_token)
+
+        with _lock:
+            _chatbot_credentials[chatbot_config.pk] = entry
+
+    return get_twilio_client(entry[1], entry[2])
+
+
+def invalidate_chatbot_client(chatbot_config, drop_client: bool = False) -> None:
+    """
+    Forget the credentials cached for a chatbot config. The pooled client of
+    the subaccount is kept unless `drop_client` is set (config deleted); it
+    is replaced anyway if the subaccount's auth token changes.
+    """
+    with _lock:
+        entry = _chatbot_credentials.pop(chatbot_config.pk, None)
+        if drop_client and entry is not None:
+            _clients.pop(entry[1], None)
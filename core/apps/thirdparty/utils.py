@@ -1,8 +1,9 @@
 import logging
 from django.conf import settings
-from twilio.rest import Client
 from twilio.base.exceptions import TwilioRestException
 
+from .twilio_clients import get_twilio_client
+
 logger = logging.getLogger(__name__)
 
 INBOUND_WEBHOOK_URL = "https://api.afrobeutic.com/api/whatsapp-callback/"
@@ -12,7 +13,7 @@ def get_whatsapp_senders(account_sid: str, auth_token: str) -> list:
     """
     Returns a list of WhatsApp-enabled phone numbers for the given Twilio account.
     """
-    client = Client(account_sid, auth_token)
+    client = get_twilio_client(account_sid, auth_token)
     try:
         numbers = client.incoming_phone_numbers.list()
     except TwilioRestException as e:
@@ -26,7 +27,7 @@ def get_or_create_subaccount(friendly_name: str) -> dict:
     """
     Returns a subaccount with <3 WhatsApp senders, or creates a new one.
     """
-    client = Client(settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN)
+    client = get_twilio_client(settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN)
     try:
         subaccounts = client.api.v2010.accounts.list()
     except TwilioRestException as e:
@@ -4,6 +4,25 @@ from django.conf import settings
 
 from rest_framework.authentication import BaseAuthentication
 from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+# Attribute CurrentAccountMiddleware stores its JWT result under
+JWT_AUTH_ATTR = "jwt_auth"
+
+
+class RequestJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that reuses the result CurrentAccountMiddleware already
+    computed for this request, so the token is decoded and the user loaded
+    only once. Falls back to a normal pass when the middleware did not run
+    or could not authenticate (DRF then raises the proper 401).
+    """
+
+    def authenticate(self, request):
+        django_request = getattr(request, "_request", request)
+        if hasattr(django_request, JWT_AUTH_ATTR):
+            return getattr(django_request, JWT_AUTH_ATTR)
+        return super().authenticate(request)
 
 
 class CustomerJWTAuthentication(BaseAuthentication):
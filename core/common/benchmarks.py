@@ -0,0 +1,258 @@
+"""
+API benchmark cases.
+
+The endpoints whose latency and query count we track, run through the Django
+test client against a salon made by the generate_synthetic_tenants command.
+Used by the benchmark_api command and by the query budget tests.
+"""
+
+import math
+import time
+from contextlib import contextmanager
+from typing import NamedTuple
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from common.queries import QueryRecorder
+
+# Max queries per request, by URL name. A budget does not depend on the page
+# size or the amount of history: going over it usually means a new N+1.
+QUERY_BUDGETS = {
+    "salon.booking-list": 12,
+    "salon.booking-calendar": 12,
+    "salon.lookbook-list": 10,
+    "salon.whatsapp-chatbot-message-log-list": 8,
+    "salon.dashboard": 8,
+    "customer-analysis": 8,
+    "top-employees": 8,
+    "bookings-peak-hours": 6,
+    "bookings-peak-days": 6,
+    "bookings-by-month": 6,
+    "product-revenue": 8,
+    "service-revenue": 8,
+    "top-product-category": 8,
+    "top-service-category": 8,
+    "top-selling-products": 8,
+    "top-selling-services": 8,
+    "public.salon-list": 8,
+    # Includes the assistant task, run inline
+    "whatsapp-chatbot": 20,
+}
+
+ANALYTICS_URL_NAMES = [
+    "top-selling-products",
+    "top-selling-services",
+    "top-employees",
+    "customer-analysis",
+    "bookings-peak-hours",
+    "bookings-peak-days",
+    "bookings-by-month",
+    "product-revenue",
+    "service-revenue",
+    "top-product-category",
+    "top-service-category",
+]
+# The one period every analytics view accepts, and the heaviest
+ANALYTICS_PERIOD = "all_time"
+
+# Callback and fallback share the "whatsapp-chatbot" URL name
+WHATSAPP_CALLBACK_PATH = "/api/webhooks/whatsapp-callback"
+
+STUB_ASSISTANT_REPLY = "Thanks, we will get back to you shortly."
+
+
+class BenchmarkCase(NamedTuple):
+    url_name: str
+    method: str
+    path: str
+    data: dict = {}
+    authenticated: bool = True
+
+
+def benchmark_cases(salon) -> list[BenchmarkCase]:
+    salon_kwargs = {"salon_uid": salon.uid}
+    today = salon.local_today()
+    chatbot = salon.salon_chatbot_config
+    customer = salon.salon_customers.order_by("id").first()
+
+    cases = [
+        BenchmarkCase(
+            "salon.booking-list",
+            "get",
+            reverse("salon.booking-list", kwargs=salon_kwargs),
+        ),
+        BenchmarkCase(
+            "salon.booking-calendar",
+            "get",
+            reverse("salon.booking-calendar", kwargs=salon_kwargs),
+            {"date": today.isoformat()},
+        ),
+        BenchmarkCase(
+            "salon.lookbook-list",
+            "get",
+            reverse("salon.lookbook-list", kwargs=salon_kwargs),
+        ),
+        BenchmarkCase(
+            "salon.whatsapp-chatbot-message-log-list",
+            "get",
+            reverse("salon.whatsapp-chatbot-message-log-list", kwargs=salon_kwargs),
+        ),
+        BenchmarkCase(
+            "salon.dashboard",
+            "get",
+            reverse("salon.dashboard", kwargs=salon_kwargs),
+        ),
+    ]
+    cases += [
+        BenchmarkCase(
+            url_name,
+            "get",
+            reverse(url_name, kwargs=salon_kwargs),
+            (
+                {"month": today.month, "year": today.year}
+                if url_name == "bookings-by-month"
+                else {"period": ANALYTICS_PERIOD}
+            ),
+        )
+        for url_name in ANALYTICS_URL_NAMES
+    ]
+    cases += [
+        BenchmarkCase(
+            "public.salon-list",
+            "get",
+            reverse("public.salon-list"),
+            {
+                "latitude": salon.location.y,
+                "longitude": salon.location.x,
+                "radius_kilometer": 25,
+            },
+            authenticated=False,
+        ),
+        BenchmarkCase(
+            "whatsapp-chatbot",
+            "post",
+            WHATSAPP_CALLBACK_PATH,
+            {
+                "ProfileName": f"{customer.first_name} {customer.last_name}",
+                "From": f"whatsapp:{customer.phone}",
+                "To": chatbot.whatsapp_number,
+                "Body": "Do you have a slot tomorrow afternoon?",
+            },
+            authenticated=False,
+        ),
+    ]
+    return cases
+
+
+# Keeps benchmark runs off the shared Redis, whose entries outlive the test
+# database and could be read back by a later run
+BENCHMARK_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "benchmark",
+    }
+}
+
+
+def _uncached_response(key, respond):
+    return respond()
+
+
+@contextmanager
+def benchmark_environment(salon):
+    """
+    OpenAI, Twilio and the GeoIP lookup replaced by stubs, and Celery tasks
+    run inline, so the WhatsApp callback is measured end to end without
+    leaving the process.
+
+    The cache is a fresh in-process one, and analytics / dashboard responses
+    are never served from it, so every request measures their queries rather
+    than a cache hit.
+    """
+    from core import celery_app
+
+    always_eager = celery_app.conf.task_always_eager
+    celery_app.conf.task_always_eager = True
+    try:
+        with (
+            override_settings(
+                ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"],
+                CACHES=BENCHMARK_CACHES,
+            ),
+            mock.patch(
+                "apps.salon.analytics_cache._cached_response", _uncached_response
+            ),
+            mock.patch(
+                "openAI.assistant_service.run_assistant",
+                return_value=STUB_ASSISTANT_REPLY,
+            ),
+            mock.patch("apps.thirdparty.tasks.get_chatbot_twilio_client"),
+            mock.patch("apps.thirdparty.tasks.send_whatsapp_reply"),
+            mock.patch(
+                "api.views.public.get_country_from_ip",
+                return_value=salon.country.code,
+            ),
+        ):
+            cache.clear()
+            yield
+    finally:
+        celery_app.conf.task_always_eager = always_eager
+
+
+def client_for(user, account) -> Client:
+    """Test client authenticated as `user` within `account`."""
+    access_token = RefreshToken.for_user(user).access_token
+    return Client(
+        headers={
+            "Authorization": f"Bearer {access_token}",
+            "X-Account-Id": str(account.uid),
+        }
+    )
+
+
+def send(client, case: BenchmarkCase):
+    return getattr(client, case.method)(case.path, case.data)
+
+
+def percentile(values, pct) -> float:
+    """Nearest-rank percentile of sorted `values`."""
+    return values[max(math.ceil(pct / 100 * len(values)) - 1, 0)]
+
+
+def run_case(client, case: BenchmarkCase, iterations=20, warmup=2) -> dict:
+    """
+    Latency percentiles (ms) of `iterations` requests, and the most queries
+    and repeated queries any one of them ran.
+    """
+    for _ in range(warmup):
+        send(client, case)
+
+    timings = []
+    query_counts = []
+    duplicate_counts = []
+    for _ in range(iterations):
+        with QueryRecorder() as recorder:
+            start = time.perf_counter()
+            response = send(client, case)
+            timings.append((time.perf_counter() - start) * 1000)
+        query_counts.append(recorder.count)
+        duplicate_counts.append(recorder.summary()["duplicate_query_count"])
+
+    timings.sort()
+    return {
+        "endpoint": case.url_name,
+        "status": response.status_code,
+        "p50_ms": round(percentile(timings, 50), 2),
+        "p95_ms": round(percentile(timings, 95), 2),
+        "p99_ms": round(percentile(timings, 99), 2),
+        "max_ms": round(timings[-1], 2),
+        "queries": max(query_counts),
+        "query_budget": QUERY_BUDGETS.get(case.url_name),
+        "duplicate_queries": max(duplicate_counts),
+    }
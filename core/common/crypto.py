@@ -1,12 +1,56 @@
 import base64
 import os
 import hashlib
+import threading
+from collections import OrderedDict
 
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 
 
+# Number of PBKDF2-derived ciphers kept per process. One per encrypted value
+# (each has its own salt), so this covers a few hundred chatbot configs.
+DERIVED_KEY_CACHE_SIZE = 512
+
+_derived_ciphers = OrderedDict()
+_derived_ciphers_lock = threading.Lock()
+
+
+def _derive_cipher(password: str, salt: bytes) -> Fernet:
+    """
+    Derive the Fernet cipher for (password, salt) with PBKDF2, 100k rounds.
+
+    Derivation costs tens of milliseconds of CPU, so ciphers are kept in a
+    bounded process-local LRU. It is keyed by a hash of (password, salt), so
+    the password itself is never used as a dict key.
+    """
+    cache_key = hashlib.sha256(password.encode() + b"\0" + salt).digest()
+
+    with _derived_ciphers_lock:
+        cipher = _derived_ciphers.get(cache_key)
+        if cipher is not None:
+            _derived_ciphers.move_to_end(cache_key)
+            return cipher
+
+    kdf = PBKDF2HMAC(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=salt,
+        iterations=100000,
+    )
+    key = base64.urlsafe_b64encode(kdf.derive(password.encode()))
+    cipher = Fernet(key)
+
+    with _derived_ciphers_lock:
+        _derived_ciphers[cache_key] = cipher
+        _derived_ciphers.move_to_end(cache_key)
+        while len(_derived_ciphers) > DERIVED_KEY_CACHE_SIZE:
+            _derived_ciphers.popitem(last=False)
+
+    return cipher
+
+
 class APIKeyCrypto:
     def __init__(self, password: str, salt: bytes = None):
         """
@@ -22,15 +66,8 @@ class APIKeyCrypto:
         else:
             self.salt = salt
 
-        # Derive key from password using PBKDF2
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=self.salt,
-            iterations=100000,
-        )
-        key = base64.urlsafe_b64encode(kdf.derive(password.encode()))
-        self.cipher = Fernet(key)
+        # Derive key from password using PBKDF2 (cached per password + salt)
+        self.cipher = _derive_cipher(password, self.salt)
 
     def encrypt(self, data: str) -> dict:
         """
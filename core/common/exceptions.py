@@ -0,0 +1,18 @@
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class BookingSlotTaken(APIException):
+    """
+    Another booking took the chair or employee for an overlapping period
+    while this request was being processed. The client may retry.
+    """
+
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = _(
+        "This time slot was just booked by someone else. "
+        "Please choose another time and try again."
+    )
+    default_code = "booking_slot_taken"
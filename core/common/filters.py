@@ -81,8 +81,24 @@ class BookingDateFilter(filters.FilterSet):
         model = Booking
         fields = ["status", "booking_date"]
 
+    def get_today(self):
+        """
+        Today in the timezone of the salon in the URL, booking dates are
+        salon-local. Without a salon (e.g. customer bookings across salons)
+        server time is used.
+        """
+        resolver_match = getattr(self.request, "resolver_match", None)
+        salon_uid = resolver_match.kwargs.get("salon_uid") if resolver_match else None
+
+        if salon_uid:
+            salon = Salon.objects.filter(uid=salon_uid).only("id", "timezone").first()
+            if salon:
+                return salon.local_today()
+
+        return now().date()
+
     def filter_date_type(self, queryset, name, value):
-        today = now().date()
+        today = self.get_today()
 
         if value == "today":
             return queryset.filter(booking_date=today)
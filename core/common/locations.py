@@ -1,11 +1,26 @@
 import os
+import threading
+import time
+from functools import lru_cache
+
 from ipware import get_client_ip
 from geoip2.database import Reader
+from geoip2.errors import AddressNotFoundError
+from maxminddb import MODE_MMAP
 
 from django.conf import settings
 
 GEOIP_PATH = os.path.join(settings.BASE_DIR, "geoip/GeoLite2-Country.mmdb")
 
+# How often (seconds) the .mmdb file is checked for a newer version
+GEOIP_RELOAD_CHECK_INTERVAL = 60
+
+_reader = None
+_reader_mtime = None
+_reader_generation = 0
+_next_reload_check = 0.0
+_reader_lock = threading.Lock()
+
 
 def get_customer_ip_address(request):
     """Get the client's IP address from the request."""
@@ -13,6 +28,49 @@ def get_customer_ip_address(request):
     return ip
 
 
+def get_geoip_reader():
+    """
+    Process-wide GeoIP reader, opened once with MODE_MMAP so lookups read
+    straight from the page cache. Reopened when the .mmdb file on disk is
+    replaced (checked at most every GEOIP_RELOAD_CHECK_INTERVAL seconds).
+
+    Returns (reader, generation); the generation changes on every reload.
+    """
+    global _reader, _reader_mtime, _reader_generation, _next_reload_check
+
+    now = time.monotonic()
+    if _reader is not None and now < _next_reload_check:
+        return _reader, _reader_generation
+
+    with _reader_lock:
+        if _reader is not None and now < _next_reload_check:
+            return _reader, _reader_generation
+
+        _next_reload_check = now + GEOIP_RELOAD_CHECK_INTERVAL
+        mtime = os.stat(GEOIP_PATH).st_mtime
+
+        if _reader is None or mtime != _reader_mtime:
+            # The previous reader is left to the garbage collector, lookups
+            # still running on it finish on the old mapping.
+            _reader = Reader(GEOIP_PATH, mode=MODE_MMAP)
+            _reader_mtime = mtime
+            _reader_generation += 1
+
+        return _reader, _reader_generation
+
+
+@lru_cache(maxsize=4096)
+def _lookup_country(ip, generation):
+    # `generation` is part of the cache key, so a reloaded database never
+    # serves results cached from the old one.
+    reader, _ = get_geoip_reader()
+    try:
+        return reader.country(ip).country.iso_code
+    except AddressNotFoundError:
+        # Private / unknown addresses are cached too
+        return None
+
+
 def get_country_from_ip(ip):
     """Get the country code from an IP address."""
 
@@ -20,8 +78,7 @@ def get_country_from_ip(ip):
         return None
 
     try:
-        reader = Reader(GEOIP_PATH)
-        response = reader.country(ip)
-        return response.country.iso_code
+        _, generation = get_geoip_reader()
+        return _lookup_country(ip, generation)
     except Exception:
         return None
@@ -0,0 +1,55 @@
+from django.core.management.base import BaseCommand
+
+from apps.salon.models import Booking
+from apps.salon.pricing import build_line_items, snapshot_totals
+
+SNAPSHOT_FIELDS = [
+    "line_items",
+    "total_services",
+    "total_services_price",
+    "services_discount_price",
+    "total_products",
+    "total_products_price",
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Store the price snapshot of bookings created before it existed. "
+        "Run before backfill_salon_revenue, which reads the snapshot."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Rebuild every booking, not only those without line items.",
+        )
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        bookings = Booking.objects.only(*SNAPSHOT_FIELDS).prefetch_related(
+            "services", "products"
+        )
+        if not options["all"]:
+            bookings = bookings.filter(line_items=[])
+
+        batch = []
+        updated = 0
+        for booking in bookings.iterator(chunk_size=options["batch_size"]):
+            booking.line_items = build_line_items(booking)
+            for field, value in snapshot_totals(booking.line_items).items():
+                setattr(booking, field, value)
+            batch.append(booking)
+
+            if len(batch) >= options["batch_size"]:
+                Booking.objects.bulk_update(batch, SNAPSHOT_FIELDS)
+                updated += len(batch)
+                batch = []
+
+        Booking.objects.bulk_update(batch, SNAPSHOT_FIELDS)
+        updated += len(batch)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Stored the price snapshot of {updated} booking(s).")
+        )
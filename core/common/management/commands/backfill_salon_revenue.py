@@ -0,0 +1,51 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db.models import Max, Min
+
+from apps.salon.choices import BookingStatus
+from apps.salon.models import Booking, Salon, SalonDailyRevenue
+from apps.salon.rollups import BACKFILL_CHUNK_DAYS, rebuild_salon_revenue
+
+
+class Command(BaseCommand):
+    help = "Rebuild the daily revenue rollups from completed bookings"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--salon",
+            help="UID of a single salon to rebuild, every salon by default.",
+        )
+
+    def handle(self, *args, **options):
+        salons = Salon.objects.only("id")
+        if options["salon"]:
+            salons = salons.filter(uid=options["salon"])
+
+        total_rows = 0
+        for salon in salons.iterator():
+            bounds = Booking.objects.filter(
+                salon=salon, status=BookingStatus.COMPLETED
+            ).aggregate(first=Min("booking_date"), last=Max("booking_date"))
+
+            if bounds["first"] is None:
+                SalonDailyRevenue.objects.filter(salon=salon).delete()
+                continue
+
+            # Rows left outside the booking range are stale
+            SalonDailyRevenue.objects.filter(salon=salon).exclude(
+                date__range=(bounds["first"], bounds["last"])
+            ).delete()
+
+            # One transaction per chunk keeps locks and memory bounded
+            start = bounds["first"]
+            while start <= bounds["last"]:
+                end = min(
+                    start + timedelta(days=BACKFILL_CHUNK_DAYS - 1), bounds["last"]
+                )
+                total_rows += rebuild_salon_revenue(salon.id, start, end)
+                start = end + timedelta(days=1)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Wrote {total_rows} daily revenue row(s).")
+        )
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from apps.salon.models import Salon
+from apps.salon.utils import resolve_timezone_name
+
+
+class Command(BaseCommand):
+    help = "Resolve and store Salon.timezone from each salon's location"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Re-resolve every salon, not only those without a timezone.",
+        )
+
+    def handle(self, *args, **options):
+        salons = Salon.objects.only("id", "location", "timezone")
+        if not options["all"]:
+            salons = salons.filter(Q(timezone__isnull=True) | Q(timezone=""))
+
+        updated = []
+        for salon in salons.iterator():
+            # One shared TimezoneFinder for the whole run (see resolve_timezone_name)
+            timezone_name = resolve_timezone_name(salon.location)
+            if salon.timezone != timezone_name:
+                salon.timezone = timezone_name
+                updated.append(salon)
+
+        Salon.objects.bulk_update(updated, ["timezone"], batch_size=500)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Updated timezone of {len(updated)} salon(s).")
+        )
@@ -0,0 +1,96 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+
+from apps.salon.models import Salon
+
+from common.benchmarks import (
+    benchmark_cases,
+    benchmark_environment,
+    client_for,
+    run_case,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure latency percentiles and query counts of the key API endpoints "
+        "against a salon made by generate_synthetic_tenants"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--salon",
+            help="UID of the salon, the latest synthetic salon by default.",
+        )
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument("--warmup", type=int, default=2)
+        parser.add_argument(
+            "--endpoint",
+            action="append",
+            help="URL name to benchmark, every endpoint by default. Repeatable.",
+        )
+        parser.add_argument(
+            "--json", action="store_true", help="Print the results as JSON."
+        )
+
+    def handle(self, *args, **options):
+        salons = Salon.objects.select_related("account__owner")
+        if options["salon"]:
+            salon = salons.filter(uid=options["salon"]).first()
+        else:
+            salon = (
+                salons.filter(account__name__startswith="Synthetic")
+                .order_by("-created_at")
+                .first()
+            )
+        if salon is None:
+            raise CommandError("Salon not found, run generate_synthetic_tenants first.")
+
+        account = salon.account
+        authenticated = client_for(account.owner, account)
+        anonymous = Client()
+
+        results = []
+        with benchmark_environment(salon):
+            for case in benchmark_cases(salon):
+                if options["endpoint"] and case.url_name not in options["endpoint"]:
+                    continue
+                results.append(
+                    run_case(
+                        authenticated if case.authenticated else anonymous,
+                        case,
+                        iterations=options["iterations"],
+                        warmup=options["warmup"],
+                    )
+                )
+
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        self.stdout.write(
+            f"{'endpoint':<42}{'status':>7}{'p50':>9}{'p95':>9}{'p99':>9}"
+            f"{'max':>9}{'queries':>9}{'budget':>8}"
+        )
+        for result in results:
+            line = (
+                f"{result['endpoint']:<42}{result['status']:>7}"
+                f"{result['p50_ms']:>9}{result['p95_ms']:>9}{result['p99_ms']:>9}"
+                f"{result['max_ms']:>9}{result['queries']:>9}"
+                f"{result['query_budget'] or '-':>8}"
+            )
+            over_budget = (
+                result["query_budget"] and result["queries"] > result["query_budget"]
+            )
+            if over_budget or result["status"] >= 400:
+                line = self.style.WARNING(line)
+            self.stdout.write(line)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Benchmarked {len(results)} endpoint(s) on salon {salon.uid}, "
+                f"{options['iterations']} request(s) each. Times in ms."
+            )
+        )
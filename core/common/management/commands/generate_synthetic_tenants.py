@@ -0,0 +1,485 @@
+import random
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from uuid import uuid4
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.gis.geos import Point
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from apps.authentication.choices import AccountMembershipRole, AccountType
+from apps.authentication.models import Account, AccountMembership, User
+from apps.billing.choices import AccountCategory, SubscriptionStatus
+from apps.billing.models import PricingPlan, Subscription
+from apps.salon.choices import (
+    BookingPaymentType,
+    BookingStatus,
+    CustomerType,
+    DaysOfWeek,
+)
+from apps.salon.models import (
+    Booking,
+    Chair,
+    Customer,
+    Employee,
+    OpeningHours,
+    Product,
+    ProductCategory,
+    Salon,
+    Service,
+    ServiceCategory,
+)
+from apps.salon.pricing import product_line_item, service_line_item, snapshot_totals
+from apps.salon.utils import unique_booking_ids
+from apps.thirdparty.choices import WhatsappChatbotMessageRole
+from apps.thirdparty.models import WhatsappChatbotConfig, WhatsappChatbotMessageLog
+
+from common.choices import CategoryType
+from common.models import Category
+
+# (city, country, latitude, longitude, timezone)
+CITIES = [
+    ("Lagos", "NG", 6.5244, 3.3792, "Africa/Lagos"),
+    ("Accra", "GH", 5.6037, -0.1870, "Africa/Accra"),
+    ("Nairobi", "KE", -1.2921, 36.8219, "Africa/Nairobi"),
+    ("London", "GB", 51.5072, -0.1276, "Europe/London"),
+    ("Houston", "US", 29.7604, -95.3698, "America/Chicago"),
+]
+
+DESIGNATIONS = ["Stylist", "Senior Stylist", "Barber", "Nail Technician"]
+CHAIR_TYPES = ["Styling", "Washing", "Manicure"]
+CUSTOMER_SOURCES = ["Walk-in", "Whatsapp", "Instagram", "Referral"]
+FIRST_NAMES = ["Ada", "Kofi", "Amara", "Tunde", "Zuri", "Kwame", "Nia", "Jabari"]
+LAST_NAMES = ["Okafor", "Mensah", "Kamau", "Adeyemi", "Owusu", "Njoroge", "Bello"]
+
+# Fictional number ranges, so generated tenants never collide with real ones
+CUSTOMER_PHONE_PREFIX = "+1555"
+CHATBOT_PHONE_PREFIX = "+1556"
+
+OPENING_TIME = time(9, 0)
+# Half-hour slots between opening and closing (09:00 - 19:00)
+SLOTS_PER_DAY = 20
+# Bookings ahead of today, still placed
+FUTURE_DAYS = 14
+
+BATCH_SIZE = 2000
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate synthetic tenants (accounts, salons, staff, catalog, customers "
+        "and years of booking history) for load tests and benchmarks"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--accounts", type=int, default=1)
+        parser.add_argument("--salons", type=int, default=1, help="Per account.")
+        parser.add_argument("--employees", type=int, default=5, help="Per salon.")
+        parser.add_argument("--chairs", type=int, default=5, help="Per salon.")
+        parser.add_argument("--services", type=int, default=20, help="Per salon.")
+        parser.add_argument("--products", type=int, default=10, help="Per salon.")
+        parser.add_argument("--customers", type=int, default=500, help="Per salon.")
+        parser.add_argument(
+            "--years", type=int, default=1, help="Years of booking history."
+        )
+        parser.add_argument(
+            "--bookings-per-day",
+            type=int,
+            default=15,
+            help="Average bookings per salon and day.",
+        )
+        parser.add_argument(
+            "--messages",
+            type=int,
+            default=200,
+            help="WhatsApp chatbot messages per salon.",
+        )
+        parser.add_argument("--password", default="synthetic-password")
+        parser.add_argument("--seed", type=int, default=None)
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options["seed"])
+        self.options = options
+        # Tells the users of different runs apart
+        self.run = uuid4().hex[:8]
+        self.password = make_password(options["password"])
+        self.customer_phones = self.phone_numbers(
+            CUSTOMER_PHONE_PREFIX,
+            Customer.objects.filter(phone__startswith=CUSTOMER_PHONE_PREFIX).count(),
+        )
+        self.chatbot_phones = self.phone_numbers(
+            CHATBOT_PHONE_PREFIX,
+            WhatsappChatbotConfig.objects.filter(
+                whatsapp_number__startswith=f"whatsapp:{CHATBOT_PHONE_PREFIX}"
+            ).count(),
+        )
+
+        if not ServiceCategory.objects.exists():
+            call_command("create_service_categories", stdout=self.stdout)
+        if not ProductCategory.objects.exists():
+            call_command("create_product_categories", stdout=self.stdout)
+        self.service_categories = list(ServiceCategory.objects.all())
+        self.product_categories = list(ProductCategory.objects.all())
+        self.plan = self.get_pricing_plan()
+
+        total_bookings = 0
+        for index in range(options["accounts"]):
+            with transaction.atomic():
+                account, salons = self.create_account(index)
+            for salon in salons:
+                total_bookings += self.create_bookings(salon)
+                # bulk_create skips the signals that keep the rollups current
+                call_command("backfill_salon_revenue", salon=str(salon.uid))
+
+            self.stdout.write(
+                f"Account {account.uid} (owner {account.owner.email}) created."
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Generated {options['accounts']} account(s) and "
+                f"{total_bookings} booking(s). Password: {options['password']}"
+            )
+        )
+
+    @staticmethod
+    def phone_numbers(prefix, start):
+        number = start
+        while True:
+            number += 1
+            yield f"{prefix}{number:07d}"
+
+    def get_pricing_plan(self):
+        plans = PricingPlan.objects.filter(
+            account_category=AccountCategory.SALON_SHOP, is_active=True
+        ).order_by("-price")
+        if not plans.exists():
+            call_command("create_pricing_plans", stdout=self.stdout)
+        return plans.first()
+
+    # ── Tenant ─────────────────────────────────────────────────────────────
+
+    def create_account(self, index):
+        options = self.options
+        now = timezone.now()
+
+        owner = User.objects.create(
+            email=f"synthetic-{self.run}-{index}@example.com",
+            password=self.password,
+            first_name="Synthetic",
+            last_name=f"Owner {index}",
+        )
+        account = Account.objects.create(
+            name=f"Synthetic {self.run} #{index}",
+            account_type=AccountType.SALON_SHOP,
+            owner=owner,
+        )
+        AccountMembership.objects.create(
+            user=owner,
+            account=account,
+            role=AccountMembershipRole.OWNER,
+            is_owner=True,
+        )
+        Subscription.objects.create(
+            account=account,
+            pricing_plan=self.plan,
+            status=SubscriptionStatus.ACTIVE,
+            start_date=now,
+            end_date=now + timedelta(days=30),
+            remaining_whatsapp_messages=self.plan.total_messages,
+        )
+
+        categories = {
+            category_type: Category.objects.bulk_create(
+                [
+                    Category(name=name, category_type=category_type, account=account)
+                    for name in names
+                ]
+            )
+            for category_type, names in (
+                (CategoryType.EMPLOYEE, DESIGNATIONS),
+                (CategoryType.CHAIR, CHAIR_TYPES),
+                (CategoryType.CUSTOMER_SOURCE, CUSTOMER_SOURCES),
+            )
+        }
+
+        salons = []
+        for salon_index in range(options["salons"]):
+            city, country, latitude, longitude, timezone_name = self.rng.choice(CITIES)
+            salons.append(
+                Salon(
+                    name=f"Synthetic Salon {index}-{salon_index}",
+                    account=account,
+                    city=city,
+                    country=country,
+                    # Spread salons a few kilometers around the city center
+                    location=Point(
+                        longitude + self.rng.uniform(-0.05, 0.05),
+                        latitude + self.rng.uniform(-0.05, 0.05),
+                        srid=4326,
+                    ),
+                    # bulk_create skips Salon.save(), which resolves it
+                    timezone=timezone_name,
+                    phone_number_one="+15550000000",
+                    email=f"salon-{self.run}-{index}-{salon_index}@example.com",
+                )
+            )
+        salons = Salon.objects.bulk_create(salons)
+
+        OpeningHours.objects.bulk_create(
+            OpeningHours(
+                salon=salon,
+                day=day,
+                opening_time=OPENING_TIME,
+                closing_time=time(19, 0),
+            )
+            for salon in salons
+            for day in DaysOfWeek.values
+        )
+        for salon in salons:
+            self.create_salon_data(account, salon, categories)
+        return account, salons
+
+    def create_salon_data(self, account, salon, categories):
+        options = self.options
+        rng = self.rng
+
+        salon.synthetic_employees = Employee.objects.bulk_create(
+            Employee(
+                employee_id=f"EMP{number:04d}",
+                name=f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                phone="+15550000001",
+                designation=rng.choice(categories[CategoryType.EMPLOYEE]),
+                account=account,
+                salon=salon,
+            )
+            for number in range(options["employees"])
+        )
+        salon.synthetic_chairs = Chair.objects.bulk_create(
+            Chair(
+                name=f"Chair {number + 1}",
+                type=rng.choice(categories[CategoryType.CHAIR]),
+                account=account,
+                salon=salon,
+            )
+            for number in range(options["chairs"])
+        )
+        salon.synthetic_services = Service.objects.bulk_create(
+            Service(
+                name=f"Service {number + 1}",
+                price=Decimal(rng.randrange(10, 200)),
+                discount_percentage=Decimal(rng.choice([0, 0, 0, 10, 20])),
+                service_duration=timedelta(minutes=rng.choice([30, 60, 90])),
+                available_time_slots=["ANYTIME"],
+                category=rng.choice(self.service_categories),
+                account=account,
+                salon=salon,
+            )
+            for number in range(options["services"])
+        )
+        Service.assign_employees.through.objects.bulk_create(
+            Service.assign_employees.through(service=service, employee=employee)
+            for service in salon.synthetic_services
+            for employee in salon.synthetic_employees
+        )
+        salon.synthetic_products = Product.objects.bulk_create(
+            Product(
+                name=f"Product {number + 1}",
+                price=Decimal(rng.randrange(5, 80)),
+                category=rng.choice(self.product_categories),
+                account=account,
+                salon=salon,
+            )
+            for number in range(options["products"])
+        )
+        salon.synthetic_customers = Customer.objects.bulk_create(
+            (
+                Customer(
+                    first_name=rng.choice(FIRST_NAMES),
+                    last_name=rng.choice(LAST_NAMES),
+                    phone=next(self.customer_phones),
+                    source=rng.choice(categories[CategoryType.CUSTOMER_SOURCE]),
+                    # One in five never booked
+                    type=(
+                        CustomerType.LEAD
+                        if rng.random() < 0.2
+                        else CustomerType.CUSTOMER
+                    ),
+                    account=account,
+                    salon=salon,
+                )
+                for _ in range(options["customers"])
+            ),
+            batch_size=BATCH_SIZE,
+        )
+
+        chatbot = WhatsappChatbotConfig.objects.create(
+            whatsapp_number=f"whatsapp:{next(self.chatbot_phones)}",
+            sender_sid="synthetic",
+            status="ONLINE",
+            chatbot_name=salon.name,
+            created_by=account.owner,
+            salon=salon,
+            account=account,
+        )
+        if salon.synthetic_customers:
+            WhatsappChatbotMessageLog.objects.bulk_create(
+                (
+                    WhatsappChatbotMessageLog(
+                        chatbot=chatbot,
+                        customer=rng.choice(salon.synthetic_customers),
+                        message=f"Synthetic message {number}",
+                        role=(
+                            WhatsappChatbotMessageRole.CUSTOMER
+                            if number % 2 == 0
+                            else WhatsappChatbotMessageRole.BOT
+                        ),
+                    )
+                    for number in range(options["messages"])
+                ),
+                batch_size=BATCH_SIZE,
+            )
+
+    # ── Booking history ────────────────────────────────────────────────────
+
+    def create_bookings(self, salon) -> int:
+        """Bookings of every day of the history, inserted in batches."""
+        customers = [
+            customer
+            for customer in salon.synthetic_customers
+            if customer.type == CustomerType.CUSTOMER
+        ]
+        if not customers or not salon.synthetic_services:
+            return 0
+
+        today = salon.local_today()
+        day = today - timedelta(days=365 * self.options["years"])
+        last_day = today + timedelta(days=FUTURE_DAYS)
+
+        created = 0
+        pending = []
+        while day <= last_day:
+            pending.extend(self.bookings_of_day(salon, customers, day, today))
+            if len(pending) >= BATCH_SIZE:
+                created += self.insert_bookings(pending)
+                pending = []
+            day += timedelta(days=1)
+        if pending:
+            created += self.insert_bookings(pending)
+        return created
+
+    def bookings_of_day(self, salon, customers, day: date, today: date):
+        """
+        (booking, services, products) of one salon-day. Every booking takes
+        a half-hour slot, and an employee or chair is never booked twice in
+        the same slot, which keeps the overlap constraints satisfied.
+        """
+        rng = self.rng
+        employees = salon.synthetic_employees
+        chairs = salon.synthetic_chairs
+        busy = set()
+
+        for _ in range(rng.randint(0, 2 * self.options["bookings_per_day"])):
+            slot = rng.randrange(SLOTS_PER_DAY)
+            employee = self.free(employees, "employee", slot, busy)
+            chair = self.free(chairs, "chair", slot, busy)
+            if (employees and not employee) or (chairs and not chair):
+                continue
+            for kind, resource in (("employee", employee), ("chair", chair)):
+                if resource:
+                    busy.add((kind, resource.id, slot))
+
+            if day >= today:
+                status = BookingStatus.PLACED
+            else:
+                status = rng.choices(
+                    [
+                        BookingStatus.COMPLETED,
+                        BookingStatus.CANCELLED,
+                        BookingStatus.ABSENT,
+                    ],
+                    weights=[80, 12, 8],
+                )[0]
+
+            services = rng.sample(
+                salon.synthetic_services,
+                min(rng.randint(1, 3), len(salon.synthetic_services)),
+            )
+            products = []
+            if salon.synthetic_products and rng.random() < 0.3:
+                products = rng.sample(
+                    salon.synthetic_products,
+                    min(rng.randint(1, 2), len(salon.synthetic_products)),
+                )
+            line_items = [service_line_item(service) for service in services] + [
+                product_line_item(product) for product in products
+            ]
+
+            booking_time = (
+                datetime.combine(day, OPENING_TIME) + timedelta(minutes=30 * slot)
+            ).time()
+            booking = Booking(
+                booking_date=day,
+                booking_time=booking_time,
+                booking_duration=timedelta(minutes=30),
+                status=status,
+                tips_amount=(
+                    Decimal(rng.choice([0, 0, 5, 10]))
+                    if status == BookingStatus.COMPLETED
+                    else Decimal("0")
+                ),
+                payment_type=rng.choice(BookingPaymentType.values),
+                completed_at=(
+                    timezone.make_aware(
+                        datetime.combine(day, booking_time), salon.get_timezone()
+                    )
+                    if status == BookingStatus.COMPLETED
+                    else None
+                ),
+                line_items=line_items,
+                **snapshot_totals(line_items),
+                account_id=salon.account_id,
+                salon=salon,
+                customer=rng.choice(customers),
+                employee=employee,
+                chair=chair,
+            )
+            yield booking, services, products
+
+    def free(self, resources, kind, slot, busy):
+        """A random resource not booked in `slot`, None if all of them are."""
+        available = [
+            resource for resource in resources if (kind, resource.id, slot) not in busy
+        ]
+        return self.rng.choice(available) if available else None
+
+    @transaction.atomic
+    def insert_bookings(self, pending) -> int:
+        for (booking, _, _), booking_id in zip(
+            pending, unique_booking_ids(len(pending))
+        ):
+            booking.booking_id = booking_id
+
+        bookings = Booking.objects.bulk_create(
+            [booking for booking, _, _ in pending], batch_size=BATCH_SIZE
+        )
+        Booking.services.through.objects.bulk_create(
+            (
+                Booking.services.through(booking_id=booking.id, service_id=service.id)
+                for booking, (_, services, _) in zip(bookings, pending)
+                for service in services
+            ),
+            batch_size=BATCH_SIZE,
+        )
+        Booking.products.through.objects.bulk_create(
+            (
+                Booking.products.through(booking_id=booking.id, product_id=product.id)
+                for booking, (_, _, products) in zip(bookings, pending)
+                for product in products
+            ),
+            batch_size=BATCH_SIZE,
+        )
+        return len(bookings)
@@ -1,8 +1,6 @@
 import logging
 import requests
 from django.conf import settings
-from twilio.rest import Client
-from .crypto import decrypt_data
 
 logger = logging.getLogger(__name__)
 
@@ -102,11 +100,11 @@ def fetch_whatsapp_number(phone_number_id: str, access_token: str) -> str:
 
 
 def sync_sender_status(chatbot_config):
-    account_sid = decrypt_data(chatbot_config.account_sid, settings.CRYPTO_PASSWORD)
-    auth_token = decrypt_data(chatbot_config.auth_token, settings.CRYPTO_PASSWORD)
+    from apps.thirdparty.twilio_clients import get_chatbot_twilio_client
+
     sender_sid = chatbot_config.sender_sid
 
-    client = Client(account_sid, auth_token)
+    client = get_chatbot_twilio_client(chatbot_config)
 
     sender = client.messaging.v2.channels_senders(sender_sid).fetch()
 
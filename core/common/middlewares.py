@@ -1,70 +1,90 @@
+import logging
 import re
+from django.conf import settings
+from django.core.exceptions import ValidationError
 from django.utils.deprecation import MiddlewareMixin
 from django.http import JsonResponse
 
 from rest_framework_simplejwt.authentication import JWTAuthentication
 
+from apps.authentication.memberships import get_membership
 from apps.authentication.models import Account
+from common.authentication import JWT_AUTH_ATTR
+from common.queries import QueryRecorder, log_query_summary
+
+logger = logging.getLogger(__name__)
 
 
 class CurrentAccountMiddleware(MiddlewareMixin):
+    # Matched against the full request path
     EXCLUDED_PATHS = [
         # Admin paths
-        re.compile(r"^/api/admin/.*$"),
+        r"/api/admin/.*",
         # Public paths
-        re.compile(r"^/admin/.*$"),
-        re.compile(r"^/api/auth/register/?$"),
-        re.compile(r"^/api/auth/login/?$"),
-        re.compile(r"^/api/auth/change-password/?$"),
-        re.compile(r"^/api/auth/forgot-password/?$"),
-        re.compile(r"^/api/auth/reset-password/?$"),
-        re.compile(r"^/api/auth/logout/?$"),
-        re.compile(r"^/api/auth/verify-email/.*$"),
-        re.compile(r"^/api/auth/resend-verification-email/?$"),
-        re.compile(r"^/api/auth/accept-invitation/[0-9a-fA-F-]+/?$"),
+        r"/admin/.*",
+        r"/api/auth/register/?",
+        r"/api/auth/login/?",
+        r"/api/auth/change-password/?",
+        r"/api/auth/forgot-password/?",
+        r"/api/auth/reset-password/?",
+        r"/api/auth/logout/?",
+        r"/api/auth/verify-email/.*",
+        r"/api/auth/resend-verification-email/?",
+        r"/api/auth/accept-invitation/[0-9a-fA-F-]+/?",
         # Landing page
-        re.compile(r"^/api/public/salons/?$"),
-        re.compile(r"^/api/public/salons/[0-9a-fA-F-]{36}/?$"),
-        re.compile(r"^/api/filters/[0-9a-fA-F-]{36}/services/?$"),
-        re.compile(r"^/api/filters/[0-9a-fA-F-]{36}/products/?$"),
-        re.compile(r"^/api/filters/service-categories/?$"),
-        re.compile(r"^/api/filters/service-sub-categories/?$"),
-        re.compile(r"^/api/public/booking/?$"),
+        r"/api/public/salons/?",
+        r"/api/public/salons/[0-9a-fA-F-]{36}/?",
+        r"/api/public/salons/[0-9a-fA-F-]{36}/free-slots/?",
+        r"/api/filters/[0-9a-fA-F-]{36}/services/?",
+        r"/api/filters/[0-9a-fA-F-]{36}/products/?",
+        r"/api/filters/service-categories/?",
+        r"/api/filters/service-sub-categories/?",
+        r"/api/public/booking/?",
         # Consumers
-        re.compile(r"^/api/auth/send-otp/?$"),
-        re.compile(r"^/api/auth/verify-otp/?$"),
-        re.compile(r"^/api/consumers/profile/?$"),
-        re.compile(r"^/api/consumers/bookings/?$"),
-        re.compile(r"^/api/consumers/bookings/[0-9a-fA-F-]{36}/?$"),
-        re.compile(r"^/api/consumers/bookings/[0-9a-fA-F-]{36}/receipt/?$"),
+        r"/api/auth/send-otp/?",
+        r"/api/auth/verify-otp/?",
+        r"/api/consumers/profile/?",
+        r"/api/consumers/bookings/?",
+        r"/api/consumers/bookings/[0-9a-fA-F-]{36}/?",
+        r"/api/consumers/bookings/[0-9a-fA-F-]{36}/receipt/?",
         # API documentation and schema
-        re.compile(r"^/api/docs/?$"),
-        re.compile(r"^/api/redoc/?$"),
-        re.compile(r"^/api/schema/?$"),
+        r"/api/docs/?",
+        r"/api/redoc/?",
+        r"/api/schema/?",
         # JWT Token endpoints
-        re.compile(r"^/api/token/?$"),
-        re.compile(r"^/api/token/refresh/?$"),
-        re.compile(r"^/api/token/verify/?$"),
+        r"/api/token/?",
+        r"/api/token/refresh/?",
+        r"/api/token/verify/?",
         # Media and static files
-        re.compile(r"^/media/.*$"),
-        re.compile(r"^/static/.*$"),
+        r"/media/.*",
+        r"/static/.*",
         # Stripe and Whatsapp webhook
-        re.compile(r"^/api/webhooks/.*$"),
+        r"/api/webhooks/.*",
     ]
 
+    # All exclusions as one alternation, a single regex run per request
+    EXCLUDED_PATHS_PATTERN = re.compile(
+        "|".join(f"(?:{pattern})" for pattern in EXCLUDED_PATHS)
+    )
+
     def is_excluded_path(self, path):
-        test = any(pattern.match(path) for pattern in self.EXCLUDED_PATHS)
-        print("is_excluded_path", path, test)
-        return test
+        excluded = self.EXCLUDED_PATHS_PATTERN.fullmatch(path) is not None
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Account exclusion for %s: %s", path, excluded)
+        return excluded
 
     def process_request(self, request):
         jwt_auth = JWTAuthentication()
         try:
             user_auth_tuple = jwt_auth.authenticate(request)
-            if user_auth_tuple is not None:
-                request.user, _ = user_auth_tuple
         except Exception:
+            # Left unset: DRF authenticates again and answers with its 401
             pass
+        else:
+            # Reused by RequestJWTAuthentication instead of a second pass
+            setattr(request, JWT_AUTH_ATTR, user_auth_tuple)
+            if user_auth_tuple is not None:
+                request.user, _ = user_auth_tuple
 
         if request.path == "/api/auth/me":
             if getattr(request.user, "is_staff", False):
@@ -82,10 +102,68 @@ class CurrentAccountMiddleware(MiddlewareMixin):
             if account_id:
                 try:
                     account = Account.objects.get(uid=account_id)
-                    request.account = account
-                except Account.DoesNotExist:
+                except (Account.DoesNotExist, ValidationError):
                     return JsonResponse({"error": "Invalid account ID"}, status=400)
+                request.account = account
+                request.membership = get_membership(user, account)
             else:
                 return JsonResponse(
                     {"error": "Missing X-ACCOUNT-ID header"}, status=400
                 )
+
+
+class QueryCountMiddleware:
+    """
+    Records the database queries of every request. With DEBUG the numbers
+    are returned as X-DB-* response headers, otherwise they are logged
+    (see common.queries.log_query_summary). Streaming responses are always
+    logged, once their body is sent: their headers go out before the body's
+    queries run.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with QueryRecorder() as recorder:
+            response = self.get_response(request)
+
+        match = getattr(request, "resolver_match", None)
+        endpoint = match.view_name if match else request.path
+
+        if response.streaming and not response.is_async:
+            # The body (exports) runs its queries after the view returned,
+            # while the server reads it; they are logged once it is sent
+            response.streaming_content = self._record_streaming_content(
+                response.streaming_content, recorder, endpoint, request, response
+            )
+            return response
+
+        if settings.DEBUG:
+            summary = recorder.summary()
+            response["X-DB-Query-Count"] = summary["query_count"]
+            response["X-DB-Query-Time-Ms"] = summary["query_time_ms"]
+            response["X-DB-Duplicate-Query-Count"] = summary["duplicate_query_count"]
+        else:
+            log_query_summary(
+                endpoint,
+                recorder,
+                method=request.method,
+                status=response.status_code,
+            )
+
+        return response
+
+    @staticmethod
+    def _record_streaming_content(content, recorder, endpoint, request, response):
+        try:
+            with recorder:
+                yield from content
+        finally:
+            log_query_summary(
+                endpoint,
+                recorder,
+                method=request.method,
+                status=response.status_code,
+                streaming=True,
+            )
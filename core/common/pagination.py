@@ -0,0 +1,78 @@
+"""
+Cursor pagination for the long lists.
+
+A cursor seeks straight to the rows after the last one returned, using the
+matching composite index, instead of scanning OFFSET rows and counting the
+whole table for every page, so a deep page costs the same as the first one.
+
+The cursor position is the first ordering field; rows sharing it (bookings
+of the same day) are skipped with an offset that never exceeds one day's
+bookings. The remaining fields keep the order stable. Views using these
+classes must default their `ordering` to the same fields and only offer the
+first one in `ordering_fields`: ?ordering=<field> or -<field> pages through
+the whole cursor ordering in either direction, any other ordering is a 400.
+"""
+
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import OrderingFilter
+from rest_framework.pagination import CursorPagination
+from rest_framework.settings import api_settings
+
+BOOKING_CURSOR_ORDERING = ("-booking_date", "-booking_time", "-id")
+CUSTOMER_CURSOR_ORDERING = ("-created_at", "-id")
+MESSAGE_CURSOR_ORDERING = ("-sent_at", "-id")
+
+
+def _reversed(field: str) -> str:
+    return field[1:] if field.startswith("-") else f"-{field}"
+
+
+class BaseCursorPagination(CursorPagination):
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+    def get_ordering(self, request, queryset, view):
+        """
+        `ordering`, or all of it reversed when the requested ordering starts
+        with its first field the other way round. A different field, or the
+        first one without the tiebreakers, would make the cursor position a
+        non-unique column and the pages unstable.
+        """
+        self.check_requested_ordering(request, view)
+        requested = super().get_ordering(request, queryset, view)
+        if requested[0] == _reversed(self.ordering[0]):
+            return tuple(_reversed(field) for field in self.ordering)
+        return tuple(self.ordering)
+
+    def check_requested_ordering(self, request, view):
+        """Reject an ?ordering= the cursor cannot page through."""
+        filter_backends = getattr(view, "filter_backends", [])
+        if not any(issubclass(backend, OrderingFilter) for backend in filter_backends):
+            return
+
+        param = api_settings.ORDERING_PARAM
+        requested = request.query_params.get(param)
+        if not requested:
+            return
+
+        field = self.ordering[0].lstrip("-")
+        allowed = (field, f"-{field}")
+        if requested.strip() not in allowed:
+            raise ValidationError(
+                {param: f"Only {' or '.join(allowed)} is supported for this list."}
+            )
+
+
+class BookingCursorPagination(BaseCursorPagination):
+    ordering = BOOKING_CURSOR_ORDERING
+
+
+class CustomerCursorPagination(BaseCursorPagination):
+    ordering = CUSTOMER_CURSOR_ORDERING
+
+
+class MessageLogCursorPagination(BaseCursorPagination):
+    """Newest messages first, older ones on the following pages."""
+
+    ordering = MESSAGE_CURSOR_ORDERING
+    page_size = 50
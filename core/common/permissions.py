@@ -1,24 +1,33 @@
 from rest_framework.permissions import BasePermission
 
-from apps.authentication.models import AccountMembership
+from apps.authentication.memberships import get_membership
 from apps.authentication.choices import AccountMembershipRole
 
 
-def _has_account_membership(user, account, roles):
-    if not (user and user.is_authenticated and account):
-        return False
-    return AccountMembership.objects.filter(
-        user=user, account=account, role__in=roles
-    ).exists()
+def get_request_membership(request):
+    """
+    AccountMembership of request.user in request.account, or None. Resolved
+    once per request (CurrentAccountMiddleware usually already did) and
+    exposed as `request.membership`.
+    """
+    django_request = getattr(request, "_request", request)
+    if not hasattr(django_request, "membership"):
+        django_request.membership = get_membership(
+            getattr(request, "user", None), getattr(request, "account", None)
+        )
+    return django_request.membership
+
+
+def _has_account_membership(request, roles):
+    membership = get_request_membership(request)
+    return membership is not None and membership.role in roles
 
 
 class RolePermission(BasePermission):
     roles = ()
 
     def has_permission(self, request, view):
-        return _has_account_membership(
-            request.user, getattr(request, "account", None), self.roles
-        )
+        return _has_account_membership(request, self.roles)
 
 
 class IsOwner(RolePermission):
@@ -0,0 +1,139 @@
+"""
+Database query instrumentation.
+
+QueryRecorder counts the queries run on a connection, their total time and
+the statements executed more than once (the usual N+1 signature, grouped by
+a fingerprint with the literal values stripped). It backs
+QueryCountMiddleware and the `query_budget` pytest fixture in conftest.py.
+"""
+
+import logging
+import re
+import time
+from collections import Counter
+from functools import wraps
+
+from django.conf import settings
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN \((?:\s*\?\s*,?)+\)", re.IGNORECASE)
+
+
+def fingerprint(sql: str) -> str:
+    """The statement with its literal values replaced by `?`."""
+    sql = _STRING_LITERAL.sub("?", sql)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    sql = sql.replace("%s", "?")
+    return _IN_LIST.sub("IN (...)", sql)
+
+
+class QueryRecorder:
+    """
+    Context manager recording the queries executed on `using` connection:
+
+        with QueryRecorder() as recorder:
+            ...
+        recorder.count, recorder.duration_ms, recorder.duplicates()
+    """
+
+    def __init__(self, using=None):
+        if using is None:
+            self.connection = connection
+        else:
+            from django.db import connections
+
+            self.connection = connections[using]
+        self.queries = []
+        self.duration = 0.0
+        self._wrapper = None
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.duration += elapsed
+            self.queries.append((sql, elapsed))
+
+    def __enter__(self):
+        self._wrapper = self.connection.execute_wrapper(self)
+        self._wrapper.__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._wrapper.__exit__(*exc_info)
+
+    @property
+    def count(self) -> int:
+        return len(self.queries)
+
+    @property
+    def duration_ms(self) -> float:
+        return round(self.duration * 1000, 2)
+
+    def duplicates(self, minimum=2) -> list[tuple[str, int]]:
+        """(fingerprint, times) of statements run at least `minimum` times."""
+        counts = Counter(fingerprint(sql) for sql, _ in self.queries)
+        return [
+            (statement, times)
+            for statement, times in counts.most_common()
+            if times >= minimum
+        ]
+
+    def summary(self) -> dict:
+        duplicates = self.duplicates()
+        return {
+            "query_count": self.count,
+            "query_time_ms": self.duration_ms,
+            "duplicate_query_count": sum(times - 1 for _, times in duplicates),
+            "duplicate_queries": [
+                {"fingerprint": statement, "count": times}
+                for statement, times in duplicates[:5]
+            ],
+        }
+
+
+def log_query_summary(label, recorder, **extra):
+    """
+    One structured log line per instrumented unit of work. Logged as a
+    warning once the query count exceeds settings.QUERY_COUNT_WARNING or
+    the same statement ran more than once.
+    """
+    summary = {"endpoint": label, **extra, **recorder.summary()}
+    threshold = getattr(settings, "QUERY_COUNT_WARNING", 50)
+    level = (
+        logging.WARNING
+        if summary["query_count"] > threshold or summary["duplicate_query_count"]
+        else logging.INFO
+    )
+    logger.log(
+        level,
+        "db queries endpoint=%s count=%s time_ms=%s duplicates=%s",
+        label,
+        summary["query_count"],
+        summary["query_time_ms"],
+        summary["duplicate_query_count"],
+        extra={"db_queries": summary},
+    )
+
+
+def record_queries(func):
+    """
+    Decorator for code outside the request cycle (tasks, commands): runs
+    `func` under a QueryRecorder and logs its summary like the middleware.
+    """
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with QueryRecorder() as recorder:
+            try:
+                return func(*args, **kwargs)
+            finally:
+                log_query_summary(func.__qualname__, recorder)
+
+    return wrapper
@@ -248,3 +248,25 @@ class OpeningHoursSlimSerializer(serializers.ModelSerializer):
     class Meta:
         model = OpeningHours
         exclude = ["salon", "created_at", "updated_at"]
+
+
+class BookingPriceFieldsMixin(serializers.Serializer):
+    """Booking prices, read from the snapshot stored on the booking"""
+
+    total_products = serializers.IntegerField(read_only=True)
+    total_products_price = serializers.DecimalField(
+        max_digits=12, decimal_places=2, coerce_to_string=False, read_only=True
+    )
+    total_services = serializers.IntegerField(read_only=True)
+    total_services_price = serializers.DecimalField(
+        max_digits=12, decimal_places=2, coerce_to_string=False, read_only=True
+    )
+    services_discount_price = serializers.DecimalField(
+        max_digits=12, decimal_places=2, coerce_to_string=False, read_only=True
+    )
+    total_price = serializers.DecimalField(
+        max_digits=12, decimal_places=2, coerce_to_string=False, read_only=True
+    )
+    final_price = serializers.DecimalField(
+        max_digits=12, decimal_places=2, coerce_to_string=False, read_only=True
+    )
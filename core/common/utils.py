@@ -2,7 +2,6 @@ import random
 from datetime import timedelta
 from io import BytesIO
 from datetime import timedelta, datetime, timezone as dt_timezone
-from decimal import Decimal
 from weasyprint import HTML
 
 from django.contrib.auth.tokens import PasswordResetTokenGenerator
@@ -65,24 +64,20 @@ def get_media_path(instance, filename):
 def generate_receipt_pdf(booking):
     """Generate a PDF receipt for a booking."""
 
-    total_amount = Decimal("0.00")
+    from apps.salon.pricing import split_line_items
 
-    for service in booking.services.all():
-        final_price = service.final_price()
-
-        if isinstance(final_price, Decimal):
-            total_amount += final_price
-        else:
-            total_amount += Decimal(str(final_price))
-
-    for product in booking.products.all():
-        if isinstance(product.price, Decimal):
-            total_amount += product.price
-        else:
-            total_amount += Decimal(str(product.price))
+    # Prices as they were booked, not the current catalogue prices
+    services, products = split_line_items(booking.line_items)
+    total_amount = booking.services_discount_price + booking.total_products_price
 
     html_string = render_to_string(
-        "booking/receipt.html", {"booking": booking, "total_amount": total_amount}
+        "booking/receipt.html",
+        {
+            "booking": booking,
+            "services": services,
+            "products": products,
+            "total_amount": total_amount,
+        },
     )
 
     pdf_file = BytesIO()
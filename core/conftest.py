@@ -0,0 +1,64 @@
+"""
+Shared pytest fixtures (requires pytest-django).
+
+`query_budget` fails a test when the code under it runs more queries than
+the endpoint's budget in common.benchmarks.QUERY_BUDGETS:
+
+    def test_booking_list(client, query_budget):
+        with query_budget("salon.booking-list"):
+            client.get(url)
+"""
+
+from contextlib import contextmanager
+
+import pytest
+from django.core.management import call_command
+
+from common.benchmarks import QUERY_BUDGETS
+from common.queries import QueryRecorder
+
+
+@pytest.fixture(scope="session")
+def synthetic_salon(django_db_setup, django_db_blocker):
+    """A salon with its staff, catalog, customers and a year of bookings."""
+    from apps.salon.models import Salon
+
+    with django_db_blocker.unblock():
+        call_command(
+            "generate_synthetic_tenants",
+            customers=200,
+            bookings_per_day=10,
+            messages=50,
+            seed=1,
+        )
+        return (
+            Salon.objects.select_related("account__owner")
+            .filter(account__name__startswith="Synthetic")
+            .latest("created_at")
+        )
+
+
+@pytest.fixture
+def query_recorder(db):
+    with QueryRecorder() as recorder:
+        yield recorder
+
+
+@pytest.fixture
+def query_budget(db):
+    @contextmanager
+    def budget(url_name, max_queries=None):
+        limit = QUERY_BUDGETS[url_name] if max_queries is None else max_queries
+        with QueryRecorder() as recorder:
+            yield recorder
+
+        if recorder.count > limit:
+            repeated = "\n".join(
+                f"  {times}x {statement}" for statement, times in recorder.duplicates()
+            )
+            pytest.fail(
+                f"{url_name} ran {recorder.count} queries, budget is {limit}.\n"
+                f"Repeated statements:\n{repeated or '  none'}"
+            )
+
+    return budget
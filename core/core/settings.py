@@ -46,6 +46,7 @@ THIRD_PARTY_APPS = [
     "rest_framework_simplejwt.token_blacklist",
     "simple_history",
     "django.contrib.gis",
+    "django.contrib.postgres",
     "django_celery_beat",
 ]
 
@@ -62,6 +63,7 @@ INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + PROJECT_APPS
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "common.middlewares.QueryCountMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -174,7 +176,7 @@ REST_FRAMEWORK = {
         "login": "20/minute",  # Login endpoint
     },
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "common.authentication.RequestJWTAuthentication",
         "rest_framework.authentication.SessionAuthentication",
     ],
     "DEFAULT_FILTER_BACKENDS": [
@@ -296,9 +298,17 @@ LOGGING = {
             "level": "INFO",
             "propagate": False,
         },
+        "common.queries": {
+            "handlers": ["console"],
+            "level": "INFO",
+            "propagate": False,
+        },
     },
 }
 
+# Requests / tasks running more queries than this are logged as warnings
+QUERY_COUNT_WARNING = 50
+
 CORS_ALLOW_HEADERS = [
     "accept",
     "accept-encoding",
@@ -313,6 +323,10 @@ CORS_ALLOW_HEADERS = [
 ]
 CORS_EXPOSE_HEADERS = [
     "X-ACCOUNT-ID",
+    # Query instrumentation, DEBUG only (common.middlewares.QueryCountMiddleware)
+    "X-DB-Query-Count",
+    "X-DB-Query-Time-Ms",
+    "X-DB-Duplicate-Query-Count",
 ]
 
 CELERY_BROKER_URL = config("REDIS_URL", default="redis://redis:6379/0")
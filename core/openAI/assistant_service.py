@@ -1,10 +1,10 @@
+import hashlib
+import json
 import logging
 import time
-import pytz
-from datetime import datetime
-from timezonefinder import TimezoneFinder
 
-from openai import OpenAI
+import httpx
+from openai import APITimeoutError, OpenAI
 
 from apps.salon.models import Salon, Customer
 from openAI.assistant_instructions import SALON_ASSISTANT_INSTRUCTIONS
@@ -15,35 +15,26 @@ logger = logging.getLogger(__name__)
 
 client = OpenAI()  # reads OPENAI_API_KEY from environment
 
+# Streamed run calls are never retried by the SDK: a retry could start a
+# second run on the thread, and three timeouts would outlast the WhatsApp
+# conversation lock
+run_client = client.with_options(max_retries=0)
+
+# A timeout while sending a request is raised as APITimeoutError, one while
+# reading the event stream as the underlying httpx error
+RUN_TIMEOUT_ERRORS = (APITimeoutError, httpx.TimeoutException)
+
 
 def get_runtime_context(salon: Salon) -> str:
     """
     Returns a formatted runtime context string for the salon,
     including current date, time, and timezone based on its location.
-    This can be sent as a system message or additional_instructions
-    to the OpenAI assistant.
+    This is sent as the run's additional_instructions.
     """
 
-    # Default timezone in case location fails
-    default_timezone = "Asia/Dubai"
-
-    try:
-        # Get latitude and longitude from salon location PointField
-        lat = salon.location.y
-        lng = salon.location.x
-
-        tf = TimezoneFinder()
-        timezone_str = tf.timezone_at(lat=lat, lng=lng)
-
-        if timezone_str is None:
-            timezone_str = default_timezone
-
-    except Exception:
-        timezone_str = default_timezone
-
-    # Current date and time in the salon's timezone
-    tz = pytz.timezone(timezone_str)
-    now = datetime.now(tz)
+    # Current date and time in the salon's (stored) timezone
+    now = salon.local_now()
+    timezone_str = str(now.tzinfo)
     current_date = now.strftime("%Y-%m-%d")
     current_time = now.strftime("%H:%M")
 
@@ -69,34 +60,62 @@ def get_runtime_context(salon: Salon) -> str:
 # ─────────────────────────────────────────────────────────────────────────────
 
 
+ASSISTANT_MODEL = "gpt-4o"
+
+
+def get_assistant_config_hash(instructions: str) -> str:
+    """
+    Fingerprint of everything pushed to the OpenAI assistant. When it matches
+    the hash stored on WhatsappChatbotConfig the assistant is up to date.
+    """
+    payload = json.dumps(
+        {
+            "model": ASSISTANT_MODEL,
+            "instructions": instructions,
+            "tools": SALON_ASSISTANT_TOOLS,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
 def get_or_create_assistant(salon: Salon) -> str:
     """
     Return the OpenAI assistant_id stored in WhatsappChatbotConfig.
     If not yet created, create it and persist the ID.
+
+    Instructions and tools are static per salon; the per-message date/time
+    goes into the run's additional_instructions instead. The assistant is
+    therefore only updated when their hash changes (new deploy, salon
+    renamed), not on every message.
     """
-    print("==========================>", get_runtime_context(salon))
     config = salon.salon_chatbot_config
     assistant_id = config.assistant_id.get("id") if config.assistant_id else None
 
     instructions = SALON_ASSISTANT_INSTRUCTIONS.replace("{salon_name}", salon.name)
+    config_hash = get_assistant_config_hash(instructions)
 
     if assistant_id:
-        # Keep tools/instructions in sync whenever the app restarts
-        client.beta.assistants.update(
-            assistant_id=assistant_id,
-            instructions=f"{instructions}\n\n{get_runtime_context(salon)}",
-            tools=SALON_ASSISTANT_TOOLS,
-        )
+        if config.assistant_config_hash != config_hash:
+            client.beta.assistants.update(
+                assistant_id=assistant_id,
+                instructions=instructions,
+                tools=SALON_ASSISTANT_TOOLS,
+                model=ASSISTANT_MODEL,
+            )
+            config.assistant_config_hash = config_hash
+            config.save(update_fields=["assistant_config_hash"])
         return assistant_id
 
     assistant = client.beta.assistants.create(
         name=f"{salon.name} WhatsApp Bot",
-        instructions=f"{instructions}\n\n{get_runtime_context(salon)}",
+        instructions=instructions,
         tools=SALON_ASSISTANT_TOOLS,
-        model="gpt-4o",
+        model=ASSISTANT_MODEL,
     )
     config.assistant_id = {"id": assistant.id}
-    config.save(update_fields=["assistant_id"])
+    config.assistant_config_hash = config_hash
+    config.save(update_fields=["assistant_id", "assistant_config_hash"])
     return assistant.id
 
 
@@ -128,94 +147,160 @@ def get_or_create_thread(customer: Customer, salon: Salon) -> str:
 # Core: send a message and get the assistant's reply
 # ─────────────────────────────────────────────────────────────────────────────
 
-MAX_POLL_SECONDS = 60
-POLL_INTERVAL = 1  # seconds between status checks
+MAX_RUN_SECONDS = 60  # wall-clock budget for a run, tool rounds included
+
+FAILED_RUN_EVENTS = (
+    "thread.run.failed",
+    "thread.run.cancelled",
+    "thread.run.expired",
+    "thread.run.incomplete",
+)
 
 
 def run_assistant(
     salon: Salon,
     customer: Customer,
-    user_message: str,
+    user_message: str | list[str],
 ) -> str:
     """
     1. Ensure an assistant exists for this salon.
     2. Get/create a conversation thread for this customer.
-    3. Add the user's message to the thread.
-    4. Create a run and poll until completion, handling tool calls.
+    3. Add the user's message(s) to the thread.
+    4. Stream the run (with the salon's current date/time as
+       additional_instructions), answering requires_action events with tool outputs.
     5. Return the final assistant text reply.
+
+    A list of messages (a burst coalesced by the WhatsApp pipeline) is added
+    message by message and answered by a single run.
+
+    The run is consumed as a server-sent event stream, so every step is
+    handled as soon as OpenAI emits it instead of on the next poll, and the
+    reply text arrives with the stream (no extra messages.list call).
     """
 
     assistant_id = get_or_create_assistant(salon)
     thread_id = get_or_create_thread(customer, salon)
 
-    # Add incoming user message
-    client.beta.threads.messages.create(
-        thread_id=thread_id,
-        role="user",
-        content=user_message,
-    )
+    # Add incoming user message(s)
+    user_messages = [user_message] if isinstance(user_message, str) else user_message
+    for message in user_messages:
+        client.beta.threads.messages.create(
+            thread_id=thread_id,
+            role="user",
+            content=message,
+        )
 
-    # Create the run
-    run = client.beta.threads.runs.create(
-        thread_id=thread_id,
-        assistant_id=assistant_id,
-    )
+    deadline = time.monotonic() + MAX_RUN_SECONDS
+    reply = None
+    completed = False
+    run_id = None
 
-    # Poll loop
-    elapsed = 0
-    while elapsed < MAX_POLL_SECONDS:
-        run = client.beta.threads.runs.retrieve(
+    try:
+        # Create the run as a stream. The timeout bounds every read, so a
+        # stalled stream cannot outlive the deadline.
+        events = run_client.beta.threads.runs.create(
             thread_id=thread_id,
-            run_id=run.id,
+            assistant_id=assistant_id,
+            additional_instructions=get_runtime_context(salon),
+            stream=True,
+            timeout=_remaining_seconds(deadline),
         )
 
-        if run.status == "completed":
-            break
+        # Each tool round ends the current stream and opens a new one
+        while events is not None and not completed:
+            next_events = None
+
+            with events:
+                for event in events:
+                    if _is_run_event(event.event):
+                        run_id = event.data.id
+
+                    if event.event == "thread.message.completed":
+                        # Keep the latest message, concatenating its text blocks
+                        reply = "\n".join(
+                            block.text.value
+                            for block in event.data.content
+                            if block.type == "text"
+                        )
+
+                    elif event.event == "thread.run.requires_action":
+                        next_events = _handle_tool_calls(
+                            event.data,
+                            thread_id,
+                            salon,
+                            customer,
+                            timeout=_remaining_seconds(deadline),
+                        )
+                        break
+
+                    elif event.event == "thread.run.completed":
+                        completed = True
+                        break
+
+                    elif event.event in FAILED_RUN_EVENTS:
+                        logger.error(
+                            "Run %s ended with event %s: %s",
+                            event.data.id,
+                            event.event,
+                            getattr(event.data, "last_error", ""),
+                        )
+                        return "I'm sorry, something went wrong. Please try again in a moment."
+
+                    if time.monotonic() > deadline:
+                        break
+
+            if time.monotonic() > deadline:
+                if next_events is not None:
+                    next_events.close()
+                break
+
+            events = next_events
+    except RUN_TIMEOUT_ERRORS:
+        logger.warning("Run %s on thread %s stalled.", run_id, thread_id)
+    except Exception:
+        # Never leave an active run behind to block the thread's next message
+        _cancel_run(thread_id, run_id)
+        raise
 
-        if run.status == "requires_action":
-            run = _handle_tool_calls(run, thread_id, salon, customer)
-            continue
+    if not completed:
+        _cancel_run(thread_id, run_id)
+        return "I'm sorry, I took too long to respond. Please try again."
 
-        if run.status in ("failed", "cancelled", "expired"):
-            logger.error(
-                "Run %s ended with status %s: %s",
-                run.id,
-                run.status,
-                getattr(run, "last_error", ""),
-            )
-            return "I'm sorry, something went wrong. Please try again in a moment."
+    if reply:
+        return reply
 
-        time.sleep(POLL_INTERVAL)
-        elapsed += POLL_INTERVAL
+    return "I'm sorry, I couldn't generate a response."
 
-    if run.status != "completed":
-        return "I'm sorry, I took too long to respond. Please try again."
 
-    # Extract last assistant message
-    messages = client.beta.threads.messages.list(
-        thread_id=thread_id,
-        order="desc",
-        limit=1,
-    )
-    for msg in messages.data:
-        if msg.role == "assistant":
-            # Concatenate all text content blocks
-            return "\n".join(
-                block.text.value for block in msg.content if block.type == "text"
-            )
+def _cancel_run(thread_id: str, run_id: str | None):
+    if not run_id:
+        return
+    try:
+        client.beta.threads.runs.cancel(thread_id=thread_id, run_id=run_id)
+    except Exception as exc:
+        logger.warning("Could not cancel run %s: %s", run_id, exc)
+
+
+def _is_run_event(name: str) -> bool:
+    """thread.run.* events carry the Run; thread.run.step.* carry a RunStep."""
+    return name.startswith("thread.run.") and not name.startswith("thread.run.step.")
 
-    return "I'm sorry, I couldn't generate a response."
 
+def _remaining_seconds(deadline: float) -> float:
+    """Time left before `deadline`, as a request timeout."""
+    return max(deadline - time.monotonic(), 1.0)
 
-def _handle_tool_calls(run, thread_id: str, salon: Salon, customer: Customer):
+
+def _handle_tool_calls(
+    run, thread_id: str, salon: Salon, customer: Customer, timeout: float
+):
     """
-    Submit all tool outputs for a requires_action run.
+    Submit all tool outputs for a requires_action run and return the event
+    stream that continues the run.
     """
     tool_outputs = []
 
     for tool_call in run.required_action.submit_tool_outputs.tool_calls:
-        import json
-
         tool_name = tool_call.function.name
         try:
             arguments = json.loads(tool_call.function.arguments)
@@ -238,9 +323,10 @@ def _handle_tool_calls(run, thread_id: str, salon: Salon, customer: Customer):
         )
 
     # Submit all tool outputs in one call
-    run = client.beta.threads.runs.submit_tool_outputs(
+    return run_client.beta.threads.runs.submit_tool_outputs(
         thread_id=thread_id,
         run_id=run.id,
         tool_outputs=tool_outputs,
+        stream=True,
+        timeout=timeout,
     )
-    return run
@@ -49,7 +49,45 @@ SALON_ASSISTANT_TOOLS = [
         },
     },
     # ─────────────────────────────────────────────
-    # 3. Make a reservation
+    # 3. Find free time slots (step before booking)
+    # ─────────────────────────────────────────────
+    {
+        "type": "function",
+        "function": {
+            "name": "get_free_slots",
+            "description": (
+                "Get every bookable start time for one or more days in a single call. "
+                "Call this when the customer asks when they can come in, or BEFORE "
+                "make_reservation / reschedule_reservation to offer times that are "
+                "actually free. Pass the chosen service IDs so the service durations "
+                "and time-slot restrictions are taken into account."
+            ),
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "start_date": {
+                        "type": "string",
+                        "description": "First date to check in YYYY-MM-DD format.",
+                    },
+                    "end_date": {
+                        "type": "string",
+                        "description": (
+                            "Last date to check in YYYY-MM-DD format (optional, "
+                            "defaults to start_date). At most 31 days after start_date."
+                        ),
+                    },
+                    "service_ids": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "UIDs of the services the customer wants (optional).",
+                    },
+                },
+                "required": ["start_date"],
+            },
+        },
+    },
+    # ─────────────────────────────────────────────
+    # 4. Make a reservation
     # ─────────────────────────────────────────────
     {
         "type": "function",
@@ -96,7 +134,7 @@ SALON_ASSISTANT_TOOLS = [
         },
     },
     # ─────────────────────────────────────────────
-    # 4. Cancel a reservation
+    # 5. Cancel a reservation
     # ─────────────────────────────────────────────
     {
         "type": "function",
@@ -111,7 +149,7 @@ SALON_ASSISTANT_TOOLS = [
                 "properties": {
                     "booking_id": {
                         "type": "string",
-                        "description": "The 8-character booking ID to cancel.",
+                        "description": "The booking ID (e.g. bk1000042) to cancel.",
                     },
                     "cancellation_reason": {
                         "type": "string",
@@ -123,7 +161,7 @@ SALON_ASSISTANT_TOOLS = [
         },
     },
     # ─────────────────────────────────────────────
-    # 5. Reschedule a reservation
+    # 6. Reschedule a reservation
     # ─────────────────────────────────────────────
     {
         "type": "function",
@@ -138,7 +176,7 @@ SALON_ASSISTANT_TOOLS = [
                 "properties": {
                     "booking_id": {
                         "type": "string",
-                        "description": "The 8-character booking ID to reschedule.",
+                        "description": "The booking ID (e.g. bk1000042) to reschedule.",
                     },
                     "new_booking_date": {
                         "type": "string",
@@ -154,7 +192,7 @@ SALON_ASSISTANT_TOOLS = [
         },
     },
     # ─────────────────────────────────────────────
-    # 6. Get customer's bookings
+    # 7. Get customer's bookings
     # ─────────────────────────────────────────────
     {
         "type": "function",
@@ -184,7 +222,7 @@ SALON_ASSISTANT_TOOLS = [
         },
     },
     # ─────────────────────────────────────────────
-    # 7. Send emergency/request to admin (CRM)
+    # 8. Send emergency/request to admin (CRM)
     # ─────────────────────────────────────────────
     {
         "type": "function",
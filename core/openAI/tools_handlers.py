@@ -8,23 +8,30 @@ requests a tool call.
 import random
 import json
 import logging
-from datetime import datetime, date, timedelta
+from datetime import datetime, timedelta
 
 from django.utils import timezone
 from django.contrib.auth import get_user_model
 
 from apps.support.models import AccountSupportTicket
 from apps.salon.models import (
-    Chair,
     Salon,
-    Employee,
     Product,
     Booking,
     Customer,
     OpeningHours,
 )
-from apps.salon.choices import BookingStatus, ChairStatus, CustomerType
-from apps.salon.utils import unique_booking_id_generator
+from apps.salon.availability import (
+    MAX_SLOT_GRID_DAYS,
+    BookingOverlapError,
+    SalonDayAvailability,
+    assign_resources,
+    booking_overlap_guard,
+    bookable_chairs,
+    free_slot_grid,
+    qualified_employees,
+)
+from apps.salon.choices import BookingStatus, CustomerType
 
 # Import your CRM client request model — adjust path as needed
 # from apps.crm.models import ClientRequest
@@ -122,28 +129,28 @@ def get_services_and_products(salon: Salon, gender_filter: str = None) -> dict:
     return _ok({"services": services, "products": products})
 
 
-def get_available_chairs(salon: Salon, booking_date: str, booking_time: str) -> dict:
+def get_available_chairs(
+    salon: Salon,
+    booking_date: str,
+    booking_time: str,
+    duration_minutes: int = None,
+) -> dict:
+    """
+    Return the chairs that are free for the whole
+    [booking_time, booking_time + duration) window.
+    """
     try:
         b_date = datetime.strptime(booking_date, "%Y-%m-%d").date()
         b_time = datetime.strptime(booking_time, "%H:%M").time()
     except ValueError as e:
         return _err(f"Invalid date/time format: {e}")
 
-    # Get all chairs that are not occupied at the given date/time
-    occupied_chairs = Booking.objects.filter(
-        salon=salon,
-        booking_date=b_date,
-        booking_time=b_time,
-        status__in=[
-            BookingStatus.PLACED,
-            BookingStatus.INPROGRESS,
-            BookingStatus.RESCHEDULED,
-        ],
-    ).values_list("chair_id", flat=True)
-
-    available_chairs = Chair.objects.filter(
-        salon=salon, status=ChairStatus.AVAILABLE
-    ).exclude(id__in=occupied_chairs)
+    duration = timedelta(minutes=duration_minutes) if duration_minutes else None
+    availability = SalonDayAvailability(salon, b_date)
+
+    available_chairs = availability.free_chairs(
+        bookable_chairs(salon), b_time, duration
+    )
 
     return _ok({"available_chairs": available_chairs})
 
@@ -153,6 +160,7 @@ def get_available_employees(
     booking_date: str,
     booking_time: str,
     service_ids: list[str] = None,
+    duration_minutes: int = None,
 ) -> dict:
     """
     Return a shuffled list of employees who are free at the given date/time.
@@ -162,7 +170,7 @@ def get_available_employees(
       2. If service_ids are provided, the employee must be assigned to ALL
          of those services — ensuring they can actually perform the booking.
       3. Employee must NOT already have an active booking (PLACED / INPROGRESS
-         / RESCHEDULED) that starts at the exact same date + time.
+         / RESCHEDULED) overlapping [booking_time, booking_time + duration).
 
     The result list is shuffled with random.shuffle() so that every call
     produces a different ordering. The caller always picks index [0], which
@@ -175,42 +183,64 @@ def get_available_employees(
     except ValueError as e:
         return _err(f"Invalid date/time format: {e}")
 
-    # Step 1 — employees already booked at this exact slot
-    busy_employee_ids = Booking.objects.filter(
-        salon=salon,
-        booking_date=b_date,
-        booking_time=b_time,
-        status__in=[
-            BookingStatus.PLACED,
-            BookingStatus.INPROGRESS,
-            BookingStatus.RESCHEDULED,
-        ],
-        employee__isnull=False,
-    ).values_list("employee_id", flat=True)
-
-    # Step 2 — salon employees not in the busy list
-    employees_qs = Employee.objects.filter(salon=salon).exclude(
-        id__in=busy_employee_ids
-    )
+    duration = timedelta(minutes=duration_minutes) if duration_minutes else None
+    availability = SalonDayAvailability(salon, b_date)
 
-    # Step 3 — if services are requested, keep only employees assigned to ALL of them
-    # (chaining one filter per service_id guarantees AND semantics, not OR)
-    if service_ids:
-        for sid in service_ids:
-            employees_qs = employees_qs.filter(employee_services__uid=sid)
-        employees_qs = employees_qs.distinct()
-
-    # Step 4 — materialise, then shuffle to distribute workload evenly
-    available = list(
-        employees_qs.select_related("designation").values(
-            "id", "name", "designation__name"
+    available = [
+        {
+            "id": employee.id,
+            "name": employee.name,
+            "designation__name": employee.designation.name,
+        }
+        for employee in availability.free_employees(
+            qualified_employees(salon, service_ids), b_time, duration
         )
-    )
+    ]
     random.shuffle(available)
 
     return _ok({"available_employees": available})
 
 
+def get_free_slots(
+    salon: Salon,
+    start_date: str,
+    end_date: str = None,
+    service_ids: list[str] = None,
+) -> dict:
+    """
+    Return every bookable start time between start_date and end_date for the
+    selected services, in one call instead of probing times one by one.
+    """
+    try:
+        s_date = datetime.strptime(start_date, "%Y-%m-%d").date()
+        e_date = datetime.strptime(end_date, "%Y-%m-%d").date() if end_date else s_date
+    except ValueError as e:
+        return _err(f"Invalid date format: {e}")
+
+    if e_date < s_date:
+        return _err("End date cannot be before start date.")
+    if (e_date - s_date).days >= MAX_SLOT_GRID_DAYS:
+        return _err(f"A maximum of {MAX_SLOT_GRID_DAYS} days can be checked at once.")
+
+    services = []
+    if service_ids:
+        services = list(salon.salon_services.filter(uid__in=service_ids))
+        if len(services) != len(set(service_ids)):
+            return _err("One or more service IDs are invalid for this salon.")
+
+    days = [
+        {
+            "date": str(day["date"]),
+            "day": day["day"],
+            "is_closed": day["is_closed"],
+            "available_times": [slot["time"] for slot in day["slots"]],
+        }
+        for day in free_slot_grid(salon, s_date, e_date, services)
+    ]
+
+    return _ok({"days": days})
+
+
 def make_reservation(
     salon: Salon,
     customer: Customer,
@@ -228,7 +258,7 @@ def make_reservation(
     except ValueError as e:
         return _err(f"Invalid date/time format: {e}")
 
-    if b_date < date.today():
+    if b_date < salon.local_today():
         return _err("Booking date cannot be in the past.")
 
     # ── Resolve services & compute total duration ─────────────────────────────
@@ -249,40 +279,37 @@ def make_reservation(
         if not products:
             return _err("No valid products found for the provided IDs.")
 
-    # ── Check chair availability ──────────────────────────────────────────────
-    chairs_result = get_available_chairs(salon, booking_date, booking_time)
-    if not chairs_result["success"] or not chairs_result["available_chairs"]:
-        return _err("No available chairs for the selected date and time.")
-    assigned_chair = chairs_result["available_chairs"][0]
-
-    # ── Auto-assign employee via shuffled pool ────────────────────────────────
-    # get_available_employees returns a pre-shuffled list; picking index [0]
-    # gives a uniformly random assignment across all qualified free employees.
-    employees_result = get_available_employees(
-        salon=salon,
-        booking_date=booking_date,
-        booking_time=booking_time,
-        service_ids=service_ids if service_ids else None,
+    # ── Check chair availability & auto-assign employee ───────────────────────
+    # One query loads the salon-day; every check below is an in-memory lookup.
+    # The employee is drawn at random from the qualified free ones.
+    availability = SalonDayAvailability(salon, b_date)
+    assigned_chair, assigned_employee = assign_resources(
+        availability, b_time, total_duration, service_ids
     )
-    assigned_employee = None
-    if employees_result["success"] and employees_result["available_employees"]:
-        assigned_employee = Employee.objects.get(
-            id=employees_result["available_employees"][0]["id"]
-        )
+    if not assigned_chair:
+        return _err("No available chairs for the selected date and time.")
 
-    booking = Booking.objects.create(
-        booking_date=b_date,
-        booking_time=b_time,
-        status=BookingStatus.PLACED,
-        notes=notes,
-        booking_duration=total_duration,
-        payment_type=payment_type,
-        account=salon.account,
-        salon=salon,
-        customer=customer,
-        chair=assigned_chair,
-        employee=assigned_employee,
-    )
+    # ── Insert; the exclusion constraints reject a concurrent double booking ──
+    try:
+        with booking_overlap_guard():
+            booking = Booking.objects.create(
+                booking_date=b_date,
+                booking_time=b_time,
+                status=BookingStatus.PLACED,
+                notes=notes,
+                booking_duration=total_duration,
+                payment_type=payment_type,
+                account=salon.account,
+                salon=salon,
+                customer=customer,
+                chair=assigned_chair,
+                employee=assigned_employee,
+            )
+    except BookingOverlapError:
+        return _err(
+            "This time slot was just booked by someone else. "
+            "Please choose another time."
+        )
 
     # ── Upgrade lead → customer ───────────────────────────────────────────────
     if customer.type != CustomerType.CUSTOMER:
@@ -355,14 +382,9 @@ def reschedule_reservation(
     except ValueError as e:
         return _err(f"Invalid date/time format: {e}")
 
-    if b_date < date.today():
+    if b_date < salon.local_today():
         return _err("New booking date cannot be in the past.")
 
-    # ── Chair check for new slot ──────────────────────────────────────────────
-    chairs_result = get_available_chairs(salon, new_booking_date, new_booking_time)
-    if not chairs_result["success"] or not chairs_result["available_chairs"]:
-        return _err("No available chairs for the new selected date and time.")
-
     try:
         booking = Booking.objects.get(
             booking_id=booking_id,
@@ -379,28 +401,49 @@ def reschedule_reservation(
             "Booking not found or cannot be rescheduled (already completed/cancelled)."
         )
 
-    # ── Re-assign employee for the new slot (shuffle again) ───────────────────
+    # ── Chair check & employee re-assignment for the new slot ─────────────────
+    # The booking being moved must not block its own new slot.
+    availability = SalonDayAvailability(salon, b_date, exclude_booking=booking)
     service_uids = [str(uid) for uid in booking.services.values_list("uid", flat=True)]
-    employees_result = get_available_employees(
-        salon=salon,
-        booking_date=new_booking_date,
-        booking_time=new_booking_time,
-        service_ids=service_uids if service_uids else None,
+    new_chair, available_employee = assign_resources(
+        availability,
+        b_time,
+        booking.booking_duration,
+        service_uids if service_uids else None,
     )
-    new_employee = booking.employee  # keep existing as fallback
-    if employees_result["success"] and employees_result["available_employees"]:
-        new_employee = Employee.objects.get(
-            id=employees_result["available_employees"][0]["id"]
-        )
+    if not new_chair:
+        return _err("No available chairs for the new selected date and time.")
+
+    # Keep the current employee only if they are free at the new time too,
+    # otherwise the save would hit the overlap constraint
+    new_employee = available_employee
+    if new_employee is None and booking.employee_id:
+        if availability.is_employee_free(
+            booking.employee_id, b_time, booking.booking_duration
+        ):
+            new_employee = booking.employee
 
     booking.booking_date = b_date
     booking.booking_time = b_time
     booking.status = BookingStatus.RESCHEDULED
-    booking.chair = chairs_result["available_chairs"][0]
+    booking.chair = new_chair
     booking.employee = new_employee
-    booking.save(
-        update_fields=["booking_date", "booking_time", "status", "chair", "employee"]
-    )
+    try:
+        with booking_overlap_guard():
+            booking.save(
+                update_fields=[
+                    "booking_date",
+                    "booking_time",
+                    "status",
+                    "chair",
+                    "employee",
+                ]
+            )
+    except BookingOverlapError:
+        return _err(
+            "This time slot was just booked by someone else. "
+            "Please choose another time."
+        )
 
     return _ok(
         {
@@ -433,7 +476,7 @@ def get_customer_bookings(
                 BookingStatus.INPROGRESS,
                 BookingStatus.RESCHEDULED,
             ],
-            booking_date__gte=date.today(),
+            booking_date__gte=salon.local_today(),
         )
 
     bookings = []
@@ -520,6 +563,7 @@ def send_customer_request(
 TOOL_REGISTRY = {
     "get_salon_info": get_salon_info,
     "get_services_and_products": get_services_and_products,
+    "get_free_slots": get_free_slots,
     "make_reservation": make_reservation,
     "cancel_reservation": cancel_reservation,
     "reschedule_reservation": reschedule_reservation,
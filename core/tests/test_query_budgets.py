@@ -0,0 +1,28 @@
+import pytest
+from django.test import Client
+
+from common.benchmarks import (
+    QUERY_BUDGETS,
+    benchmark_cases,
+    benchmark_environment,
+    client_for,
+    send,
+)
+
+
+@pytest.mark.parametrize("url_name", QUERY_BUDGETS)
+def test_endpoint_query_budget(url_name, synthetic_salon, query_budget):
+    case = next(
+        case for case in benchmark_cases(synthetic_salon) if case.url_name == url_name
+    )
+    account = synthetic_salon.account
+    client = client_for(account.owner, account) if case.authenticated else Client()
+
+    with benchmark_environment(synthetic_salon):
+        # Warm the per-process caches (membership, GeoIP, ...) first; the
+        # analytics responses are not cached here, so the budget covers them
+        send(client, case)
+        with query_budget(url_name):
+            response = send(client, case)
+
+    assert response.status_code < 400, response.content